@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 Antmicro
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# Reading and writing of the candump log format (candump -l), e.g.
+# (1436509052.249713) can0 123#DEADBEEF
+
+import gzip
+
+from collections import namedtuple
+
+__all__ = [
+    "CANDumpFrame",
+    "parse_candump_line",
+    "format_candump_line",
+    "read_candump",
+    "CANDumpWriter",
+]
+
+# rtr_length is the data length requested by a remote frame, e.g. 5 for
+# 123#R5, which carries no data itself
+CANDumpFrame = namedtuple(
+    "CANDumpFrame",
+    [
+        "timestamp",
+        "interface",
+        "id",
+        "ide",
+        "rtr",
+        "fdf",
+        "brs",
+        "data",
+        "rtr_length"
+    ],
+    defaults=[0]
+)
+
+STD_ID_DIGITS = 3
+EXT_ID_DIGITS = 8
+FD_FLAGS_BRS = 0x1
+MAX_RTR_LENGTH = 8
+
+
+def parse_candump_line(line):
+    """Parses a line of a candump log to a CANDumpFrame."""
+    try:
+        timestamp, interface, frame = line.split()
+        timestamp = float(timestamp.strip("()"))
+        idf, data = frame.split("#", 1)
+        ide = len(idf) == EXT_ID_DIGITS
+        idf = int(idf, 16)
+        rtr = fdf = brs = False
+        rtr_length = 0
+        if data.startswith("#"):
+            fdf = True
+            brs = bool(int(data[1], 16) & FD_FLAGS_BRS)
+            data = data[2:]
+        elif data.startswith("R"):
+            rtr = True
+            if len(data) > 1:
+                rtr_length = int(data[1:], 16)
+                if rtr_length > MAX_RTR_LENGTH:
+                    raise ValueError
+            data = ""
+        data = bytes.fromhex(data.replace(".", ""))
+    except (ValueError, IndexError):
+        raise Exception(f"Invalid candump line: {line.strip()}")
+
+    return CANDumpFrame(
+        timestamp, interface, idf, ide, rtr, fdf, brs, data, rtr_length
+    )
+
+
+def format_candump_line(frame):
+    """Formats a CANDumpFrame as a line of a candump log."""
+    digits = EXT_ID_DIGITS if frame.ide else STD_ID_DIGITS
+    line = f"({frame.timestamp:.6f}) {frame.interface} "
+    line += f"{frame.id:0{digits}X}#"
+    if frame.fdf:
+        line += f"#{FD_FLAGS_BRS if frame.brs else 0:X}"
+    if frame.rtr:
+        line += "R"
+        # like candump, a zero length is not printed
+        if frame.rtr_length:
+            line += f"{frame.rtr_length:X}"
+    return line + frame.data.hex().upper()
+
+
+def read_candump(path):
+    """Yields the frames of a candump log, which is read line by line.
+
+    Logs compressed with gzip are decompressed on the fly.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as log:
+        for line in log:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield parse_candump_line(line)
+
+
+class CANDumpWriter:
+    """Writes frames to a candump log."""
+
+    def __init__(self, path, interface="can0"):
+        opener = gzip.open if path.endswith(".gz") else open
+        self.log = opener(path, "wt")
+        self.interface = interface
+
+    def write(self, frame):
+        frame = frame._replace(interface=self.interface)
+        self.log.write(format_candump_line(frame) + "\n")
+
+    def close(self):
+        self.log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
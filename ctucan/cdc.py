@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 Antmicro
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from migen import *
+from migen.genlib.cdc import GrayDecoder, MultiReg
+
+from litex.soc.interconnect import wishbone
+
+__all__ = ["WishboneCDC", "TimestampCDC"]
+
+
+class WishboneCDC(Module):
+    """Passes classic Wishbone cycles from one clock domain to another.
+
+    The request of the master is registered in the source domain and
+    a toggle signal tells the destination domain to perform the cycle on
+    the target. The read data is registered in the destination domain and
+    another toggle signal acknowledges the cycle back in the source domain.
+    The registered request and response are stable while the toggles cross
+    the domains, so they do not need synchronizers. Bursts are performed as
+    separate classic cycles.
+    """
+
+    def __init__(self, target, cd_from="sys", cd_to="sys"):
+
+        # IOs
+        self.bus = wishbone.Interface(
+            data_width=len(target.dat_w), adr_width=len(target.adr)
+        )
+
+        sync_from = getattr(self.sync, cd_from)
+        sync_to = getattr(self.sync, cd_to)
+
+        # request, source domain
+        adr = Signal.like(self.bus.adr)
+        dat_w = Signal.like(self.bus.dat_w)
+        sel = Signal.like(self.bus.sel)
+        we = Signal()
+        req = Signal()
+        busy = Signal()
+
+        # response, destination domain
+        dat_r = Signal.like(self.bus.dat_r)
+        resp = Signal()
+        active = Signal()
+
+        req_sync = Signal()
+        req_prev = Signal()
+        resp_sync = Signal()
+        resp_prev = Signal()
+
+        self.specials += [
+            MultiReg(req, req_sync, odomain=cd_to),
+            MultiReg(resp, resp_sync, odomain=cd_from),
+        ]
+
+        sync_from += [
+            self.bus.ack.eq(0),
+            If(
+                self.bus.cyc & self.bus.stb & ~busy & ~self.bus.ack,
+                adr.eq(self.bus.adr),
+                dat_w.eq(self.bus.dat_w),
+                sel.eq(self.bus.sel),
+                we.eq(self.bus.we),
+                req.eq(~req),
+                busy.eq(1),
+            ).Elif(
+                busy & (resp_sync != resp_prev),
+                resp_prev.eq(resp_sync),
+                busy.eq(0),
+                self.bus.ack.eq(1),
+                self.bus.dat_r.eq(dat_r),
+            ),
+        ]
+
+        self.comb += [
+            target.cyc.eq(active),
+            target.stb.eq(active),
+            target.adr.eq(adr),
+            target.dat_w.eq(dat_w),
+            target.sel.eq(sel),
+            target.we.eq(we),
+        ]
+
+        sync_to += [
+            If(
+                ~active & (req_sync != req_prev),
+                req_prev.eq(req_sync),
+                active.eq(1),
+            ).Elif(
+                active & target.ack,
+                active.eq(0),
+                dat_r.eq(target.dat_r),
+                resp.eq(~resp),
+            ),
+        ]
+
+
+class TimestampCDC(Module):
+    """Passes a free-running counter from one clock domain to another.
+
+    The counter is passed in Gray code, so every value sampled in
+    the destination domain is either the previous or the current value of
+    the counter. Setting the counter to an arbitrary value may be seen
+    in the destination domain with a glitch lasting a few cycles.
+    """
+
+    def __init__(self, i, o, cd_from="sys", cd_to="sys"):
+        width = len(i)
+        gray_from = Signal(width)
+        gray_to = Signal(width)
+
+        sync_from = getattr(self.sync, cd_from)
+        sync_from += gray_from.eq(i ^ (i >> 1))
+        self.specials += MultiReg(gray_from, gray_to, odomain=cd_to)
+
+        decoder = ClockDomainsRenamer({"sys": cd_to})(GrayDecoder(width))
+        self.submodules.decoder = decoder
+        self.comb += [
+            self.decoder.i.eq(gray_to),
+            o.eq(self.decoder.o),
+        ]
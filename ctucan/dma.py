@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 Antmicro
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from functools import reduce
+from operator import or_
+
+from migen import *
+from migen.genlib.fsm import FSM, NextState, NextValue
+
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect.csr import AutoCSR, CSRStatus, CSRStorage
+from litex.soc.interconnect.csr_eventmanager import (
+    EventManager, EventSourcePulse
+)
+from ctucan.registers import *
+
+__all__ = ["CTUCANRXDMA", "CTUCANTXDMA"]
+
+# Bytes reserved for every descriptor in the TX ring
+TX_DESCRIPTOR_SIZE = 0x80
+
+
+class CTUCANRXDMA(Module, AutoCSR):
+    """Copies frames from the RX buffer of the core to a ring in memory.
+
+    The ring is described by its base address and size in bytes. The DMA
+    owns the head offset and software owns the tail offset, both relative
+    to the ring base. Frames are stored as the exact sequence of words read
+    from RX_DATA (the frame format word followed by RWCNT words) and may
+    wrap around the end of the ring. A frame is copied only if the ring has
+    room for the longest CAN FD frame, and one word of the ring is always
+    left empty, so head == tail means an empty ring.
+    """
+
+    def __init__(self, poll_interval=64):
+
+        # IOs
+        self.core = wishbone.Interface(data_width=32, adr_width=14)
+        self.bus = wishbone.Interface(data_width=32, adr_width=30)
+
+        # CSRs
+        self._enable = CSRStorage(
+            description="Enable the DMA. "
+            "The head offset is cleared while the DMA is disabled."
+        )
+        self._base = CSRStorage(32, description="Ring base address")
+        self._size = CSRStorage(32, description="Ring size in bytes")
+        self._head = CSRStatus(32, description="Ring head offset")
+        self._tail = CSRStorage(32, description="Ring tail offset")
+        self._watermark = CSRStorage(
+            16,
+            reset=1,
+            description="Number of frames copied before raising "
+            "an interrupt. An interrupt is also raised once the RX buffer "
+            "is drained or the ring gets full."
+        )
+
+        self.submodules.ev = EventManager()
+        self.ev.rx = EventSourcePulse(description="Frames copied to the ring")
+        self.ev.finalize()
+
+        # parameters
+
+        ALIGNMENT_BITS = 2
+        WORD_SIZE = 2**ALIGNMENT_BITS
+
+        enable = self._enable.storage
+        base = self._base.storage
+        size = self._size.storage
+        tail = self._tail.storage
+        head = self._head.status
+        watermark = self._watermark.storage
+
+        wr_ptr = Signal(32)
+        wr_adr = Signal(32)
+        used = Signal(32)
+        has_space = Signal()
+        word = Signal(32)
+        remaining = Signal(FRAME_FORMAT_RWCNT_WIDTH)
+        frames = Signal(16)
+        last_frame = Signal()
+        poll = Signal(max=poll_interval + 1)
+
+        self.comb += [
+            If(
+                wr_ptr >= tail,
+                used.eq(wr_ptr - tail),
+            ).Else(used.eq(wr_ptr + size - tail)),
+            has_space.eq(size - used > WORD_SIZE * MAX_FRAME_WORDS),
+            wr_adr.eq(base + wr_ptr),
+            last_frame.eq((frames + 1 >= watermark) | ~has_space),
+        ]
+
+        self.sync += If(poll != 0, poll.eq(poll - 1))
+
+        rwcnt_end = FRAME_FORMAT_RWCNT_START_BIT + FRAME_FORMAT_RWCNT_WIDTH
+
+        def core_read(offset):
+            return [
+                self.core.cyc.eq(1),
+                self.core.stb.eq(1),
+                self.core.sel.eq(0xF),
+                self.core.adr.eq(offset >> ALIGNMENT_BITS),
+            ]
+
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act(
+            "IDLE",
+            If(
+                ~enable,
+                NextValue(wr_ptr, 0),
+                NextValue(head, 0),
+                NextValue(frames, 0),
+            ).Elif(
+                has_space & (poll == 0),
+                NextState("READ_STATUS"),
+            ),
+        )
+        fsm.act(
+            "READ_STATUS",
+            *core_read(RX_STATUS_OFFSET),
+            If(
+                self.core.ack,
+                If(
+                    self.core.dat_r[RX_STATUS_RXE_BIT],
+                    # RX buffer drained, finish the batch
+                    If(
+                        frames != 0,
+                        self.ev.rx.trigger.eq(1),
+                        NextValue(frames, 0),
+                    ),
+                    NextValue(poll, poll_interval),
+                    NextState("IDLE"),
+                ).Else(NextState("READ_FRAME_FORMAT")),
+            ),
+        )
+        fsm.act(
+            "READ_FRAME_FORMAT",
+            *core_read(RX_DATA_OFFSET),
+            If(
+                self.core.ack,
+                NextValue(word, self.core.dat_r),
+                NextValue(
+                    remaining,
+                    self.core.dat_r[FRAME_FORMAT_RWCNT_START_BIT:rwcnt_end]
+                ),
+                NextState("WRITE"),
+            ),
+        )
+        fsm.act(
+            "READ_DATA",
+            *core_read(RX_DATA_OFFSET),
+            If(
+                self.core.ack,
+                NextValue(word, self.core.dat_r),
+                NextValue(remaining, remaining - 1),
+                NextState("WRITE"),
+            ),
+        )
+        fsm.act(
+            "WRITE",
+            self.bus.cyc.eq(1),
+            self.bus.stb.eq(1),
+            self.bus.we.eq(1),
+            self.bus.sel.eq(0xF),
+            self.bus.adr.eq(wr_adr[ALIGNMENT_BITS:]),
+            self.bus.dat_w.eq(word),
+            If(
+                self.bus.ack,
+                If(
+                    wr_ptr + WORD_SIZE >= size,
+                    NextValue(wr_ptr, 0),
+                ).Else(NextValue(wr_ptr, wr_ptr + WORD_SIZE)),
+                If(
+                    remaining == 0,
+                    NextState("COMMIT"),
+                ).Else(NextState("READ_DATA")),
+            ),
+        )
+        fsm.act(
+            "COMMIT",
+            # publish the frame only once it is completely in the ring
+            NextValue(head, wr_ptr),
+            If(
+                last_frame,
+                self.ev.rx.trigger.eq(1),
+                NextValue(frames, 0),
+            ).Else(NextValue(frames, frames + 1)),
+            If(
+                has_space,
+                NextState("READ_STATUS"),
+            ).Else(NextState("IDLE")),
+        )
+
+
+class CTUCANTXDMA(Module, AutoCSR):
+    """Fills the TXT buffers of the core from a descriptor ring in memory.
+
+    Every descriptor occupies TX_DESCRIPTOR_SIZE bytes of the ring and holds
+    the image of a TXT buffer: the frame format word, the identifier, two
+    timestamp words and the data words. Only the words needed for the DLC
+    of the frame are copied. Software owns the head index and the DMA owns
+    the tail index, both counted in descriptors. Whenever the ring is not
+    empty, the DMA looks for a writable TXT buffer, copies the next
+    descriptor to it and marks it as ready for transmission, so all TXT
+    buffers are kept busy. Frames placed in different TXT buffers are sent
+    according to the TX_PRIORITY register of the core.
+    """
+
+    def __init__(self, poll_interval=64):
+
+        # IOs
+        self.core = wishbone.Interface(data_width=32, adr_width=14)
+        self.bus = wishbone.Interface(data_width=32, adr_width=30)
+
+        # CSRs
+        self._enable = CSRStorage(
+            description="Enable the DMA. "
+            "The tail index is cleared while the DMA is disabled."
+        )
+        self._base = CSRStorage(32, description="Ring base address")
+        self._size = CSRStorage(16, description="Ring size in descriptors")
+        self._head = CSRStorage(16, description="Ring head index")
+        self._tail = CSRStatus(16, description="Ring tail index")
+
+        self.submodules.ev = EventManager()
+        self.ev.tx = EventSourcePulse(
+            description="All descriptors copied to the TXT buffers"
+        )
+        self.ev.finalize()
+
+        # parameters
+
+        ALIGNMENT_BITS = 2
+        DESCRIPTOR_BITS = log2_int(TX_DESCRIPTOR_SIZE)
+        TXT_BUFFER_BITS = log2_int(TXT_BUFFER_SIZE)
+
+        enable = self._enable.storage
+        base = self._base.storage
+        size = self._size.storage
+        head = self._head.storage
+        tail = self._tail.status
+
+        buf = Signal(max=TXT_BUFFER_NUM)
+        free_buf = Signal(max=TXT_BUFFER_NUM)
+        found = Signal()
+        word = Signal(32)
+        index = Signal(max=MAX_FRAME_WORDS + 1)
+        count = Signal(max=MAX_FRAME_WORDS + 1)
+        data_words = Signal(max=MAX_FRAME_WORDS + 1)
+        desc_offset = Signal(32)
+        desc_adr = Signal(32)
+        command = Signal(32)
+        txt_adr = Signal(16)
+        poll = Signal(max=poll_interval + 1)
+
+        # number of data words of the frame format word read from memory
+        dlc_end = FRAME_FORMAT_DLC_START_BIT + FRAME_FORMAT_DLC_WIDTH
+        dlc = self.bus.dat_r[FRAME_FORMAT_DLC_START_BIT:dlc_end]
+        fd_words = Array(C((n + 3) // 4) for n in DLC_TO_LENGTH)
+        can20_words = Array(
+            C((min(n, MAX_CAN20_LENGTH) + 3) // 4) for n in DLC_TO_LENGTH
+        )
+
+        self.comb += [
+            If(
+                self.bus.dat_r[FRAME_FORMAT_FDF_BIT],
+                data_words.eq(fd_words[dlc]),
+            ).Elif(
+                self.bus.dat_r[FRAME_FORMAT_RTR_BIT],
+                data_words.eq(0),
+            ).Else(data_words.eq(can20_words[dlc])),
+        ]
+
+        # pick the writable TXT buffer with the lowest index
+        for i in reversed(range(TXT_BUFFER_NUM)):
+            start = i * TX_STATUS_TXTS_WIDTH
+            state = self.core.dat_r[start:start + TX_STATUS_TXTS_WIDTH]
+            writable = reduce(or_, [state == s for s in TXT_WRITABLE_STATES])
+            self.comb += If(writable, found.eq(1), free_buf.eq(i))
+
+        self.comb += [
+            desc_offset.eq(tail << DESCRIPTOR_BITS),
+            desc_adr.eq(base + desc_offset + (index << ALIGNMENT_BITS)),
+            txt_adr.eq(
+                TXT_BUFFER_OFFSET + (buf << TXT_BUFFER_BITS) +
+                (index << ALIGNMENT_BITS)
+            ),
+            command.eq((1 << TXT_COMMAND_TXCR_BIT)
+                       | ((1 << TXT_COMMAND_TXB1_BIT) << buf)),
+        ]
+
+        self.sync += If(poll != 0, poll.eq(poll - 1))
+
+        def core_access(adr, dat_w=None):
+            ops = [
+                self.core.cyc.eq(1),
+                self.core.stb.eq(1),
+                self.core.sel.eq(0xF),
+                self.core.adr.eq(adr >> ALIGNMENT_BITS),
+            ]
+            if dat_w is not None:
+                ops += [self.core.we.eq(1), self.core.dat_w.eq(dat_w)]
+            return ops
+
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act(
+            "IDLE",
+            If(
+                ~enable,
+                NextValue(tail, 0),
+            ).Elif(
+                (head != tail) & (poll == 0),
+                NextState("READ_STATUS"),
+            ),
+        )
+        fsm.act(
+            "READ_STATUS",
+            *core_access(TX_STATUS_OFFSET),
+            If(
+                self.core.ack,
+                If(
+                    found,
+                    NextValue(buf, free_buf),
+                    NextValue(index, 0),
+                    NextState("FETCH"),
+                ).Else(
+                    # all TXT buffers are busy, try again later
+                    NextValue(poll, poll_interval),
+                    NextState("IDLE"),
+                ),
+            ),
+        )
+        fsm.act(
+            "FETCH",
+            self.bus.cyc.eq(1),
+            self.bus.stb.eq(1),
+            self.bus.sel.eq(0xF),
+            self.bus.adr.eq(desc_adr[ALIGNMENT_BITS:]),
+            If(
+                self.bus.ack,
+                NextValue(word, self.bus.dat_r),
+                If(
+                    index == 0,
+                    # frame format, identifier and timestamp words
+                    NextValue(count, 4 + data_words),
+                ),
+                NextState("STORE"),
+            ),
+        )
+        fsm.act(
+            "STORE",
+            *core_access(txt_adr, word),
+            If(
+                self.core.ack,
+                NextValue(index, index + 1),
+                If(
+                    index + 1 == count,
+                    NextState("COMMAND"),
+                ).Else(NextState("FETCH")),
+            ),
+        )
+        fsm.act(
+            "COMMAND",
+            *core_access(TXT_COMMAND_OFFSET, command),
+            If(
+                self.core.ack,
+                If(
+                    tail + 1 == size,
+                    NextValue(tail, 0),
+                ).Else(NextValue(tail, tail + 1)),
+                NextState("NEXT"),
+            ),
+        )
+        fsm.act(
+            "NEXT",
+            If(
+                head == tail,
+                self.ev.tx.trigger.eq(1),
+                NextState("IDLE"),
+            ).Else(NextState("READ_STATUS")),
+        )
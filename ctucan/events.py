@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 Antmicro
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from migen import *
+from migen.genlib.fsm import FSM, NextState, NextValue
+
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect.csr import (
+    AutoCSR, CSRField, CSRStatus, CSRStorage
+)
+from ctucan.registers import *
+
+__all__ = ["CTUCANEventManager"]
+
+
+class CTUCANEventManager(Module, AutoCSR):
+    """Interrupt controller of the CTUCAN module.
+
+    It has the irq output and the status, pending and enable CSRs with one
+    bit for every interrupt source, laid out like in the LiteX EventManager.
+    All sources are level sensitive, like EventSourceLevel, and are cleared
+    only in the modules that raise them, e.g. in INT_STAT of the core.
+    The pending register mirrors the status register and is read-only,
+    so drivers acknowledging the events by writing to pending have to
+    clear them in their modules instead. All sources are enabled after
+    reset.
+
+    With coalescing enabled, the interrupt of the core is held back until
+    the RX buffer holds coalesce_frames frames or coalesce_time timestamp
+    ticks have passed since the core raised it, whichever comes first.
+    Without a timestamp, coalesce_time counts sys clock cycles. Only the
+    RX interrupts are held back, any other interrupt set in INT_STAT is
+    passed through at the next poll. INT_STAT and the number of frames in
+    RX_STATUS are polled through the core master interface, so it has to
+    be connected to the register bus of the core.
+    """
+
+    def __init__(
+        self, core_irq, timestamp, with_coalescing=False, poll_interval=64
+    ):
+
+        # IOs
+        self.irq = Signal()
+
+        self.sources = []
+
+        core_event = Signal()
+        self.add_source("core", core_event, "CTU CAN FD core interrupt")
+
+        if with_coalescing:
+            self.core = wishbone.Interface(data_width=32, adr_width=14)
+            self.add_coalescing(core_irq, core_event, timestamp, poll_interval)
+        else:
+            self.comb += core_event.eq(core_irq)
+
+    def add_source(self, name, trigger, description):
+        self.sources.append((name, trigger, description))
+
+    def add_coalescing(self, core_irq, core_event, timestamp, poll_interval):
+        self._coalesce_frames = CSRStorage(
+            RX_STATUS_RXFRC_WIDTH,
+            description="Number of frames in the RX buffer which raises "
+            "the core interrupt, 0 disables the frame threshold."
+        )
+        self._coalesce_time = CSRStorage(
+            32,
+            description="Number of timestamp ticks, or sys clock cycles "
+            "without a timestamp, after which a pending core interrupt is "
+            "raised, 0 disables the time threshold."
+        )
+
+        frames_threshold = self._coalesce_frames.storage
+        time_threshold = self._coalesce_time.storage
+
+        # Without a timestamp the time threshold counts sys clock cycles
+        if timestamp is None:
+            timestamp = Signal(32)
+            self.sync += timestamp.eq(timestamp + 1)
+
+        armed = Signal()
+        fired = Signal()
+        urgent = Signal()
+        start = Signal(32)
+        elapsed = Signal(32)
+        frames = Signal(RX_STATUS_RXFRC_WIDTH)
+        poll = Signal(max=poll_interval + 1)
+
+        coalescing = (frames_threshold != 0) | (time_threshold != 0)
+        expired = (time_threshold != 0) & (elapsed >= time_threshold)
+        enough = (frames_threshold != 0) & (frames >= frames_threshold)
+
+        self.comb += [
+            elapsed.eq(timestamp[:32] - start),
+            core_event.eq(core_irq & (fired | urgent | ~coalescing)),
+        ]
+
+        self.sync += [
+            If(
+                ~core_irq,
+                armed.eq(0),
+                fired.eq(0),
+            ).Elif(
+                ~armed,
+                armed.eq(1),
+                start.eq(timestamp[:32]),
+            ).Elif(
+                expired | enough,
+                fired.eq(1),
+            ),
+            # a new interrupt of the core is polled right away
+            If(
+                ~core_irq,
+                poll.eq(0),
+            ).Elif(
+                poll != 0,
+                poll.eq(poll - 1),
+            ),
+        ]
+
+        # Only the received frames are held back, the other interrupts
+        # of the core pass as soon as they are seen in INT_STAT.
+        held_back = INT_STAT_RXI_MASK | INT_STAT_RBNEI_MASK
+        rxfrc_end = RX_STATUS_RXFRC_START_BIT + RX_STATUS_RXFRC_WIDTH
+
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act(
+            "IDLE",
+            If(
+                ~core_irq,
+                NextValue(frames, 0),
+                NextValue(urgent, 0),
+            ).Elif(
+                armed & ~fired & coalescing & (poll == 0),
+                NextState("READ_INT_STAT"),
+            ),
+        )
+        fsm.act(
+            "READ_INT_STAT",
+            self.core.cyc.eq(1),
+            self.core.stb.eq(1),
+            self.core.sel.eq(0xF),
+            self.core.adr.eq(INT_STAT_OFFSET >> 2),
+            If(
+                self.core.ack,
+                NextValue(urgent, (self.core.dat_r & ~held_back) != 0),
+                NextValue(poll, poll_interval),
+                NextState("IDLE"),
+                If(frames_threshold != 0, NextState("READ_STATUS")),
+            ),
+        )
+        fsm.act(
+            "READ_STATUS",
+            self.core.cyc.eq(1),
+            self.core.stb.eq(1),
+            self.core.sel.eq(0xF),
+            self.core.adr.eq(RX_STATUS_OFFSET >> 2),
+            If(
+                self.core.ack,
+                NextValue(
+                    frames,
+                    self.core.dat_r[RX_STATUS_RXFRC_START_BIT:rxfrc_end]
+                ),
+                NextState("IDLE"),
+            ),
+        )
+
+    def do_finalize(self):
+        n = len(self.sources)
+
+        def fields(reset=0):
+            return [
+                CSRField(name, reset=reset, description=description)
+                for (name, _, description) in self.sources
+            ]
+
+        self.status = CSRStatus(
+            n,
+            description="Current state of the interrupt sources.",
+            fields=fields()
+        )
+        self.pending = CSRStatus(
+            n,
+            description="Pending interrupt sources, same as status. "
+            "They are cleared in the modules that raise them, writes to "
+            "this register have no effect.",
+            fields=fields()
+        )
+        self.enable = CSRStorage(
+            n, description="Enable the interrupt sources.", fields=fields(1)
+        )
+
+        for name, trigger, _ in self.sources:
+            self.comb += [
+                getattr(self.status.fields, name).eq(trigger),
+                getattr(self.pending.fields, name).eq(trigger),
+            ]
+
+        self.comb += self.irq.eq(
+            (self.pending.status & self.enable.storage) != 0
+        )
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 Antmicro
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# Conversion between arrays of CAN frames and the word images of frames
+# used by the TXT buffers and the RX_DATA register of the core
+
+import numpy as np
+
+from ctucan.registers import *
+
+__all__ = [
+    "FRAME_DTYPE",
+    "dlc_to_length",
+    "length_to_dlc",
+    "encode_frames",
+    "encode_stream",
+    "decode_frames",
+    "decode_stream",
+]
+
+# The extended identifier spans both fields of the identifier word
+EXT_ID_WIDTH = IDENTIFIER_STD_START_BIT + IDENTIFIER_STD_WIDTH
+
+# Frame format word, identifier and two timestamp words
+HEADER_WORDS = 4
+
+FRAME_DTYPE = np.dtype([
+    ("id", np.uint32),
+    ("ide", np.bool_),
+    ("rtr", np.bool_),
+    ("fdf", np.bool_),
+    ("brs", np.bool_),
+    ("dlc", np.uint8),
+    ("timestamp", np.uint64),
+    ("data", np.uint8, DLC_TO_LENGTH[-1]),
+])
+
+_DLC_TO_LENGTH = np.array(DLC_TO_LENGTH, dtype=np.uint32)
+_CAN20_DLC_TO_LENGTH = np.minimum(_DLC_TO_LENGTH, MAX_CAN20_LENGTH)
+
+
+def _mask(width):
+    return (1 << width) - 1
+
+
+def dlc_to_length(dlc, fdf=True):
+    """Returns the data length in bytes of the given DLC codes."""
+    dlc = np.asarray(dlc, dtype=np.uint32) & _mask(FRAME_FORMAT_DLC_WIDTH)
+    return np.where(fdf, _DLC_TO_LENGTH[dlc], _CAN20_DLC_TO_LENGTH[dlc])
+
+
+def length_to_dlc(length):
+    """Returns the smallest DLC codes able to carry the given number of bytes."""
+    length = np.asarray(length)
+    if np.any(length > DLC_TO_LENGTH[-1]):
+        raise Exception(f"Frames carry at most {DLC_TO_LENGTH[-1]} bytes")
+    return np.searchsorted(_DLC_TO_LENGTH, length).astype(np.uint8)
+
+
+def _data_lengths(dlc, rtr, fdf):
+    return np.where(rtr, 0, dlc_to_length(dlc, fdf))
+
+
+def encode_frames(frames):
+    """Encodes frames to word images, one row of MAX_FRAME_WORDS per frame.
+
+    Returns the images and the number of valid words of every frame.
+    The frame format word carries the RWCNT field, so the images can be
+    written to the TXT buffers as well as used as the contents
+    of the RX buffer.
+    """
+    frames = np.asarray(frames, dtype=FRAME_DTYPE)
+    n = len(frames)
+
+    dlc = frames["dlc"].astype(np.uint32) & _mask(FRAME_FORMAT_DLC_WIDTH)
+    rtr = frames["rtr"].astype(np.uint32)
+    ide = frames["ide"].astype(np.uint32)
+    fdf = frames["fdf"].astype(np.uint32)
+    brs = frames["brs"].astype(np.uint32)
+    length = _data_lengths(dlc, frames["rtr"], frames["fdf"])
+    data_words = (length + 3) // 4
+    rwcnt = HEADER_WORDS - 1 + data_words
+
+    words = np.zeros((n, MAX_FRAME_WORDS), dtype=np.uint32)
+    ffw = dlc << FRAME_FORMAT_DLC_START_BIT
+    ffw |= rtr << FRAME_FORMAT_RTR_BIT
+    ffw |= ide << FRAME_FORMAT_IDE_BIT
+    ffw |= fdf << FRAME_FORMAT_FDF_BIT
+    ffw |= brs << FRAME_FORMAT_BRS_BIT
+    ffw |= rwcnt.astype(np.uint32) << FRAME_FORMAT_RWCNT_START_BIT
+    words[:, 0] = ffw
+
+    ident = frames["id"]
+    std_id = (ident & _mask(IDENTIFIER_STD_WIDTH)) << IDENTIFIER_STD_START_BIT
+    ext_id = ident & _mask(EXT_ID_WIDTH)
+    words[:, 1] = np.where(frames["ide"], ext_id, std_id)
+
+    timestamp = frames["timestamp"]
+    words[:, 2] = timestamp & _mask(32)
+    words[:, 3] = timestamp >> np.uint64(32)
+
+    # bytes beyond the data length are not sent
+    data = np.where(
+        np.arange(DLC_TO_LENGTH[-1]) < length[:, None], frames["data"], 0
+    ).astype(np.uint8)
+    words[:, HEADER_WORDS:] = data.view("<u4")
+
+    return words, HEADER_WORDS + data_words
+
+
+def encode_stream(frames):
+    """Encodes frames to a single stream of words, as read from RX_DATA."""
+    words, counts = encode_frames(frames)
+    return words[np.arange(MAX_FRAME_WORDS) < counts[:, None]]
+
+
+def decode_frames(words):
+    """Decodes word images, one frame per row, to an array of frames."""
+    words = np.asarray(words, dtype=np.uint32).reshape(-1, MAX_FRAME_WORDS)
+    frames = np.zeros(len(words), dtype=FRAME_DTYPE)
+
+    ffw = words[:, 0]
+    dlc = (ffw >> FRAME_FORMAT_DLC_START_BIT) & _mask(FRAME_FORMAT_DLC_WIDTH)
+    frames["dlc"] = dlc
+    frames["rtr"] = (ffw >> FRAME_FORMAT_RTR_BIT) & 1
+    frames["ide"] = (ffw >> FRAME_FORMAT_IDE_BIT) & 1
+    frames["fdf"] = (ffw >> FRAME_FORMAT_FDF_BIT) & 1
+    frames["brs"] = (ffw >> FRAME_FORMAT_BRS_BIT) & 1
+
+    ident = words[:, 1]
+    std_id = (ident >> IDENTIFIER_STD_START_BIT) & _mask(IDENTIFIER_STD_WIDTH)
+    ext_id = ident & _mask(EXT_ID_WIDTH)
+    frames["id"] = np.where(frames["ide"], ext_id, std_id)
+
+    frames["timestamp"] = (
+        words[:, 2].astype(np.uint64)
+        | (words[:, 3].astype(np.uint64) << np.uint64(32))
+    )
+
+    length = _data_lengths(dlc, frames["rtr"], frames["fdf"])
+    data = np.ascontiguousarray(words[:, HEADER_WORDS:]).astype("<u4")
+    frames["data"] = np.where(
+        np.arange(DLC_TO_LENGTH[-1]) < length[:, None], data.view(np.uint8), 0
+    )
+
+    return frames
+
+
+def decode_stream(stream):
+    """Decodes a stream of words, as read from RX_DATA, to an array of frames.
+
+    The frames are found by the RWCNT field of their frame format words.
+    """
+    stream = np.asarray(stream, dtype=np.uint32)
+    rwcnt = stream >> FRAME_FORMAT_RWCNT_START_BIT
+    rwcnt &= _mask(FRAME_FORMAT_RWCNT_WIDTH)
+
+    # every frame starts right after the previous one, so only this walk
+    # over the frames is sequential
+    rwcnt_list = rwcnt.tolist()
+    starts = []
+    pos = 0
+    while pos < len(rwcnt_list):
+        starts.append(pos)
+        pos += 1 + rwcnt_list[pos]
+    if pos != len(stream):
+        raise Exception("Stream ends in the middle of a frame")
+
+    starts = np.array(starts, dtype=np.int64)
+    counts = 1 + rwcnt[starts]
+    padded = np.concatenate([stream, np.zeros(MAX_FRAME_WORDS, np.uint32)])
+    offsets = np.arange(MAX_FRAME_WORDS)
+    words = np.where(
+        offsets < counts[:, None], padded[starts[:, None] + offsets], 0
+    )
+
+    return decode_frames(words)
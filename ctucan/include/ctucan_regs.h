@@ -0,0 +1,557 @@
+/* Generated from ctucan/regmap.json, do not edit */
+
+#ifndef CTUCAN_REGS_H
+#define CTUCAN_REGS_H
+
+/* DEVICE_ID - Identifier of the core, reads 0xCAFD */
+#define CTUCAN_DEVICE_ID_OFFSET 0x0
+
+/* VERSION - Version of the core */
+#define CTUCAN_VERSION_OFFSET 0x2
+#define CTUCAN_VERSION_VER_MINOR_START_BIT 0
+#define CTUCAN_VERSION_VER_MINOR_WIDTH 8
+#define CTUCAN_VERSION_VER_MINOR_MASK 0x000000ffu
+#define CTUCAN_VERSION_VER_MAJOR_START_BIT 8
+#define CTUCAN_VERSION_VER_MAJOR_WIDTH 8
+#define CTUCAN_VERSION_VER_MAJOR_MASK 0x0000ff00u
+
+/* MODE - Operating mode */
+#define CTUCAN_MODE_OFFSET 0x4
+#define CTUCAN_MODE_RST_BIT 0
+#define CTUCAN_MODE_RST_MASK 0x00000001u
+#define CTUCAN_MODE_BMM_BIT 1
+#define CTUCAN_MODE_BMM_MASK 0x00000002u
+#define CTUCAN_MODE_STM_BIT 2
+#define CTUCAN_MODE_STM_MASK 0x00000004u
+#define CTUCAN_MODE_AFM_BIT 3
+#define CTUCAN_MODE_AFM_MASK 0x00000008u
+#define CTUCAN_MODE_FDE_BIT 4
+#define CTUCAN_MODE_FDE_MASK 0x00000010u
+#define CTUCAN_MODE_TTTM_BIT 5
+#define CTUCAN_MODE_TTTM_MASK 0x00000020u
+#define CTUCAN_MODE_ROM_BIT 6
+#define CTUCAN_MODE_ROM_MASK 0x00000040u
+#define CTUCAN_MODE_ACF_BIT 7
+#define CTUCAN_MODE_ACF_MASK 0x00000080u
+#define CTUCAN_MODE_TSTM_BIT 8
+#define CTUCAN_MODE_TSTM_MASK 0x00000100u
+#define CTUCAN_MODE_RXBAM_BIT 9
+#define CTUCAN_MODE_RXBAM_MASK 0x00000200u
+#define CTUCAN_MODE_TXBBM_BIT 10
+#define CTUCAN_MODE_TXBBM_MASK 0x00000400u
+#define CTUCAN_MODE_SAM_BIT 11
+#define CTUCAN_MODE_SAM_MASK 0x00000800u
+
+/* SETTINGS - Settings of the core */
+#define CTUCAN_SETTINGS_OFFSET 0x6
+#define CTUCAN_SETTINGS_RTRLE_BIT 0
+#define CTUCAN_SETTINGS_RTRLE_MASK 0x00000001u
+#define CTUCAN_SETTINGS_RTRTH_START_BIT 1
+#define CTUCAN_SETTINGS_RTRTH_WIDTH 4
+#define CTUCAN_SETTINGS_RTRTH_MASK 0x0000001eu
+#define CTUCAN_SETTINGS_ILBP_BIT 5
+#define CTUCAN_SETTINGS_ILBP_MASK 0x00000020u
+#define CTUCAN_SETTINGS_ENA_BIT 6
+#define CTUCAN_SETTINGS_ENA_MASK 0x00000040u
+#define CTUCAN_SETTINGS_NISOFD_BIT 7
+#define CTUCAN_SETTINGS_NISOFD_MASK 0x00000080u
+#define CTUCAN_SETTINGS_PEX_BIT 8
+#define CTUCAN_SETTINGS_PEX_MASK 0x00000100u
+#define CTUCAN_SETTINGS_TBFBO_BIT 9
+#define CTUCAN_SETTINGS_TBFBO_MASK 0x00000200u
+#define CTUCAN_SETTINGS_FDRF_BIT 10
+#define CTUCAN_SETTINGS_FDRF_MASK 0x00000400u
+
+/* STATUS - Status of the core */
+#define CTUCAN_STATUS_OFFSET 0x8
+#define CTUCAN_STATUS_RXNE_BIT 0
+#define CTUCAN_STATUS_RXNE_MASK 0x00000001u
+#define CTUCAN_STATUS_DOR_BIT 1
+#define CTUCAN_STATUS_DOR_MASK 0x00000002u
+#define CTUCAN_STATUS_TXNF_BIT 2
+#define CTUCAN_STATUS_TXNF_MASK 0x00000004u
+#define CTUCAN_STATUS_EFT_BIT 3
+#define CTUCAN_STATUS_EFT_MASK 0x00000008u
+#define CTUCAN_STATUS_RXS_BIT 4
+#define CTUCAN_STATUS_RXS_MASK 0x00000010u
+#define CTUCAN_STATUS_TXS_BIT 5
+#define CTUCAN_STATUS_TXS_MASK 0x00000020u
+#define CTUCAN_STATUS_EWL_BIT 6
+#define CTUCAN_STATUS_EWL_MASK 0x00000040u
+#define CTUCAN_STATUS_IDLE_BIT 7
+#define CTUCAN_STATUS_IDLE_MASK 0x00000080u
+#define CTUCAN_STATUS_PEXS_BIT 8
+#define CTUCAN_STATUS_PEXS_MASK 0x00000100u
+
+/* COMMAND - Commands of the core, act on the bits written as 1 */
+#define CTUCAN_COMMAND_OFFSET 0xc
+#define CTUCAN_COMMAND_RXRPMV_BIT 1
+#define CTUCAN_COMMAND_RXRPMV_MASK 0x00000002u
+#define CTUCAN_COMMAND_RRB_BIT 2
+#define CTUCAN_COMMAND_RRB_MASK 0x00000004u
+#define CTUCAN_COMMAND_CDO_BIT 3
+#define CTUCAN_COMMAND_CDO_MASK 0x00000008u
+#define CTUCAN_COMMAND_ERCRST_BIT 4
+#define CTUCAN_COMMAND_ERCRST_MASK 0x00000010u
+#define CTUCAN_COMMAND_RXFCRST_BIT 5
+#define CTUCAN_COMMAND_RXFCRST_MASK 0x00000020u
+#define CTUCAN_COMMAND_TXFCRST_BIT 6
+#define CTUCAN_COMMAND_TXFCRST_MASK 0x00000040u
+#define CTUCAN_COMMAND_CPEXS_BIT 7
+#define CTUCAN_COMMAND_CPEXS_MASK 0x00000080u
+
+/* INT_STAT - Interrupt status, write 1 to clear */
+#define CTUCAN_INT_STAT_OFFSET 0x10
+#define CTUCAN_INT_STAT_RXI_BIT 0
+#define CTUCAN_INT_STAT_RXI_MASK 0x00000001u
+#define CTUCAN_INT_STAT_TXI_BIT 1
+#define CTUCAN_INT_STAT_TXI_MASK 0x00000002u
+#define CTUCAN_INT_STAT_EWLI_BIT 2
+#define CTUCAN_INT_STAT_EWLI_MASK 0x00000004u
+#define CTUCAN_INT_STAT_DOI_BIT 3
+#define CTUCAN_INT_STAT_DOI_MASK 0x00000008u
+#define CTUCAN_INT_STAT_FCSI_BIT 4
+#define CTUCAN_INT_STAT_FCSI_MASK 0x00000010u
+#define CTUCAN_INT_STAT_ALI_BIT 5
+#define CTUCAN_INT_STAT_ALI_MASK 0x00000020u
+#define CTUCAN_INT_STAT_BEI_BIT 6
+#define CTUCAN_INT_STAT_BEI_MASK 0x00000040u
+#define CTUCAN_INT_STAT_OFI_BIT 7
+#define CTUCAN_INT_STAT_OFI_MASK 0x00000080u
+#define CTUCAN_INT_STAT_RXFI_BIT 8
+#define CTUCAN_INT_STAT_RXFI_MASK 0x00000100u
+#define CTUCAN_INT_STAT_BSI_BIT 9
+#define CTUCAN_INT_STAT_BSI_MASK 0x00000200u
+#define CTUCAN_INT_STAT_RBNEI_BIT 10
+#define CTUCAN_INT_STAT_RBNEI_MASK 0x00000400u
+#define CTUCAN_INT_STAT_TXBHCI_BIT 11
+#define CTUCAN_INT_STAT_TXBHCI_MASK 0x00000800u
+
+/* INT_ENA_SET - Write 1 to enable the interrupts, reads the enabled ones, same bits as INT_STAT */
+#define CTUCAN_INT_ENA_SET_OFFSET 0x14
+
+/* INT_ENA_CLR - Write 1 to disable the interrupts, same bits as INT_STAT */
+#define CTUCAN_INT_ENA_CLR_OFFSET 0x18
+
+/* INT_MASK_SET - Write 1 to mask the interrupts, reads the masked ones, same bits as INT_STAT */
+#define CTUCAN_INT_MASK_SET_OFFSET 0x1c
+
+/* INT_MASK_CLR - Write 1 to unmask the interrupts, same bits as INT_STAT */
+#define CTUCAN_INT_MASK_CLR_OFFSET 0x20
+
+/* BTR - Bit timing of the nominal bit rate */
+#define CTUCAN_BTR_OFFSET 0x24
+#define CTUCAN_BTR_PROP_START_BIT 0
+#define CTUCAN_BTR_PROP_WIDTH 7
+#define CTUCAN_BTR_PROP_MASK 0x0000007fu
+#define CTUCAN_BTR_PH1_START_BIT 7
+#define CTUCAN_BTR_PH1_WIDTH 6
+#define CTUCAN_BTR_PH1_MASK 0x00001f80u
+#define CTUCAN_BTR_PH2_START_BIT 13
+#define CTUCAN_BTR_PH2_WIDTH 6
+#define CTUCAN_BTR_PH2_MASK 0x0007e000u
+#define CTUCAN_BTR_BRP_START_BIT 19
+#define CTUCAN_BTR_BRP_WIDTH 8
+#define CTUCAN_BTR_BRP_MASK 0x07f80000u
+#define CTUCAN_BTR_SJW_START_BIT 27
+#define CTUCAN_BTR_SJW_WIDTH 5
+#define CTUCAN_BTR_SJW_MASK 0xf8000000u
+
+/* BTR_FD - Bit timing of the data bit rate */
+#define CTUCAN_BTR_FD_OFFSET 0x28
+#define CTUCAN_BTR_FD_PROP_FD_START_BIT 0
+#define CTUCAN_BTR_FD_PROP_FD_WIDTH 6
+#define CTUCAN_BTR_FD_PROP_FD_MASK 0x0000003fu
+#define CTUCAN_BTR_FD_PH1_FD_START_BIT 7
+#define CTUCAN_BTR_FD_PH1_FD_WIDTH 5
+#define CTUCAN_BTR_FD_PH1_FD_MASK 0x00000f80u
+#define CTUCAN_BTR_FD_PH2_FD_START_BIT 13
+#define CTUCAN_BTR_FD_PH2_FD_WIDTH 5
+#define CTUCAN_BTR_FD_PH2_FD_MASK 0x0003e000u
+#define CTUCAN_BTR_FD_BRP_FD_START_BIT 19
+#define CTUCAN_BTR_FD_BRP_FD_WIDTH 8
+#define CTUCAN_BTR_FD_BRP_FD_MASK 0x07f80000u
+#define CTUCAN_BTR_FD_SJW_FD_START_BIT 27
+#define CTUCAN_BTR_FD_SJW_FD_WIDTH 5
+#define CTUCAN_BTR_FD_SJW_FD_MASK 0xf8000000u
+
+/* EWL - Error warning limit */
+#define CTUCAN_EWL_OFFSET 0x2c
+#define CTUCAN_EWL_EW_LIMIT_START_BIT 0
+#define CTUCAN_EWL_EW_LIMIT_WIDTH 8
+#define CTUCAN_EWL_EW_LIMIT_MASK 0x000000ffu
+
+/* ERP - Error passive limit */
+#define CTUCAN_ERP_OFFSET 0x2d
+#define CTUCAN_ERP_ERP_LIMIT_START_BIT 0
+#define CTUCAN_ERP_ERP_LIMIT_WIDTH 8
+#define CTUCAN_ERP_ERP_LIMIT_MASK 0x000000ffu
+
+/* FAULT_STATE - Fault confinement state */
+#define CTUCAN_FAULT_STATE_OFFSET 0x2e
+#define CTUCAN_FAULT_STATE_ERA_BIT 0
+#define CTUCAN_FAULT_STATE_ERA_MASK 0x00000001u
+#define CTUCAN_FAULT_STATE_ERP_BIT 1
+#define CTUCAN_FAULT_STATE_ERP_MASK 0x00000002u
+#define CTUCAN_FAULT_STATE_BOF_BIT 2
+#define CTUCAN_FAULT_STATE_BOF_MASK 0x00000004u
+
+/* REC - Receive error counter */
+#define CTUCAN_REC_OFFSET 0x30
+#define CTUCAN_REC_REC_VAL_START_BIT 0
+#define CTUCAN_REC_REC_VAL_WIDTH 9
+#define CTUCAN_REC_REC_VAL_MASK 0x000001ffu
+
+/* TEC - Transmit error counter */
+#define CTUCAN_TEC_OFFSET 0x32
+#define CTUCAN_TEC_TEC_VAL_START_BIT 0
+#define CTUCAN_TEC_TEC_VAL_WIDTH 9
+#define CTUCAN_TEC_TEC_VAL_MASK 0x000001ffu
+
+/* ERR_NORM - Errors in the nominal bit rate */
+#define CTUCAN_ERR_NORM_OFFSET 0x34
+#define CTUCAN_ERR_NORM_ERR_NORM_VAL_START_BIT 0
+#define CTUCAN_ERR_NORM_ERR_NORM_VAL_WIDTH 16
+#define CTUCAN_ERR_NORM_ERR_NORM_VAL_MASK 0x0000ffffu
+
+/* ERR_FD - Errors in the data bit rate */
+#define CTUCAN_ERR_FD_OFFSET 0x36
+#define CTUCAN_ERR_FD_ERR_FD_VAL_START_BIT 0
+#define CTUCAN_ERR_FD_ERR_FD_VAL_WIDTH 16
+#define CTUCAN_ERR_FD_ERR_FD_VAL_MASK 0x0000ffffu
+
+/* CTR_PRES - Presets the error counter selected by the bits written as 1 */
+#define CTUCAN_CTR_PRES_OFFSET 0x38
+#define CTUCAN_CTR_PRES_CTPV_START_BIT 0
+#define CTUCAN_CTR_PRES_CTPV_WIDTH 9
+#define CTUCAN_CTR_PRES_CTPV_MASK 0x000001ffu
+#define CTUCAN_CTR_PRES_PTX_BIT 9
+#define CTUCAN_CTR_PRES_PTX_MASK 0x00000200u
+#define CTUCAN_CTR_PRES_PRX_BIT 10
+#define CTUCAN_CTR_PRES_PRX_MASK 0x00000400u
+#define CTUCAN_CTR_PRES_ENORM_BIT 11
+#define CTUCAN_CTR_PRES_ENORM_MASK 0x00000800u
+#define CTUCAN_CTR_PRES_EFD_BIT 12
+#define CTUCAN_CTR_PRES_EFD_MASK 0x00001000u
+
+/* FILTER_A_MASK - Mask of the bit filter A */
+#define CTUCAN_FILTER_A_MASK_OFFSET 0x3c
+#define CTUCAN_FILTER_A_MASK_BIT_MASK_A_VAL_START_BIT 0
+#define CTUCAN_FILTER_A_MASK_BIT_MASK_A_VAL_WIDTH 29
+#define CTUCAN_FILTER_A_MASK_BIT_MASK_A_VAL_MASK 0x1fffffffu
+
+/* FILTER_A_VAL - Value of the bit filter A */
+#define CTUCAN_FILTER_A_VAL_OFFSET 0x40
+#define CTUCAN_FILTER_A_VAL_BIT_VAL_A_VAL_START_BIT 0
+#define CTUCAN_FILTER_A_VAL_BIT_VAL_A_VAL_WIDTH 29
+#define CTUCAN_FILTER_A_VAL_BIT_VAL_A_VAL_MASK 0x1fffffffu
+
+/* FILTER_B_MASK - Mask of the bit filter B */
+#define CTUCAN_FILTER_B_MASK_OFFSET 0x44
+#define CTUCAN_FILTER_B_MASK_BIT_MASK_B_VAL_START_BIT 0
+#define CTUCAN_FILTER_B_MASK_BIT_MASK_B_VAL_WIDTH 29
+#define CTUCAN_FILTER_B_MASK_BIT_MASK_B_VAL_MASK 0x1fffffffu
+
+/* FILTER_B_VAL - Value of the bit filter B */
+#define CTUCAN_FILTER_B_VAL_OFFSET 0x48
+#define CTUCAN_FILTER_B_VAL_BIT_VAL_B_VAL_START_BIT 0
+#define CTUCAN_FILTER_B_VAL_BIT_VAL_B_VAL_WIDTH 29
+#define CTUCAN_FILTER_B_VAL_BIT_VAL_B_VAL_MASK 0x1fffffffu
+
+/* FILTER_C_MASK - Mask of the bit filter C */
+#define CTUCAN_FILTER_C_MASK_OFFSET 0x4c
+#define CTUCAN_FILTER_C_MASK_BIT_MASK_C_VAL_START_BIT 0
+#define CTUCAN_FILTER_C_MASK_BIT_MASK_C_VAL_WIDTH 29
+#define CTUCAN_FILTER_C_MASK_BIT_MASK_C_VAL_MASK 0x1fffffffu
+
+/* FILTER_C_VAL - Value of the bit filter C */
+#define CTUCAN_FILTER_C_VAL_OFFSET 0x50
+#define CTUCAN_FILTER_C_VAL_BIT_VAL_C_VAL_START_BIT 0
+#define CTUCAN_FILTER_C_VAL_BIT_VAL_C_VAL_WIDTH 29
+#define CTUCAN_FILTER_C_VAL_BIT_VAL_C_VAL_MASK 0x1fffffffu
+
+/* FILTER_RAN_LOW - Lower bound of the range filter */
+#define CTUCAN_FILTER_RAN_LOW_OFFSET 0x54
+#define CTUCAN_FILTER_RAN_LOW_BIT_RAN_LOW_VAL_START_BIT 0
+#define CTUCAN_FILTER_RAN_LOW_BIT_RAN_LOW_VAL_WIDTH 29
+#define CTUCAN_FILTER_RAN_LOW_BIT_RAN_LOW_VAL_MASK 0x1fffffffu
+
+/* FILTER_RAN_HIGH - Upper bound of the range filter */
+#define CTUCAN_FILTER_RAN_HIGH_OFFSET 0x58
+#define CTUCAN_FILTER_RAN_HIGH_BIT_RAN_HIGH_VAL_START_BIT 0
+#define CTUCAN_FILTER_RAN_HIGH_BIT_RAN_HIGH_VAL_WIDTH 29
+#define CTUCAN_FILTER_RAN_HIGH_BIT_RAN_HIGH_VAL_MASK 0x1fffffffu
+
+/* FILTER_CONTROL - Frame types accepted by the filters */
+#define CTUCAN_FILTER_CONTROL_OFFSET 0x5c
+#define CTUCAN_FILTER_CONTROL_FANB_BIT 0
+#define CTUCAN_FILTER_CONTROL_FANB_MASK 0x00000001u
+#define CTUCAN_FILTER_CONTROL_FANE_BIT 1
+#define CTUCAN_FILTER_CONTROL_FANE_MASK 0x00000002u
+#define CTUCAN_FILTER_CONTROL_FAFB_BIT 2
+#define CTUCAN_FILTER_CONTROL_FAFB_MASK 0x00000004u
+#define CTUCAN_FILTER_CONTROL_FAFE_BIT 3
+#define CTUCAN_FILTER_CONTROL_FAFE_MASK 0x00000008u
+#define CTUCAN_FILTER_CONTROL_FBNB_BIT 4
+#define CTUCAN_FILTER_CONTROL_FBNB_MASK 0x00000010u
+#define CTUCAN_FILTER_CONTROL_FBNE_BIT 5
+#define CTUCAN_FILTER_CONTROL_FBNE_MASK 0x00000020u
+#define CTUCAN_FILTER_CONTROL_FBFB_BIT 6
+#define CTUCAN_FILTER_CONTROL_FBFB_MASK 0x00000040u
+#define CTUCAN_FILTER_CONTROL_FBFE_BIT 7
+#define CTUCAN_FILTER_CONTROL_FBFE_MASK 0x00000080u
+#define CTUCAN_FILTER_CONTROL_FCNB_BIT 8
+#define CTUCAN_FILTER_CONTROL_FCNB_MASK 0x00000100u
+#define CTUCAN_FILTER_CONTROL_FCNE_BIT 9
+#define CTUCAN_FILTER_CONTROL_FCNE_MASK 0x00000200u
+#define CTUCAN_FILTER_CONTROL_FCFB_BIT 10
+#define CTUCAN_FILTER_CONTROL_FCFB_MASK 0x00000400u
+#define CTUCAN_FILTER_CONTROL_FCFE_BIT 11
+#define CTUCAN_FILTER_CONTROL_FCFE_MASK 0x00000800u
+#define CTUCAN_FILTER_CONTROL_FRNB_BIT 12
+#define CTUCAN_FILTER_CONTROL_FRNB_MASK 0x00001000u
+#define CTUCAN_FILTER_CONTROL_FRNE_BIT 13
+#define CTUCAN_FILTER_CONTROL_FRNE_MASK 0x00002000u
+#define CTUCAN_FILTER_CONTROL_FRFB_BIT 14
+#define CTUCAN_FILTER_CONTROL_FRFB_MASK 0x00004000u
+#define CTUCAN_FILTER_CONTROL_FRFE_BIT 15
+#define CTUCAN_FILTER_CONTROL_FRFE_MASK 0x00008000u
+
+/* FILTER_STATUS - Filters present in the core */
+#define CTUCAN_FILTER_STATUS_OFFSET 0x5e
+#define CTUCAN_FILTER_STATUS_SFA_BIT 0
+#define CTUCAN_FILTER_STATUS_SFA_MASK 0x00000001u
+#define CTUCAN_FILTER_STATUS_SFB_BIT 1
+#define CTUCAN_FILTER_STATUS_SFB_MASK 0x00000002u
+#define CTUCAN_FILTER_STATUS_SFC_BIT 2
+#define CTUCAN_FILTER_STATUS_SFC_MASK 0x00000004u
+#define CTUCAN_FILTER_STATUS_SFR_BIT 3
+#define CTUCAN_FILTER_STATUS_SFR_MASK 0x00000008u
+
+/* RX_MEM_INFO - Size of the RX buffer in words */
+#define CTUCAN_RX_MEM_INFO_OFFSET 0x60
+#define CTUCAN_RX_MEM_INFO_RX_BUFF_SIZE_START_BIT 0
+#define CTUCAN_RX_MEM_INFO_RX_BUFF_SIZE_WIDTH 13
+#define CTUCAN_RX_MEM_INFO_RX_BUFF_SIZE_MASK 0x00001fffu
+#define CTUCAN_RX_MEM_INFO_RX_MEM_FREE_START_BIT 16
+#define CTUCAN_RX_MEM_INFO_RX_MEM_FREE_WIDTH 13
+#define CTUCAN_RX_MEM_INFO_RX_MEM_FREE_MASK 0x1fff0000u
+
+/* RX_POINTERS - Pointers of the RX buffer */
+#define CTUCAN_RX_POINTERS_OFFSET 0x64
+#define CTUCAN_RX_POINTERS_RX_WPP_START_BIT 0
+#define CTUCAN_RX_POINTERS_RX_WPP_WIDTH 12
+#define CTUCAN_RX_POINTERS_RX_WPP_MASK 0x00000fffu
+#define CTUCAN_RX_POINTERS_RX_RPP_START_BIT 16
+#define CTUCAN_RX_POINTERS_RX_RPP_WIDTH 12
+#define CTUCAN_RX_POINTERS_RX_RPP_MASK 0x0fff0000u
+
+/* RX_STATUS - Status of the RX buffer */
+#define CTUCAN_RX_STATUS_OFFSET 0x68
+#define CTUCAN_RX_STATUS_RXE_BIT 0
+#define CTUCAN_RX_STATUS_RXE_MASK 0x00000001u
+#define CTUCAN_RX_STATUS_RXF_BIT 1
+#define CTUCAN_RX_STATUS_RXF_MASK 0x00000002u
+#define CTUCAN_RX_STATUS_RXFRC_START_BIT 4
+#define CTUCAN_RX_STATUS_RXFRC_WIDTH 11
+#define CTUCAN_RX_STATUS_RXFRC_MASK 0x00007ff0u
+
+/* RX_SETTINGS - Settings of the RX buffer */
+#define CTUCAN_RX_SETTINGS_OFFSET 0x6a
+#define CTUCAN_RX_SETTINGS_RTSOP_BIT 0
+#define CTUCAN_RX_SETTINGS_RTSOP_MASK 0x00000001u
+
+/* RX_DATA - Next word of the RX buffer */
+#define CTUCAN_RX_DATA_OFFSET 0x6c
+
+/* TX_STATUS - States of the TXT buffers */
+#define CTUCAN_TX_STATUS_OFFSET 0x70
+#define CTUCAN_TX_STATUS_TX1S_START_BIT 0
+#define CTUCAN_TX_STATUS_TX1S_WIDTH 4
+#define CTUCAN_TX_STATUS_TX1S_MASK 0x0000000fu
+#define CTUCAN_TX_STATUS_TX2S_START_BIT 4
+#define CTUCAN_TX_STATUS_TX2S_WIDTH 4
+#define CTUCAN_TX_STATUS_TX2S_MASK 0x000000f0u
+#define CTUCAN_TX_STATUS_TX3S_START_BIT 8
+#define CTUCAN_TX_STATUS_TX3S_WIDTH 4
+#define CTUCAN_TX_STATUS_TX3S_MASK 0x00000f00u
+#define CTUCAN_TX_STATUS_TX4S_START_BIT 12
+#define CTUCAN_TX_STATUS_TX4S_WIDTH 4
+#define CTUCAN_TX_STATUS_TX4S_MASK 0x0000f000u
+
+/* TXT_COMMAND - Commands of the TXT buffers */
+#define CTUCAN_TXT_COMMAND_OFFSET 0x74
+#define CTUCAN_TXT_COMMAND_TXCE_BIT 0
+#define CTUCAN_TXT_COMMAND_TXCE_MASK 0x00000001u
+#define CTUCAN_TXT_COMMAND_TXCR_BIT 1
+#define CTUCAN_TXT_COMMAND_TXCR_MASK 0x00000002u
+#define CTUCAN_TXT_COMMAND_TXCA_BIT 2
+#define CTUCAN_TXT_COMMAND_TXCA_MASK 0x00000004u
+#define CTUCAN_TXT_COMMAND_TXB1_BIT 8
+#define CTUCAN_TXT_COMMAND_TXB1_MASK 0x00000100u
+#define CTUCAN_TXT_COMMAND_TXB2_BIT 9
+#define CTUCAN_TXT_COMMAND_TXB2_MASK 0x00000200u
+#define CTUCAN_TXT_COMMAND_TXB3_BIT 10
+#define CTUCAN_TXT_COMMAND_TXB3_MASK 0x00000400u
+#define CTUCAN_TXT_COMMAND_TXB4_BIT 11
+#define CTUCAN_TXT_COMMAND_TXB4_MASK 0x00000800u
+
+/* TXTB_INFO - Number of the TXT buffers */
+#define CTUCAN_TXTB_INFO_OFFSET 0x76
+#define CTUCAN_TXTB_INFO_TXT_BUFFER_COUNT_START_BIT 0
+#define CTUCAN_TXTB_INFO_TXT_BUFFER_COUNT_WIDTH 4
+#define CTUCAN_TXTB_INFO_TXT_BUFFER_COUNT_MASK 0x0000000fu
+
+/* TX_PRIORITY - Priorities of the TXT buffers */
+#define CTUCAN_TX_PRIORITY_OFFSET 0x78
+#define CTUCAN_TX_PRIORITY_TXT1P_START_BIT 0
+#define CTUCAN_TX_PRIORITY_TXT1P_WIDTH 3
+#define CTUCAN_TX_PRIORITY_TXT1P_MASK 0x00000007u
+#define CTUCAN_TX_PRIORITY_TXT2P_START_BIT 4
+#define CTUCAN_TX_PRIORITY_TXT2P_WIDTH 3
+#define CTUCAN_TX_PRIORITY_TXT2P_MASK 0x00000070u
+#define CTUCAN_TX_PRIORITY_TXT3P_START_BIT 8
+#define CTUCAN_TX_PRIORITY_TXT3P_WIDTH 3
+#define CTUCAN_TX_PRIORITY_TXT3P_MASK 0x00000700u
+#define CTUCAN_TX_PRIORITY_TXT4P_START_BIT 12
+#define CTUCAN_TX_PRIORITY_TXT4P_WIDTH 3
+#define CTUCAN_TX_PRIORITY_TXT4P_MASK 0x00007000u
+
+/* ERR_CAPT - Last error of the bus */
+#define CTUCAN_ERR_CAPT_OFFSET 0x7c
+#define CTUCAN_ERR_CAPT_ERR_POS_START_BIT 0
+#define CTUCAN_ERR_CAPT_ERR_POS_WIDTH 5
+#define CTUCAN_ERR_CAPT_ERR_POS_MASK 0x0000001fu
+#define CTUCAN_ERR_CAPT_ERR_TYPE_START_BIT 5
+#define CTUCAN_ERR_CAPT_ERR_TYPE_WIDTH 3
+#define CTUCAN_ERR_CAPT_ERR_TYPE_MASK 0x000000e0u
+
+/* RETR_CTR - Retransmissions of the current frame */
+#define CTUCAN_RETR_CTR_OFFSET 0x7d
+#define CTUCAN_RETR_CTR_RETR_CTR_VAL_START_BIT 0
+#define CTUCAN_RETR_CTR_RETR_CTR_VAL_WIDTH 4
+#define CTUCAN_RETR_CTR_RETR_CTR_VAL_MASK 0x0000000fu
+
+/* ALC - Last arbitration loss */
+#define CTUCAN_ALC_OFFSET 0x7e
+#define CTUCAN_ALC_ALC_BIT_START_BIT 0
+#define CTUCAN_ALC_ALC_BIT_WIDTH 5
+#define CTUCAN_ALC_ALC_BIT_MASK 0x0000001fu
+#define CTUCAN_ALC_ALC_ID_FIELD_START_BIT 5
+#define CTUCAN_ALC_ALC_ID_FIELD_WIDTH 3
+#define CTUCAN_ALC_ALC_ID_FIELD_MASK 0x000000e0u
+
+/* TS_INFO - Width of the timestamp */
+#define CTUCAN_TS_INFO_OFFSET 0x7f
+#define CTUCAN_TS_INFO_TS_BITS_START_BIT 0
+#define CTUCAN_TS_INFO_TS_BITS_WIDTH 6
+#define CTUCAN_TS_INFO_TS_BITS_MASK 0x0000003fu
+
+/* TRV_DELAY - Measured transmitter delay */
+#define CTUCAN_TRV_DELAY_OFFSET 0x80
+#define CTUCAN_TRV_DELAY_TRV_DELAY_VALUE_START_BIT 0
+#define CTUCAN_TRV_DELAY_TRV_DELAY_VALUE_WIDTH 7
+#define CTUCAN_TRV_DELAY_TRV_DELAY_VALUE_MASK 0x0000007fu
+
+/* SSP_CFG - Secondary sample point configuration */
+#define CTUCAN_SSP_CFG_OFFSET 0x82
+#define CTUCAN_SSP_CFG_SSP_OFFSET_START_BIT 0
+#define CTUCAN_SSP_CFG_SSP_OFFSET_WIDTH 8
+#define CTUCAN_SSP_CFG_SSP_OFFSET_MASK 0x000000ffu
+#define CTUCAN_SSP_CFG_SSP_SRC_START_BIT 8
+#define CTUCAN_SSP_CFG_SSP_SRC_WIDTH 2
+#define CTUCAN_SSP_CFG_SSP_SRC_MASK 0x00000300u
+
+/* RX_FR_CTR - Number of received frames */
+#define CTUCAN_RX_FR_CTR_OFFSET 0x84
+#define CTUCAN_RX_FR_CTR_RX_FR_CTR_VAL_START_BIT 0
+#define CTUCAN_RX_FR_CTR_RX_FR_CTR_VAL_WIDTH 32
+#define CTUCAN_RX_FR_CTR_RX_FR_CTR_VAL_MASK 0xffffffffu
+
+/* TX_FR_CTR - Number of transmitted frames */
+#define CTUCAN_TX_FR_CTR_OFFSET 0x88
+#define CTUCAN_TX_FR_CTR_TX_FR_CTR_VAL_START_BIT 0
+#define CTUCAN_TX_FR_CTR_TX_FR_CTR_VAL_WIDTH 32
+#define CTUCAN_TX_FR_CTR_TX_FR_CTR_VAL_MASK 0xffffffffu
+
+/* DEBUG_REGISTER - Internal state of the protocol controller */
+#define CTUCAN_DEBUG_REGISTER_OFFSET 0x8c
+
+/* YOLO - Reads 0xDEADBEEF */
+#define CTUCAN_YOLO_OFFSET 0x90
+
+/* TIMESTAMP_LOW - Lower word of the timestamp of the core */
+#define CTUCAN_TIMESTAMP_LOW_OFFSET 0x94
+
+/* TIMESTAMP_HIGH - Upper word of the timestamp of the core */
+#define CTUCAN_TIMESTAMP_HIGH_OFFSET 0x98
+
+/* TXT_BUFFER - TXT buffer holding a frame to transmit */
+#define CTUCAN_TXT_BUFFER_OFFSET 0x100
+#define CTUCAN_TXT_BUFFER_SIZE 0x100
+#define CTUCAN_TXT_BUFFER_NUM 4
+#define CTUCAN_TXT_BUFFER_1_OFFSET 0x100
+#define CTUCAN_TXT_BUFFER_2_OFFSET 0x200
+#define CTUCAN_TXT_BUFFER_3_OFFSET 0x300
+#define CTUCAN_TXT_BUFFER_4_OFFSET 0x400
+
+/* FRAME_FORMAT - Frame format word */
+#define CTUCAN_FRAME_FORMAT_OFFSET 0x0
+#define CTUCAN_FRAME_FORMAT_DLC_START_BIT 0
+#define CTUCAN_FRAME_FORMAT_DLC_WIDTH 4
+#define CTUCAN_FRAME_FORMAT_DLC_MASK 0x0000000fu
+#define CTUCAN_FRAME_FORMAT_RTR_BIT 5
+#define CTUCAN_FRAME_FORMAT_RTR_MASK 0x00000020u
+#define CTUCAN_FRAME_FORMAT_IDE_BIT 6
+#define CTUCAN_FRAME_FORMAT_IDE_MASK 0x00000040u
+#define CTUCAN_FRAME_FORMAT_FDF_BIT 7
+#define CTUCAN_FRAME_FORMAT_FDF_MASK 0x00000080u
+#define CTUCAN_FRAME_FORMAT_BRS_BIT 9
+#define CTUCAN_FRAME_FORMAT_BRS_MASK 0x00000200u
+#define CTUCAN_FRAME_FORMAT_RWCNT_START_BIT 11
+#define CTUCAN_FRAME_FORMAT_RWCNT_WIDTH 5
+#define CTUCAN_FRAME_FORMAT_RWCNT_MASK 0x0000f800u
+
+/* IDENTIFIER - Identifier word */
+#define CTUCAN_IDENTIFIER_OFFSET 0x4
+#define CTUCAN_IDENTIFIER_EXT_START_BIT 0
+#define CTUCAN_IDENTIFIER_EXT_WIDTH 18
+#define CTUCAN_IDENTIFIER_EXT_MASK 0x0003ffffu
+#define CTUCAN_IDENTIFIER_STD_START_BIT 18
+#define CTUCAN_IDENTIFIER_STD_WIDTH 11
+#define CTUCAN_IDENTIFIER_STD_MASK 0x1ffc0000u
+
+/* TIMESTAMP_L - Lower word of the timestamp */
+#define CTUCAN_TIMESTAMP_L_OFFSET 0x8
+
+/* TIMESTAMP_U - Upper word of the timestamp */
+#define CTUCAN_TIMESTAMP_U_OFFSET 0xc
+
+/* DATA_START - First word of the data */
+#define CTUCAN_DATA_START_OFFSET 0x10
+
+/* Width of the state of a TXT buffer */
+#define CTUCAN_TX_STATUS_TXTS_WIDTH 4
+
+/* Ready */
+#define CTUCAN_TXT_STATE_RDY 1
+
+/* In transmission */
+#define CTUCAN_TXT_STATE_TRAN 2
+
+/* Abort in progress */
+#define CTUCAN_TXT_STATE_ABTP 3
+
+/* Transmitted */
+#define CTUCAN_TXT_STATE_TOK 4
+
+/* Failed */
+#define CTUCAN_TXT_STATE_ERR 6
+
+/* Aborted */
+#define CTUCAN_TXT_STATE_ABT 7
+
+/* Empty */
+#define CTUCAN_TXT_STATE_ETY 8
+
+#endif /* CTUCAN_REGS_H */
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 Antmicro
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from migen import *
+
+from litex.soc.interconnect.csr import AutoCSR, CSRStatus, CSRStorage
+from ctucan.registers import *
+
+__all__ = ["CTUCANPerfCounters"]
+
+COUNTERS = [
+    ("reads", "Read accesses"),
+    ("writes", "Write accesses"),
+    ("wait_states", "Cycles of the accesses without an acknowledge"),
+    ("rx_data_reads", "Words read from RX_DATA"),
+    ("irqs", "Interrupt assertions"),
+    (
+        "irq_latency_max",
+        "Maximum number of cycles from an interrupt assertion "
+        "to the next access"
+    ),
+]
+
+
+class CTUCANPerfCounters(Module, AutoCSR):
+    """Counters of the accesses to the registers of the CTUCAN module.
+
+    The counters watch the Wishbone interface used by the CPU and the
+    interrupt it receives. They are not visible in the CSRs until
+    a snapshot is taken, so all of them are read from the same cycle.
+    Writing 1 to both bits of the control register takes the snapshot and
+    clears the counters in the same cycle.
+    """
+
+    def __init__(self, bus, irq, width=32):
+
+        # CSRs
+        self._control = CSRStorage(
+            2,
+            description="Write 1 to bit 0 to take a snapshot of the counters, "
+            "write 1 to bit 1 to clear them."
+        )
+        for name, description in COUNTERS:
+            csr = CSRStatus(width, name=name, description=description)
+            setattr(self, f"_{name}", csr)
+
+        # parameters
+
+        snapshot = Signal()
+        clear = Signal()
+        self.comb += [
+            snapshot.eq(self._control.re & self._control.storage[0]),
+            clear.eq(self._control.re & self._control.storage[1]),
+        ]
+
+        counters = {name: Signal(width) for name, _ in COUNTERS}
+
+        access = Signal()
+        ack_read = Signal()
+        ack_write = Signal()
+        rx_data = Signal()
+        self.comb += [
+            access.eq(bus.cyc & bus.stb),
+            ack_read.eq(bus.ack & ~bus.we),
+            ack_write.eq(bus.ack & bus.we),
+            rx_data.eq(bus.adr == RX_DATA_OFFSET >> 2),
+        ]
+
+        irq_prev = Signal()
+        irq_rise = Signal()
+        irq_waiting = Signal()
+        irq_latency = Signal(width)
+        self.comb += irq_rise.eq(irq & ~irq_prev)
+        self.sync += irq_prev.eq(irq)
+
+        self.sync += [
+            If(
+                irq_rise,
+                irq_waiting.eq(1),
+                irq_latency.eq(0),
+            ).Elif(
+                irq_waiting & access,
+                irq_waiting.eq(0),
+            ).Elif(
+                irq_waiting,
+                irq_latency.eq(irq_latency + 1),
+            ),
+        ]
+
+        events = {
+            "reads": ack_read,
+            "writes": ack_write,
+            "wait_states": access & ~bus.ack,
+            "rx_data_reads": ack_read & rx_data,
+            "irqs": irq_rise,
+        }
+        latency_max = counters["irq_latency_max"]
+
+        updates = []
+        for name, event in events.items():
+            counter = counters[name]
+            updates.append(If(event, counter.eq(counter + 1)))
+        updates.append(
+            If(
+                irq_waiting & access & (irq_latency > latency_max),
+                latency_max.eq(irq_latency),
+            )
+        )
+
+        snapshots = []
+        for name, counter in counters.items():
+            snapshots.append(getattr(self, f"_{name}").status.eq(counter))
+
+        self.sync += [
+            If(
+                clear,
+                [counter.eq(0) for counter in counters.values()],
+            ).Else(*updates),
+            If(snapshot, *snapshots),
+        ]
@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+
+# Generated from ctucan/regmap.json, do not edit
+
+# DEVICE_ID - Identifier of the core, reads 0xCAFD
+DEVICE_ID_OFFSET = 0x0
+
+# VERSION - Version of the core
+VERSION_OFFSET = 0x2
+VERSION_VER_MINOR_START_BIT = 0
+VERSION_VER_MINOR_WIDTH = 8
+VERSION_VER_MINOR_MASK = 0x000000ff
+VERSION_VER_MAJOR_START_BIT = 8
+VERSION_VER_MAJOR_WIDTH = 8
+VERSION_VER_MAJOR_MASK = 0x0000ff00
+
+# MODE - Operating mode
+MODE_OFFSET = 0x4
+MODE_RST_BIT = 0
+MODE_RST_MASK = 0x00000001
+MODE_BMM_BIT = 1
+MODE_BMM_MASK = 0x00000002
+MODE_STM_BIT = 2
+MODE_STM_MASK = 0x00000004
+MODE_AFM_BIT = 3
+MODE_AFM_MASK = 0x00000008
+MODE_FDE_BIT = 4
+MODE_FDE_MASK = 0x00000010
+MODE_TTTM_BIT = 5
+MODE_TTTM_MASK = 0x00000020
+MODE_ROM_BIT = 6
+MODE_ROM_MASK = 0x00000040
+MODE_ACF_BIT = 7
+MODE_ACF_MASK = 0x00000080
+MODE_TSTM_BIT = 8
+MODE_TSTM_MASK = 0x00000100
+MODE_RXBAM_BIT = 9
+MODE_RXBAM_MASK = 0x00000200
+MODE_TXBBM_BIT = 10
+MODE_TXBBM_MASK = 0x00000400
+MODE_SAM_BIT = 11
+MODE_SAM_MASK = 0x00000800
+
+# SETTINGS - Settings of the core
+SETTINGS_OFFSET = 0x6
+SETTINGS_RTRLE_BIT = 0
+SETTINGS_RTRLE_MASK = 0x00000001
+SETTINGS_RTRTH_START_BIT = 1
+SETTINGS_RTRTH_WIDTH = 4
+SETTINGS_RTRTH_MASK = 0x0000001e
+SETTINGS_ILBP_BIT = 5
+SETTINGS_ILBP_MASK = 0x00000020
+SETTINGS_ENA_BIT = 6
+SETTINGS_ENA_MASK = 0x00000040
+SETTINGS_NISOFD_BIT = 7
+SETTINGS_NISOFD_MASK = 0x00000080
+SETTINGS_PEX_BIT = 8
+SETTINGS_PEX_MASK = 0x00000100
+SETTINGS_TBFBO_BIT = 9
+SETTINGS_TBFBO_MASK = 0x00000200
+SETTINGS_FDRF_BIT = 10
+SETTINGS_FDRF_MASK = 0x00000400
+
+# STATUS - Status of the core
+STATUS_OFFSET = 0x8
+STATUS_RXNE_BIT = 0
+STATUS_RXNE_MASK = 0x00000001
+STATUS_DOR_BIT = 1
+STATUS_DOR_MASK = 0x00000002
+STATUS_TXNF_BIT = 2
+STATUS_TXNF_MASK = 0x00000004
+STATUS_EFT_BIT = 3
+STATUS_EFT_MASK = 0x00000008
+STATUS_RXS_BIT = 4
+STATUS_RXS_MASK = 0x00000010
+STATUS_TXS_BIT = 5
+STATUS_TXS_MASK = 0x00000020
+STATUS_EWL_BIT = 6
+STATUS_EWL_MASK = 0x00000040
+STATUS_IDLE_BIT = 7
+STATUS_IDLE_MASK = 0x00000080
+STATUS_PEXS_BIT = 8
+STATUS_PEXS_MASK = 0x00000100
+
+# COMMAND - Commands of the core, act on the bits written as 1
+COMMAND_OFFSET = 0xc
+COMMAND_RXRPMV_BIT = 1
+COMMAND_RXRPMV_MASK = 0x00000002
+COMMAND_RRB_BIT = 2
+COMMAND_RRB_MASK = 0x00000004
+COMMAND_CDO_BIT = 3
+COMMAND_CDO_MASK = 0x00000008
+COMMAND_ERCRST_BIT = 4
+COMMAND_ERCRST_MASK = 0x00000010
+COMMAND_RXFCRST_BIT = 5
+COMMAND_RXFCRST_MASK = 0x00000020
+COMMAND_TXFCRST_BIT = 6
+COMMAND_TXFCRST_MASK = 0x00000040
+COMMAND_CPEXS_BIT = 7
+COMMAND_CPEXS_MASK = 0x00000080
+
+# INT_STAT - Interrupt status, write 1 to clear
+INT_STAT_OFFSET = 0x10
+INT_STAT_RXI_BIT = 0
+INT_STAT_RXI_MASK = 0x00000001
+INT_STAT_TXI_BIT = 1
+INT_STAT_TXI_MASK = 0x00000002
+INT_STAT_EWLI_BIT = 2
+INT_STAT_EWLI_MASK = 0x00000004
+INT_STAT_DOI_BIT = 3
+INT_STAT_DOI_MASK = 0x00000008
+INT_STAT_FCSI_BIT = 4
+INT_STAT_FCSI_MASK = 0x00000010
+INT_STAT_ALI_BIT = 5
+INT_STAT_ALI_MASK = 0x00000020
+INT_STAT_BEI_BIT = 6
+INT_STAT_BEI_MASK = 0x00000040
+INT_STAT_OFI_BIT = 7
+INT_STAT_OFI_MASK = 0x00000080
+INT_STAT_RXFI_BIT = 8
+INT_STAT_RXFI_MASK = 0x00000100
+INT_STAT_BSI_BIT = 9
+INT_STAT_BSI_MASK = 0x00000200
+INT_STAT_RBNEI_BIT = 10
+INT_STAT_RBNEI_MASK = 0x00000400
+INT_STAT_TXBHCI_BIT = 11
+INT_STAT_TXBHCI_MASK = 0x00000800
+
+# INT_ENA_SET - Write 1 to enable the interrupts, reads the enabled ones, same bits as INT_STAT
+INT_ENA_SET_OFFSET = 0x14
+
+# INT_ENA_CLR - Write 1 to disable the interrupts, same bits as INT_STAT
+INT_ENA_CLR_OFFSET = 0x18
+
+# INT_MASK_SET - Write 1 to mask the interrupts, reads the masked ones, same bits as INT_STAT
+INT_MASK_SET_OFFSET = 0x1c
+
+# INT_MASK_CLR - Write 1 to unmask the interrupts, same bits as INT_STAT
+INT_MASK_CLR_OFFSET = 0x20
+
+# BTR - Bit timing of the nominal bit rate
+BTR_OFFSET = 0x24
+BTR_PROP_START_BIT = 0
+BTR_PROP_WIDTH = 7
+BTR_PROP_MASK = 0x0000007f
+BTR_PH1_START_BIT = 7
+BTR_PH1_WIDTH = 6
+BTR_PH1_MASK = 0x00001f80
+BTR_PH2_START_BIT = 13
+BTR_PH2_WIDTH = 6
+BTR_PH2_MASK = 0x0007e000
+BTR_BRP_START_BIT = 19
+BTR_BRP_WIDTH = 8
+BTR_BRP_MASK = 0x07f80000
+BTR_SJW_START_BIT = 27
+BTR_SJW_WIDTH = 5
+BTR_SJW_MASK = 0xf8000000
+
+# BTR_FD - Bit timing of the data bit rate
+BTR_FD_OFFSET = 0x28
+BTR_FD_PROP_FD_START_BIT = 0
+BTR_FD_PROP_FD_WIDTH = 6
+BTR_FD_PROP_FD_MASK = 0x0000003f
+BTR_FD_PH1_FD_START_BIT = 7
+BTR_FD_PH1_FD_WIDTH = 5
+BTR_FD_PH1_FD_MASK = 0x00000f80
+BTR_FD_PH2_FD_START_BIT = 13
+BTR_FD_PH2_FD_WIDTH = 5
+BTR_FD_PH2_FD_MASK = 0x0003e000
+BTR_FD_BRP_FD_START_BIT = 19
+BTR_FD_BRP_FD_WIDTH = 8
+BTR_FD_BRP_FD_MASK = 0x07f80000
+BTR_FD_SJW_FD_START_BIT = 27
+BTR_FD_SJW_FD_WIDTH = 5
+BTR_FD_SJW_FD_MASK = 0xf8000000
+
+# EWL - Error warning limit
+EWL_OFFSET = 0x2c
+EWL_EW_LIMIT_START_BIT = 0
+EWL_EW_LIMIT_WIDTH = 8
+EWL_EW_LIMIT_MASK = 0x000000ff
+
+# ERP - Error passive limit
+ERP_OFFSET = 0x2d
+ERP_ERP_LIMIT_START_BIT = 0
+ERP_ERP_LIMIT_WIDTH = 8
+ERP_ERP_LIMIT_MASK = 0x000000ff
+
+# FAULT_STATE - Fault confinement state
+FAULT_STATE_OFFSET = 0x2e
+FAULT_STATE_ERA_BIT = 0
+FAULT_STATE_ERA_MASK = 0x00000001
+FAULT_STATE_ERP_BIT = 1
+FAULT_STATE_ERP_MASK = 0x00000002
+FAULT_STATE_BOF_BIT = 2
+FAULT_STATE_BOF_MASK = 0x00000004
+
+# REC - Receive error counter
+REC_OFFSET = 0x30
+REC_REC_VAL_START_BIT = 0
+REC_REC_VAL_WIDTH = 9
+REC_REC_VAL_MASK = 0x000001ff
+
+# TEC - Transmit error counter
+TEC_OFFSET = 0x32
+TEC_TEC_VAL_START_BIT = 0
+TEC_TEC_VAL_WIDTH = 9
+TEC_TEC_VAL_MASK = 0x000001ff
+
+# ERR_NORM - Errors in the nominal bit rate
+ERR_NORM_OFFSET = 0x34
+ERR_NORM_ERR_NORM_VAL_START_BIT = 0
+ERR_NORM_ERR_NORM_VAL_WIDTH = 16
+ERR_NORM_ERR_NORM_VAL_MASK = 0x0000ffff
+
+# ERR_FD - Errors in the data bit rate
+ERR_FD_OFFSET = 0x36
+ERR_FD_ERR_FD_VAL_START_BIT = 0
+ERR_FD_ERR_FD_VAL_WIDTH = 16
+ERR_FD_ERR_FD_VAL_MASK = 0x0000ffff
+
+# CTR_PRES - Presets the error counter selected by the bits written as 1
+CTR_PRES_OFFSET = 0x38
+CTR_PRES_CTPV_START_BIT = 0
+CTR_PRES_CTPV_WIDTH = 9
+CTR_PRES_CTPV_MASK = 0x000001ff
+CTR_PRES_PTX_BIT = 9
+CTR_PRES_PTX_MASK = 0x00000200
+CTR_PRES_PRX_BIT = 10
+CTR_PRES_PRX_MASK = 0x00000400
+CTR_PRES_ENORM_BIT = 11
+CTR_PRES_ENORM_MASK = 0x00000800
+CTR_PRES_EFD_BIT = 12
+CTR_PRES_EFD_MASK = 0x00001000
+
+# FILTER_A_MASK - Mask of the bit filter A
+FILTER_A_MASK_OFFSET = 0x3c
+FILTER_A_MASK_BIT_MASK_A_VAL_START_BIT = 0
+FILTER_A_MASK_BIT_MASK_A_VAL_WIDTH = 29
+FILTER_A_MASK_BIT_MASK_A_VAL_MASK = 0x1fffffff
+
+# FILTER_A_VAL - Value of the bit filter A
+FILTER_A_VAL_OFFSET = 0x40
+FILTER_A_VAL_BIT_VAL_A_VAL_START_BIT = 0
+FILTER_A_VAL_BIT_VAL_A_VAL_WIDTH = 29
+FILTER_A_VAL_BIT_VAL_A_VAL_MASK = 0x1fffffff
+
+# FILTER_B_MASK - Mask of the bit filter B
+FILTER_B_MASK_OFFSET = 0x44
+FILTER_B_MASK_BIT_MASK_B_VAL_START_BIT = 0
+FILTER_B_MASK_BIT_MASK_B_VAL_WIDTH = 29
+FILTER_B_MASK_BIT_MASK_B_VAL_MASK = 0x1fffffff
+
+# FILTER_B_VAL - Value of the bit filter B
+FILTER_B_VAL_OFFSET = 0x48
+FILTER_B_VAL_BIT_VAL_B_VAL_START_BIT = 0
+FILTER_B_VAL_BIT_VAL_B_VAL_WIDTH = 29
+FILTER_B_VAL_BIT_VAL_B_VAL_MASK = 0x1fffffff
+
+# FILTER_C_MASK - Mask of the bit filter C
+FILTER_C_MASK_OFFSET = 0x4c
+FILTER_C_MASK_BIT_MASK_C_VAL_START_BIT = 0
+FILTER_C_MASK_BIT_MASK_C_VAL_WIDTH = 29
+FILTER_C_MASK_BIT_MASK_C_VAL_MASK = 0x1fffffff
+
+# FILTER_C_VAL - Value of the bit filter C
+FILTER_C_VAL_OFFSET = 0x50
+FILTER_C_VAL_BIT_VAL_C_VAL_START_BIT = 0
+FILTER_C_VAL_BIT_VAL_C_VAL_WIDTH = 29
+FILTER_C_VAL_BIT_VAL_C_VAL_MASK = 0x1fffffff
+
+# FILTER_RAN_LOW - Lower bound of the range filter
+FILTER_RAN_LOW_OFFSET = 0x54
+FILTER_RAN_LOW_BIT_RAN_LOW_VAL_START_BIT = 0
+FILTER_RAN_LOW_BIT_RAN_LOW_VAL_WIDTH = 29
+FILTER_RAN_LOW_BIT_RAN_LOW_VAL_MASK = 0x1fffffff
+
+# FILTER_RAN_HIGH - Upper bound of the range filter
+FILTER_RAN_HIGH_OFFSET = 0x58
+FILTER_RAN_HIGH_BIT_RAN_HIGH_VAL_START_BIT = 0
+FILTER_RAN_HIGH_BIT_RAN_HIGH_VAL_WIDTH = 29
+FILTER_RAN_HIGH_BIT_RAN_HIGH_VAL_MASK = 0x1fffffff
+
+# FILTER_CONTROL - Frame types accepted by the filters
+FILTER_CONTROL_OFFSET = 0x5c
+FILTER_CONTROL_FANB_BIT = 0
+FILTER_CONTROL_FANB_MASK = 0x00000001
+FILTER_CONTROL_FANE_BIT = 1
+FILTER_CONTROL_FANE_MASK = 0x00000002
+FILTER_CONTROL_FAFB_BIT = 2
+FILTER_CONTROL_FAFB_MASK = 0x00000004
+FILTER_CONTROL_FAFE_BIT = 3
+FILTER_CONTROL_FAFE_MASK = 0x00000008
+FILTER_CONTROL_FBNB_BIT = 4
+FILTER_CONTROL_FBNB_MASK = 0x00000010
+FILTER_CONTROL_FBNE_BIT = 5
+FILTER_CONTROL_FBNE_MASK = 0x00000020
+FILTER_CONTROL_FBFB_BIT = 6
+FILTER_CONTROL_FBFB_MASK = 0x00000040
+FILTER_CONTROL_FBFE_BIT = 7
+FILTER_CONTROL_FBFE_MASK = 0x00000080
+FILTER_CONTROL_FCNB_BIT = 8
+FILTER_CONTROL_FCNB_MASK = 0x00000100
+FILTER_CONTROL_FCNE_BIT = 9
+FILTER_CONTROL_FCNE_MASK = 0x00000200
+FILTER_CONTROL_FCFB_BIT = 10
+FILTER_CONTROL_FCFB_MASK = 0x00000400
+FILTER_CONTROL_FCFE_BIT = 11
+FILTER_CONTROL_FCFE_MASK = 0x00000800
+FILTER_CONTROL_FRNB_BIT = 12
+FILTER_CONTROL_FRNB_MASK = 0x00001000
+FILTER_CONTROL_FRNE_BIT = 13
+FILTER_CONTROL_FRNE_MASK = 0x00002000
+FILTER_CONTROL_FRFB_BIT = 14
+FILTER_CONTROL_FRFB_MASK = 0x00004000
+FILTER_CONTROL_FRFE_BIT = 15
+FILTER_CONTROL_FRFE_MASK = 0x00008000
+
+# FILTER_STATUS - Filters present in the core
+FILTER_STATUS_OFFSET = 0x5e
+FILTER_STATUS_SFA_BIT = 0
+FILTER_STATUS_SFA_MASK = 0x00000001
+FILTER_STATUS_SFB_BIT = 1
+FILTER_STATUS_SFB_MASK = 0x00000002
+FILTER_STATUS_SFC_BIT = 2
+FILTER_STATUS_SFC_MASK = 0x00000004
+FILTER_STATUS_SFR_BIT = 3
+FILTER_STATUS_SFR_MASK = 0x00000008
+
+# RX_MEM_INFO - Size of the RX buffer in words
+RX_MEM_INFO_OFFSET = 0x60
+RX_MEM_INFO_RX_BUFF_SIZE_START_BIT = 0
+RX_MEM_INFO_RX_BUFF_SIZE_WIDTH = 13
+RX_MEM_INFO_RX_BUFF_SIZE_MASK = 0x00001fff
+RX_MEM_INFO_RX_MEM_FREE_START_BIT = 16
+RX_MEM_INFO_RX_MEM_FREE_WIDTH = 13
+RX_MEM_INFO_RX_MEM_FREE_MASK = 0x1fff0000
+
+# RX_POINTERS - Pointers of the RX buffer
+RX_POINTERS_OFFSET = 0x64
+RX_POINTERS_RX_WPP_START_BIT = 0
+RX_POINTERS_RX_WPP_WIDTH = 12
+RX_POINTERS_RX_WPP_MASK = 0x00000fff
+RX_POINTERS_RX_RPP_START_BIT = 16
+RX_POINTERS_RX_RPP_WIDTH = 12
+RX_POINTERS_RX_RPP_MASK = 0x0fff0000
+
+# RX_STATUS - Status of the RX buffer
+RX_STATUS_OFFSET = 0x68
+RX_STATUS_RXE_BIT = 0
+RX_STATUS_RXE_MASK = 0x00000001
+RX_STATUS_RXF_BIT = 1
+RX_STATUS_RXF_MASK = 0x00000002
+RX_STATUS_RXFRC_START_BIT = 4
+RX_STATUS_RXFRC_WIDTH = 11
+RX_STATUS_RXFRC_MASK = 0x00007ff0
+
+# RX_SETTINGS - Settings of the RX buffer
+RX_SETTINGS_OFFSET = 0x6a
+RX_SETTINGS_RTSOP_BIT = 0
+RX_SETTINGS_RTSOP_MASK = 0x00000001
+
+# RX_DATA - Next word of the RX buffer
+RX_DATA_OFFSET = 0x6c
+
+# TX_STATUS - States of the TXT buffers
+TX_STATUS_OFFSET = 0x70
+TX_STATUS_TX1S_START_BIT = 0
+TX_STATUS_TX1S_WIDTH = 4
+TX_STATUS_TX1S_MASK = 0x0000000f
+TX_STATUS_TX2S_START_BIT = 4
+TX_STATUS_TX2S_WIDTH = 4
+TX_STATUS_TX2S_MASK = 0x000000f0
+TX_STATUS_TX3S_START_BIT = 8
+TX_STATUS_TX3S_WIDTH = 4
+TX_STATUS_TX3S_MASK = 0x00000f00
+TX_STATUS_TX4S_START_BIT = 12
+TX_STATUS_TX4S_WIDTH = 4
+TX_STATUS_TX4S_MASK = 0x0000f000
+
+# TXT_COMMAND - Commands of the TXT buffers
+TXT_COMMAND_OFFSET = 0x74
+TXT_COMMAND_TXCE_BIT = 0
+TXT_COMMAND_TXCE_MASK = 0x00000001
+TXT_COMMAND_TXCR_BIT = 1
+TXT_COMMAND_TXCR_MASK = 0x00000002
+TXT_COMMAND_TXCA_BIT = 2
+TXT_COMMAND_TXCA_MASK = 0x00000004
+TXT_COMMAND_TXB1_BIT = 8
+TXT_COMMAND_TXB1_MASK = 0x00000100
+TXT_COMMAND_TXB2_BIT = 9
+TXT_COMMAND_TXB2_MASK = 0x00000200
+TXT_COMMAND_TXB3_BIT = 10
+TXT_COMMAND_TXB3_MASK = 0x00000400
+TXT_COMMAND_TXB4_BIT = 11
+TXT_COMMAND_TXB4_MASK = 0x00000800
+
+# TXTB_INFO - Number of the TXT buffers
+TXTB_INFO_OFFSET = 0x76
+TXTB_INFO_TXT_BUFFER_COUNT_START_BIT = 0
+TXTB_INFO_TXT_BUFFER_COUNT_WIDTH = 4
+TXTB_INFO_TXT_BUFFER_COUNT_MASK = 0x0000000f
+
+# TX_PRIORITY - Priorities of the TXT buffers
+TX_PRIORITY_OFFSET = 0x78
+TX_PRIORITY_TXT1P_START_BIT = 0
+TX_PRIORITY_TXT1P_WIDTH = 3
+TX_PRIORITY_TXT1P_MASK = 0x00000007
+TX_PRIORITY_TXT2P_START_BIT = 4
+TX_PRIORITY_TXT2P_WIDTH = 3
+TX_PRIORITY_TXT2P_MASK = 0x00000070
+TX_PRIORITY_TXT3P_START_BIT = 8
+TX_PRIORITY_TXT3P_WIDTH = 3
+TX_PRIORITY_TXT3P_MASK = 0x00000700
+TX_PRIORITY_TXT4P_START_BIT = 12
+TX_PRIORITY_TXT4P_WIDTH = 3
+TX_PRIORITY_TXT4P_MASK = 0x00007000
+
+# ERR_CAPT - Last error of the bus
+ERR_CAPT_OFFSET = 0x7c
+ERR_CAPT_ERR_POS_START_BIT = 0
+ERR_CAPT_ERR_POS_WIDTH = 5
+ERR_CAPT_ERR_POS_MASK = 0x0000001f
+ERR_CAPT_ERR_TYPE_START_BIT = 5
+ERR_CAPT_ERR_TYPE_WIDTH = 3
+ERR_CAPT_ERR_TYPE_MASK = 0x000000e0
+
+# RETR_CTR - Retransmissions of the current frame
+RETR_CTR_OFFSET = 0x7d
+RETR_CTR_RETR_CTR_VAL_START_BIT = 0
+RETR_CTR_RETR_CTR_VAL_WIDTH = 4
+RETR_CTR_RETR_CTR_VAL_MASK = 0x0000000f
+
+# ALC - Last arbitration loss
+ALC_OFFSET = 0x7e
+ALC_ALC_BIT_START_BIT = 0
+ALC_ALC_BIT_WIDTH = 5
+ALC_ALC_BIT_MASK = 0x0000001f
+ALC_ALC_ID_FIELD_START_BIT = 5
+ALC_ALC_ID_FIELD_WIDTH = 3
+ALC_ALC_ID_FIELD_MASK = 0x000000e0
+
+# TS_INFO - Width of the timestamp
+TS_INFO_OFFSET = 0x7f
+TS_INFO_TS_BITS_START_BIT = 0
+TS_INFO_TS_BITS_WIDTH = 6
+TS_INFO_TS_BITS_MASK = 0x0000003f
+
+# TRV_DELAY - Measured transmitter delay
+TRV_DELAY_OFFSET = 0x80
+TRV_DELAY_TRV_DELAY_VALUE_START_BIT = 0
+TRV_DELAY_TRV_DELAY_VALUE_WIDTH = 7
+TRV_DELAY_TRV_DELAY_VALUE_MASK = 0x0000007f
+
+# SSP_CFG - Secondary sample point configuration
+SSP_CFG_OFFSET = 0x82
+SSP_CFG_SSP_OFFSET_START_BIT = 0
+SSP_CFG_SSP_OFFSET_WIDTH = 8
+SSP_CFG_SSP_OFFSET_MASK = 0x000000ff
+SSP_CFG_SSP_SRC_START_BIT = 8
+SSP_CFG_SSP_SRC_WIDTH = 2
+SSP_CFG_SSP_SRC_MASK = 0x00000300
+
+# RX_FR_CTR - Number of received frames
+RX_FR_CTR_OFFSET = 0x84
+RX_FR_CTR_RX_FR_CTR_VAL_START_BIT = 0
+RX_FR_CTR_RX_FR_CTR_VAL_WIDTH = 32
+RX_FR_CTR_RX_FR_CTR_VAL_MASK = 0xffffffff
+
+# TX_FR_CTR - Number of transmitted frames
+TX_FR_CTR_OFFSET = 0x88
+TX_FR_CTR_TX_FR_CTR_VAL_START_BIT = 0
+TX_FR_CTR_TX_FR_CTR_VAL_WIDTH = 32
+TX_FR_CTR_TX_FR_CTR_VAL_MASK = 0xffffffff
+
+# DEBUG_REGISTER - Internal state of the protocol controller
+DEBUG_REGISTER_OFFSET = 0x8c
+
+# YOLO - Reads 0xDEADBEEF
+YOLO_OFFSET = 0x90
+
+# TIMESTAMP_LOW - Lower word of the timestamp of the core
+TIMESTAMP_LOW_OFFSET = 0x94
+
+# TIMESTAMP_HIGH - Upper word of the timestamp of the core
+TIMESTAMP_HIGH_OFFSET = 0x98
+
+# TXT_BUFFER - TXT buffer holding a frame to transmit
+TXT_BUFFER_OFFSET = 0x100
+TXT_BUFFER_SIZE = 0x100
+TXT_BUFFER_NUM = 4
+TXT_BUFFER_1_OFFSET = 0x100
+TXT_BUFFER_2_OFFSET = 0x200
+TXT_BUFFER_3_OFFSET = 0x300
+TXT_BUFFER_4_OFFSET = 0x400
+
+# FRAME_FORMAT - Frame format word
+FRAME_FORMAT_OFFSET = 0x0
+FRAME_FORMAT_DLC_START_BIT = 0
+FRAME_FORMAT_DLC_WIDTH = 4
+FRAME_FORMAT_DLC_MASK = 0x0000000f
+FRAME_FORMAT_RTR_BIT = 5
+FRAME_FORMAT_RTR_MASK = 0x00000020
+FRAME_FORMAT_IDE_BIT = 6
+FRAME_FORMAT_IDE_MASK = 0x00000040
+FRAME_FORMAT_FDF_BIT = 7
+FRAME_FORMAT_FDF_MASK = 0x00000080
+FRAME_FORMAT_BRS_BIT = 9
+FRAME_FORMAT_BRS_MASK = 0x00000200
+FRAME_FORMAT_RWCNT_START_BIT = 11
+FRAME_FORMAT_RWCNT_WIDTH = 5
+FRAME_FORMAT_RWCNT_MASK = 0x0000f800
+
+# IDENTIFIER - Identifier word
+IDENTIFIER_OFFSET = 0x4
+IDENTIFIER_EXT_START_BIT = 0
+IDENTIFIER_EXT_WIDTH = 18
+IDENTIFIER_EXT_MASK = 0x0003ffff
+IDENTIFIER_STD_START_BIT = 18
+IDENTIFIER_STD_WIDTH = 11
+IDENTIFIER_STD_MASK = 0x1ffc0000
+
+# TIMESTAMP_L - Lower word of the timestamp
+TIMESTAMP_L_OFFSET = 0x8
+
+# TIMESTAMP_U - Upper word of the timestamp
+TIMESTAMP_U_OFFSET = 0xc
+
+# DATA_START - First word of the data
+DATA_START_OFFSET = 0x10
+
+# Width of the state of a TXT buffer
+TX_STATUS_TXTS_WIDTH = 4
+
+# Ready
+TXT_STATE_RDY = 1
+
+# In transmission
+TXT_STATE_TRAN = 2
+
+# Abort in progress
+TXT_STATE_ABTP = 3
+
+# Transmitted
+TXT_STATE_TOK = 4
+
+# Failed
+TXT_STATE_ERR = 6
+
+# Aborted
+TXT_STATE_ABT = 7
+
+# Empty
+TXT_STATE_ETY = 8
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 Antmicro
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# Byte offsets and fields of the CTU CAN FD registers, generated from
+# regmap.json, and the constants derived from them
+
+from ctucan.register_map import *
+
+TXT_WRITABLE_STATES = [
+    TXT_STATE_TOK, TXT_STATE_ERR, TXT_STATE_ABT, TXT_STATE_ETY
+]
+
+# Data length in bytes for every DLC value of a CAN FD frame,
+# CAN 2.0 frames carry at most 8 bytes
+DLC_TO_LENGTH = [0, 1, 2, 3, 4, 5, 6, 7, 8, 12, 16, 20, 24, 32, 48, 64]
+MAX_CAN20_LENGTH = 8
+
+# Frame format word, identifier, two timestamp words and 64 bytes of data
+MAX_FRAME_WORDS = 4 + 64 // 4
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 Antmicro
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# Register map of the core described in regmap.json and the generators of
+# the C header, the Python module and the LiteX csr.json/SVD entries
+
+import json
+import os
+
+import xml.etree.ElementTree as ET
+
+__all__ = [
+    "REGMAP_FILE",
+    "load_regmap",
+    "register_constants",
+    "generate_python",
+    "generate_c_header",
+    "add_csr_json_registers",
+    "svd_peripheral",
+    "add_svd_peripheral",
+]
+
+REGMAP_FILE = os.path.join(os.path.dirname(__file__), "regmap.json")
+GENERATED_NOTE = "Generated from ctucan/regmap.json, do not edit"
+
+SVD_ACCESS = {"rw": "read-write", "ro": "read-only", "wo": "write-only"}
+
+
+def _int(value):
+    return int(value, 0) if isinstance(value, str) else value
+
+
+def _register(description):
+    register = dict(description)
+    register["offset"] = _int(register["offset"])
+    register["fields"] = []
+    for field in description.get("fields", []):
+        field = dict(field)
+        field.setdefault("width", 1)
+        field.setdefault("description", "")
+        register["fields"].append(field)
+    register.setdefault("description", "")
+    return register
+
+
+def load_regmap(path=REGMAP_FILE):
+    """Loads the register map description with the offsets and values
+    converted to integers."""
+    with open(path) as f:
+        description = json.load(f)
+
+    regmap = {
+        "name": description["name"],
+        "description": description.get("description", ""),
+        "registers": [_register(r) for r in description["registers"]],
+        "blocks": [],
+        "constants": [],
+    }
+    for block in description.get("blocks", []):
+        block = dict(block)
+        block["offset"] = _int(block["offset"])
+        block["size"] = _int(block["size"])
+        block["registers"] = [_register(r) for r in block["registers"]]
+        block.setdefault("description", "")
+        regmap["blocks"].append(block)
+    for constant in description.get("constants", []):
+        constant = dict(constant)
+        constant["value"] = _int(constant["value"])
+        constant.setdefault("description", "")
+        regmap["constants"].append(constant)
+
+    return regmap
+
+
+def _field_constants(register):
+    constants = []
+    for field in register["fields"]:
+        name = f"{register['name']}_{field['name']}"
+        mask = (2**field["width"] - 1) << field["bit"]
+        if field["width"] == 1:
+            constants.append((f"{name}_BIT", field["bit"]))
+        else:
+            constants.append((f"{name}_START_BIT", field["bit"]))
+            constants.append((f"{name}_WIDTH", field["width"]))
+        constants.append((f"{name}_MASK", mask))
+    return constants
+
+
+def register_constants(regmap):
+    """Returns the (name, value, comment) tuples of the constants of
+    the register map.
+
+    Every register gets its byte offset (`<REGISTER>_OFFSET`), single-bit
+    fields their position (`_BIT`) and the wider ones their first bit
+    (`_START_BIT`) and width (`_WIDTH`), and all fields a mask (`_MASK`).
+    The offsets of the registers of a block are relative to the block,
+    which gets its offset, size, number of instances (`_NUM`) and
+    the offsets of the instances, numbered from 1.
+    """
+    constants = []
+
+    def add_register(register):
+        comment = f"{register['name']} - {register['description']}"
+        constants.append(
+            (f"{register['name']}_OFFSET", register["offset"], comment)
+        )
+        for name, value in _field_constants(register):
+            constants.append((name, value, None))
+
+    for register in regmap["registers"]:
+        add_register(register)
+
+    for block in regmap["blocks"]:
+        name = block["name"]
+        comment = f"{name} - {block['description']}"
+        constants.append((f"{name}_OFFSET", block["offset"], comment))
+        constants.append((f"{name}_SIZE", block["size"], None))
+        constants.append((f"{name}_NUM", block["count"], None))
+        for i in range(block["count"]):
+            offset = block["offset"] + i * block["size"]
+            constants.append((f"{name}_{i + 1}_OFFSET", offset, None))
+        for register in block["registers"]:
+            add_register(register)
+
+    for constant in regmap["constants"]:
+        constants.append(
+            (constant["name"], constant["value"], constant["description"])
+        )
+
+    return constants
+
+
+def _format_value(name, value):
+    if name.endswith("_OFFSET") or name.endswith("_SIZE"):
+        return f"{value:#x}"
+    if name.endswith("_MASK"):
+        return f"{value:#010x}"
+    return str(value)
+
+
+def generate_python(regmap):
+    """Generates a Python module with the constants of the register map."""
+    lines = [
+        "#!/usr/bin/env python3",
+        "",
+        f"# {GENERATED_NOTE}",
+    ]
+    for name, value, comment in register_constants(regmap):
+        if comment is not None:
+            lines += ["", f"# {comment}"]
+        lines.append(f"{name} = {_format_value(name, value)}")
+    return "\n".join(lines) + "\n"
+
+
+def generate_c_header(regmap, prefix=None):
+    """Generates a C header with the constants of the register map, prefixed
+    with the name of the map."""
+    prefix = regmap["name"] if prefix is None else prefix
+    guard = f"{prefix}_REGS_H"
+    lines = [
+        f"/* {GENERATED_NOTE} */",
+        "",
+        f"#ifndef {guard}",
+        f"#define {guard}",
+    ]
+    for name, value, comment in register_constants(regmap):
+        if comment is not None:
+            lines += ["", f"/* {comment} */"]
+        value = _format_value(name, value)
+        if name.endswith("_MASK"):
+            value += "u"
+        lines.append(f"#define {prefix}_{name} {value}")
+    lines += ["", f"#endif /* {guard} */"]
+    return "\n".join(lines) + "\n"
+
+
+def _all_registers(regmap):
+    for register in regmap["registers"]:
+        yield register["name"], register["offset"], register
+    for block in regmap["blocks"]:
+        for i in range(block["count"]):
+            offset = block["offset"] + i * block["size"]
+            for register in block["registers"]:
+                name = f"{block['name']}_{i + 1}_{register['name']}"
+                yield name, offset + register["offset"], register
+
+
+def _words(regmap):
+    words = {}
+    for name, offset, register in _all_registers(regmap):
+        words.setdefault(offset & ~0x3, []).append((name, register))
+    return sorted(words.items())
+
+
+def add_csr_json_registers(csr, regmap, region="can", base=None):
+    """Adds the registers of the core to the `csr_registers` of a LiteX
+    csr.json, as `<region>_<register>` entries.
+
+    The registers are placed at `base`, by default at the base of
+    the `region` memory region of the SoC. The LiteX tools access CSRs as
+    whole aligned words, so the registers sharing a word, e.g. MODE and
+    SETTINGS, are added as a single `<region>_mode_settings` entry.
+    """
+    if base is None:
+        if region not in csr.get("memories", {}):
+            raise Exception(f"Memory region {region} not found in csr.json")
+        base = csr["memories"][region]["base"]
+
+    registers = csr.setdefault("csr_registers", {})
+    for offset, word in _words(regmap):
+        name = "_".join(name.lower() for name, _ in word)
+        read_only = all(register["access"] == "ro" for _, register in word)
+        registers[f"{region}_{name}"] = {
+            "addr": base + offset,
+            "size": 1,
+            "type": "ro" if read_only else "rw",
+        }
+    return csr
+
+
+def _svd_register(parent, register):
+    element = ET.SubElement(parent, "register")
+    ET.SubElement(element, "name").text = register["name"]
+    ET.SubElement(element, "description").text = register["description"]
+    ET.SubElement(element, "addressOffset").text = f"{register['offset']:#x}"
+    ET.SubElement(element, "size").text = str(register["width"])
+    ET.SubElement(element, "access").text = SVD_ACCESS[register["access"]]
+    if register["fields"]:
+        fields = ET.SubElement(element, "fields")
+        for field in register["fields"]:
+            f = ET.SubElement(fields, "field")
+            ET.SubElement(f, "name").text = field["name"]
+            ET.SubElement(f, "description").text = field["description"]
+            ET.SubElement(f, "bitOffset").text = str(field["bit"])
+            ET.SubElement(f, "bitWidth").text = str(field["width"])
+
+
+def svd_peripheral(regmap, base, name="CAN"):
+    """Returns the SVD `peripheral` element of the core placed at `base`."""
+    peripheral = ET.Element("peripheral")
+    ET.SubElement(peripheral, "name").text = name
+    ET.SubElement(peripheral, "description").text = regmap["description"]
+    ET.SubElement(peripheral, "baseAddress").text = f"{base:#010x}"
+
+    size = max(b["offset"] + b["size"] * b["count"] for b in regmap["blocks"])
+    block = ET.SubElement(peripheral, "addressBlock")
+    ET.SubElement(block, "offset").text = "0"
+    ET.SubElement(block, "size").text = f"{size:#x}"
+    ET.SubElement(block, "usage").text = "registers"
+
+    registers = ET.SubElement(peripheral, "registers")
+    for register in regmap["registers"]:
+        _svd_register(registers, register)
+    for b in regmap["blocks"]:
+        cluster = ET.SubElement(registers, "cluster")
+        ET.SubElement(cluster, "dim").text = str(b["count"])
+        ET.SubElement(cluster, "dimIncrement").text = f"{b['size']:#x}"
+        ET.SubElement(cluster, "name").text = f"{b['name']}[%s]"
+        ET.SubElement(cluster, "description").text = b["description"]
+        ET.SubElement(cluster, "addressOffset").text = f"{b['offset']:#x}"
+        for register in b["registers"]:
+            _svd_register(cluster, register)
+
+    return peripheral
+
+
+def add_svd_peripheral(svd, regmap, base, name="CAN"):
+    """Adds the core to the `peripherals` of an SVD file generated by LiteX,
+    replacing the peripheral of the same name."""
+    tree = ET.ElementTree(ET.fromstring(svd))
+    peripherals = tree.getroot().find("peripherals")
+    if peripherals is None:
+        raise Exception("SVD file without peripherals")
+    for peripheral in peripherals.findall("peripheral"):
+        if peripheral.findtext("name") == name:
+            peripherals.remove(peripheral)
+    peripherals.append(svd_peripheral(regmap, base, name))
+    declaration = '<?xml version="1.0" encoding="utf-8"?>\n'
+    return declaration + ET.tostring(tree.getroot(), encoding="unicode")
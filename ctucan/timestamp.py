@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 Antmicro
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from migen import *
+
+from litex.soc.interconnect.csr import AutoCSR, CSRStatus, CSRStorage
+
+__all__ = ["CTUCANTimestamp"]
+
+
+class CTUCANTimestamp(Module, AutoCSR):
+    """64-bit timestamp counter for the CTU CAN FD core.
+
+    The counter is incremented every prescaler cycles of the sys clock.
+    Its timestamp output can be connected to several CTUCAN modules,
+    so that the frames received on all channels are timestamped with the
+    same time base.
+    """
+
+    def __init__(self, prescaler=1):
+
+        # IOs
+        self.timestamp = Signal(64)
+
+        # CSRs
+        self._prescaler = CSRStorage(
+            16,
+            reset=prescaler,
+            description="Number of sys clock cycles per timestamp tick, "
+            "0 is treated as 1."
+        )
+        self._load = CSRStorage(64, description="Value set by `set`")
+        self._set = CSRStorage(
+            description="Write to set the timestamp to the `load` value."
+        )
+        self._latch = CSRStorage(
+            description="Write to latch the timestamp in `value`."
+        )
+        self._value = CSRStatus(64, description="Latched timestamp")
+
+        # parameters
+
+        count = Signal(16)
+        tick = Signal()
+
+        self.comb += tick.eq(count + 1 >= self._prescaler.storage)
+
+        self.sync += [
+            If(
+                self._set.re,
+                self.timestamp.eq(self._load.storage),
+                count.eq(0),
+            ).Elif(
+                tick,
+                self.timestamp.eq(self.timestamp + 1),
+                count.eq(0),
+            ).Else(count.eq(count + 1)),
+            If(self._latch.re, self._value.status.eq(self.timestamp)),
+        ]
@@ -1,35 +1,359 @@
 #!/usr/bin/env python3
 
+import hashlib
 import os
+import re
+import shutil
 import subprocess
 import tempfile
+import time
+
+CACHE_DIR_ENV = "CTUCAN_CACHE_DIR"
+CACHE_DISABLE_ENV = "CTUCAN_NO_CACHE"
+CACHE_MAX_SIZE = 512 * 1024 * 1024  # bytes
+CACHE_MAX_AGE = 30 * 24 * 60 * 60  # seconds
+
+CONVERSION_BACKENDS = ["yosys", "ghdl"]
+
+# Yosys commands run on the converted core, "{top_module}" is replaced with
+# the name of the top module. "none" keeps the hierarchy of the core,
+# "sim-fast" flattens it to a single module, which is faster to compile and
+# simulate, and "area" runs generic synthesis for the smallest netlist.
+YOSYS_PROFILES = {
+    "none": [],
+    "sim-fast": [
+        "flatten",
+        "opt -full",
+        "opt_clean -purge",
+    ],
+    "area": [
+        "synth -flatten -top {top_module}",
+        "opt -full",
+        "opt_clean -purge",
+    ],
+}
+
+VHDL_COMMENT_RE = re.compile(r"--[^\n]*")
+VHDL_UNIT_RE = re.compile(r"^\s*(?:entity|package)\s+(\w+)\s+is\b", re.M)
+VHDL_BODY_RE = re.compile(r"^\s*package\s+body\s+(\w+)\s+is\b", re.M)
+
+HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+DEV_NULL = "/dev/null"
+
+
+def get_cache_dir():
+    default = os.path.join(os.path.expanduser("~"), ".cache", "ctucan")
+    return os.environ.get(CACHE_DIR_ENV, default)
+
+
+def cache_enabled():
+    return os.environ.get(CACHE_DISABLE_ENV, "") in ["", "0"]
+
+
+def get_tool_version(cmd):
+    try:
+        result = subprocess.run(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return result.stdout.decode(errors="replace").strip()
+
+
+def conversion_cache_key(
+    srcs,
+    top_module,
+    ghdl_flags=[],
+    yosys_cmds=[],
+    library=None,
+    backend="yosys"
+):
+    h = hashlib.sha256()
+
+    def update(*items):
+        for item in items:
+            h.update(str(item).encode())
+            h.update(b"\0")
+
+    # the order of the sources matters for the GHDL analysis
+    for f in srcs:
+        with open(f, "rb") as src:
+            update(os.path.basename(f), hashlib.sha256(src.read()).hexdigest())
+
+    update(*ghdl_flags)
+    update(*yosys_cmds)
+    update(top_module, library, backend)
+    update(get_tool_version(["yosys", "-V"]))
+    update(get_tool_version(["ghdl", "--version"]))
+
+    return h.hexdigest()
+
+
+def evict_cache(cache_dir, max_size=CACHE_MAX_SIZE, max_age=CACHE_MAX_AGE):
+    if not os.path.isdir(cache_dir):
+        return
+
+    def remove(path):
+        # the entry may be evicted by another build at the same time
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    now = time.time()
+    entries = []
+    for f in os.listdir(cache_dir):
+        # the temporary files are entries being written by other builds
+        if f.endswith(".tmp"):
+            continue
+        path = os.path.join(cache_dir, f)
+        if not os.path.isfile(path):
+            continue
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if max_age is not None and now - stat.st_mtime > max_age:
+            remove(path)
+        else:
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    if max_size is None:
+        return
+
+    # least recently used entries go first
+    entries.sort()
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total_size <= max_size:
+            break
+        remove(path)
+        total_size -= size
+
+
+def _fetch_cached(cached, dest, symlink):
+    if os.path.lexists(dest):
+        os.remove(dest)
+    if symlink:
+        os.symlink(cached, dest)
+    else:
+        shutil.copyfile(cached, dest)
+    # mark the entry as recently used
+    os.utime(cached)
+
+
+def _store_cached(dest, cached):
+    os.makedirs(os.path.dirname(cached), exist_ok=True)
+    # write to a temporary file first so parallel builds never see
+    # a partially written cache entry
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cached), suffix=".tmp")
+    os.close(fd)
+    shutil.copyfile(dest, tmp)
+    os.replace(tmp, cached)
+
+
+def yosys_profile_cmds(profile, top_module):
+    if profile not in YOSYS_PROFILES:
+        raise Exception(f"Unsupported Yosys profile {profile}")
+    return [c.format(top_module=top_module) for c in YOSYS_PROFILES[profile]]
+
+
+def stat_report_path(dest):
+    return os.path.splitext(dest)[0] + ".stat.json"
+
+
+def stat_summary(report):
+    """Summarizes the JSON report of the Yosys `stat` command.
+
+    Returns the number of cells, wires, wire bits, flip-flops, memories and
+    memory bits of the whole design.
+    """
+    if "design" in report:
+        totals = [report["design"]]
+    else:
+        totals = list(report["modules"].values())
+
+    summary = {
+        "cells": 0,
+        "wires": 0,
+        "wire_bits": 0,
+        "ffs": 0,
+        "memories": 0,
+        "memory_bits": 0,
+    }
+    for stat in totals:
+        summary["cells"] += stat.get("num_cells", 0)
+        summary["wires"] += stat.get("num_wires", 0)
+        summary["wire_bits"] += stat.get("num_wire_bits", 0)
+        summary["memories"] += stat.get("num_memories", 0)
+        summary["memory_bits"] += stat.get("num_memory_bits", 0)
+        for cell, count in stat.get("num_cells_by_type", {}).items():
+            if "dff" in cell.lower() or "dlatch" in cell.lower():
+                summary["ffs"] += count
+
+    return summary
+
+
+def _scan_vhdl(path, library):
+    with open(path, errors="replace") as f:
+        text = VHDL_COMMENT_RE.sub("", f.read()).lower()
+
+    units = set(VHDL_UNIT_RE.findall(text))
+    # a package body needs its package and the units are needed by their
+    # uses and `entity work.X` instances, component declarations are bound
+    # at elaboration and do not order the analysis
+    deps = set(VHDL_BODY_RE.findall(text))
+    for lib in {"work", (library or "work").lower()}:
+        deps |= set(re.findall(rf"\b{lib}\.(\w+)", text))
+
+    return units, deps - units
+
+
+def vhdl_dependency_levels(srcs, library=None, jobs=None):
+    """Sorts the VHDL sources by the units they use.
+
+    Returns a list of levels, where the sources of every level depend only
+    on the sources of the previous levels. The sources are scanned by `jobs`
+    threads.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(jobs) as executor:
+        scans = list(executor.map(lambda f: _scan_vhdl(f, library), srcs))
+
+    providers = {}
+    for f, (units, _) in zip(srcs, scans):
+        for unit in units:
+            providers[unit] = f
+
+    # units of other libraries, e.g. ieee, are not provided by the sources
+    deps = {}
+    for f, (_, units) in zip(srcs, scans):
+        deps[f] = {providers[u] for u in units if u in providers} - {f}
+
+    levels = []
+    done = set()
+    while len(done) < len(srcs):
+        level = [f for f in srcs if f not in done and deps[f] <= done]
+        if not level:
+            cycle = [os.path.basename(f) for f in srcs if f not in done]
+            raise Exception(f"Circular dependency between {', '.join(cycle)}")
+        levels.append(level)
+        done |= set(level)
+
+    return levels
+
+
+def _run_stage(timings, stage, cmd, **kwargs):
+    print(" ".join(cmd))
+    start = time.perf_counter()
+    subprocess.check_call(cmd, **kwargs)
+    timings[stage] = time.perf_counter() - start
 
 
 def convert_to_verilog(
-    srcs, dest, top_module, ghdl_flags=[], yosys_cmds=[], library=None
+    srcs,
+    dest,
+    top_module,
+    ghdl_flags=[],
+    yosys_cmds=[],
+    library=None,
+    use_cache=True,
+    cache_dir=None,
+    cache_max_size=CACHE_MAX_SIZE,
+    cache_max_age=CACHE_MAX_AGE,
+    symlink=False,
+    backend="yosys"
 ):
+    """Converts the VHDL sources to a Verilog netlist.
+
+    The sources are analyzed once, in the order of their dependencies,
+    and the design is elaborated either by the GHDL plugin of Yosys
+    (the "yosys" backend) or directly by `ghdl synth` (the "ghdl" backend),
+    which does not run any Yosys commands. With the yosys backend the JSON
+    report of the Yosys `stat` command is written next to `dest`, see
+    `stat_report_path`. Returns the time taken by every stage of
+    the conversion in seconds.
+    """
+    if backend not in CONVERSION_BACKENDS:
+        raise Exception(f"Unsupported conversion backend {backend}")
+    if backend == "ghdl" and yosys_cmds:
+        raise Exception("Yosys commands require the yosys backend")
+
+    timings = {}
+    start = time.perf_counter()
+
+    use_cache = use_cache and cache_enabled()
+    if use_cache:
+        cache_dir = get_cache_dir() if cache_dir is None else cache_dir
+        key = conversion_cache_key(
+            srcs, top_module, ghdl_flags, yosys_cmds, library, backend
+        )
+        cached = os.path.join(cache_dir, f"{top_module}-{key}.v")
+        if os.path.isfile(cached):
+            _fetch_cached(cached, dest, symlink)
+            report = stat_report_path(dest)
+            if os.path.isfile(stat_report_path(cached)):
+                _fetch_cached(stat_report_path(cached), report, symlink)
+            elif os.path.lexists(report):
+                os.remove(report)
+            timings["cache"] = time.perf_counter() - start
+            return timings
+
+    # the ghdl backend does not produce the report
+    if os.path.lexists(stat_report_path(dest)):
+        os.remove(stat_report_path(dest))
+
     srcs_abs = [os.path.abspath(f) for f in srcs]
-    library_str = "" if library is None else f"--work={library}"
-
-    ys = """
-    ghdl {ghdl_flags} {vhdl_library} {sources_list} -e {top_module}
-    {yosys_cmds}
-    write_verilog {output_file}
-    """.format(
-        ghdl_flags=" ".join(ghdl_flags),
-        vhdl_library=library_str,
-        sources_list=" ".join(srcs_abs),
-        yosys_cmds="\n".join(yosys_cmds),
-        top_module=top_module,
-        output_file=dest
-    )
-
-    with tempfile.NamedTemporaryFile("w") as ys_file:
-        ys_file.write(ys)
-        ys_file.flush()
-        subprocess.check_call(f"cat {ys_file.name}", shell=True)
-        ys_cmd = "yosys -m ghdl -s {}".format(ys_file.name)
-        subprocess.check_call(ys_cmd, shell=True)
+    levels = vhdl_dependency_levels(srcs_abs, library)
+    timings["scan"] = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as workdir:
+        flags = list(ghdl_flags) + [f"--workdir={workdir}"]
+        if library is not None:
+            flags.append(f"--work={library}")
+
+        # GHDL rewrites the index of the library on every analysis, so
+        # the sources of a library are analyzed by a single process
+        sources = [f for level in levels for f in level]
+        _run_stage(timings, "analysis", ["ghdl", "-a"] + flags + sources)
+
+        if backend == "ghdl":
+            cmd = ["ghdl", "synth", "--out=verilog"] + flags + [top_module]
+            with open(dest, "w") as output:
+                _run_stage(timings, "elaboration", cmd, stdout=output)
+        else:
+            ys = """
+            ghdl {ghdl_flags} {top_module}
+            {yosys_cmds}
+            tee -q -o {report_file} stat -json -top {top_module}
+            write_verilog {output_file}
+            """.format(
+                ghdl_flags=" ".join(flags),
+                yosys_cmds="\n".join(yosys_cmds),
+                top_module=top_module,
+                report_file=stat_report_path(dest),
+                output_file=dest
+            )
+
+            with tempfile.NamedTemporaryFile("w") as ys_file:
+                ys_file.write(ys)
+                ys_file.flush()
+                subprocess.check_call(f"cat {ys_file.name}", shell=True)
+                cmd = ["yosys", "-m", "ghdl", "-s", ys_file.name]
+                _run_stage(timings, "elaboration", cmd)
+
+    if use_cache:
+        if backend == "yosys":
+            _store_cached(stat_report_path(dest), stat_report_path(cached))
+        _store_cached(dest, cached)
+        evict_cache(cache_dir, cache_max_size, cache_max_age)
+
+    timings["total"] = time.perf_counter() - start
+    for stage, duration in timings.items():
+        print(f"{stage}: {duration:.2f} s")
+
+    return timings
 
 
 def collect_sources(directory, ext, absolute=True):
@@ -45,3 +369,245 @@ def collect_sources(directory, ext, absolute=True):
                 source.append(os.path.normpath(file_path))
 
     return sources
+
+
+def _read_text(path):
+    # keep the line endings and any non UTF-8 bytes of the sources
+    with open(
+        path, encoding="utf-8", errors="surrogateescape", newline=""
+    ) as f:
+        return f.read()
+
+
+def _write_text(path, text):
+    with open(
+        path, "w", encoding="utf-8", errors="surrogateescape", newline=""
+    ) as f:
+        f.write(text)
+
+
+def _patch_path(line, strip):
+    path = line.split("\t")[0].strip()
+    if path == DEV_NULL:
+        return None
+    return "/".join(path.split("/")[strip:])
+
+
+def parse_patch(text, strip=1):
+    """Parses a unified diff, e.g. created by `git format-patch`.
+
+    Returns a list of (old_path, new_path, hunks) tuples, one for every
+    patched file, where the paths are None for created and deleted files
+    and every hunk is a (start, old_lines, new_lines) tuple.
+    """
+    lines = text.splitlines(keepends=True)
+    files = []
+    i = 0
+    while i < len(lines):
+        if not (
+            lines[i].startswith("--- ") and i + 1 < len(lines)
+            and lines[i + 1].startswith("+++ ")
+        ):
+            i += 1
+            continue
+
+        old_path = _patch_path(lines[i][4:], strip)
+        new_path = _patch_path(lines[i + 1][4:], strip)
+        hunks = []
+        i += 2
+        while i < len(lines) and lines[i].startswith("@@"):
+            match = HUNK_RE.match(lines[i])
+            if match is None:
+                raise Exception(f"Invalid hunk header: {lines[i].strip()}")
+            start = int(match.group(1))
+            old_count = int(match.group(2) or 1)
+            new_count = int(match.group(4) or 1)
+            old_lines = []
+            new_lines = []
+            tag = None
+            i += 1
+            while i < len(lines) and (
+                old_count or new_count or lines[i].startswith("\\")
+            ):
+                line = lines[i]
+                i += 1
+                if line.startswith("\\"):
+                    # "\ No newline at end of file" of the previous line
+                    if tag in " -":
+                        old_lines[-1] = old_lines[-1].rstrip("\r\n")
+                    if tag in " +":
+                        new_lines[-1] = new_lines[-1].rstrip("\r\n")
+                    continue
+                # editors and mail clients strip the space of empty lines
+                tag = line[0] if line.strip("\r\n") else " "
+                content = line[1:] if line.strip("\r\n") else line
+                if tag in " -":
+                    old_lines.append(content)
+                    old_count -= 1
+                if tag in " +":
+                    new_lines.append(content)
+                    new_count -= 1
+            hunks.append((start, old_lines, new_lines))
+        files.append((old_path, new_path, hunks))
+
+    return files
+
+
+def _find_hunk(lines, old_lines, expected):
+    # the hunk may have moved, so look around the position given in the
+    # header, closest first
+    size = len(old_lines)
+    last = len(lines) - size
+    for distance in range(max(expected, last - expected) + 1):
+        for pos in [expected - distance, expected + distance]:
+            if 0 <= pos <= last and lines[pos:pos + size] == old_lines:
+                return pos
+    return None
+
+
+def apply_patch(patch, directory, strip=1):
+    """Applies a unified diff to the files in `directory`.
+
+    The hunks have to match exactly, but may be moved from the lines given
+    in the patch.
+    """
+    for old_path, new_path, hunks in parse_patch(_read_text(patch), strip):
+        path = new_path if old_path is None else old_path
+        target = os.path.join(directory, path)
+        lines = []
+        if old_path is not None:
+            lines = _read_text(target).splitlines(keepends=True)
+
+        offset = 0
+        for start, old_lines, new_lines in hunks:
+            # a hunk without the old lines is inserted after the start line
+            base = max(start - (1 if old_lines else 0), 0)
+            pos = _find_hunk(lines, old_lines, base + offset)
+            if pos is None:
+                raise Exception(
+                    f"Patch {patch} does not apply to {path} at line {start}"
+                )
+            lines[pos:pos + len(old_lines)] = new_lines
+            # the following hunks move by the same distance as this one
+            offset = pos - base + len(new_lines) - len(old_lines)
+
+        if new_path is None:
+            os.remove(target)
+        else:
+            target = os.path.join(directory, new_path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            _write_text(target, "".join(lines))
+            if old_path is not None and old_path != new_path:
+                os.remove(os.path.join(directory, old_path))
+
+
+def _files_equal(a, b):
+    if os.path.getsize(a) != os.path.getsize(b):
+        return False
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        return fa.read() == fb.read()
+
+
+def _sync_file(src, dest):
+    if os.path.isfile(dest) and _files_equal(src, dest):
+        return False
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    shutil.copyfile(src, dest)
+    return True
+
+
+def sync_tree(src, dest, keep=[], ignore=[], jobs=None):
+    """Makes `dest` a copy of `src`, writing only the files which differ.
+
+    Unchanged files keep their modification times, so the tools that
+    depend on them do not rebuild. Files missing in `src` are removed
+    from `dest`, except for the `keep` ones, and the `ignore` directories
+    are skipped in both trees. The files are compared and copied by `jobs`
+    threads. Returns the sorted list of the updated and removed files,
+    relative to `dest`.
+    """
+    # imported here, as it takes longer than importing the whole module
+    from concurrent.futures import ThreadPoolExecutor
+
+    src_files = set()
+    for root, dirs, files in os.walk(src):
+        dirs[:] = [d for d in dirs if d not in ignore]
+        for f in files:
+            src_files.add(os.path.relpath(os.path.join(root, f), src))
+
+    def sync(f):
+        return _sync_file(os.path.join(src, f), os.path.join(dest, f))
+
+    changed = []
+    with ThreadPoolExecutor(jobs) as executor:
+        files = sorted(src_files)
+        for f, updated in zip(files, executor.map(sync, files)):
+            if updated:
+                changed.append(f)
+
+    for root, _, files in os.walk(dest, topdown=False):
+        rel_root = os.path.relpath(root, dest)
+        if any(d in ignore for d in rel_root.split(os.sep)):
+            continue
+        for f in files:
+            rel_path = os.path.normpath(os.path.join(rel_root, f))
+            path = os.path.join(root, f)
+            if rel_path not in src_files and rel_path not in keep:
+                os.remove(path)
+                changed.append(rel_path)
+        if root != dest and not os.listdir(root):
+            os.rmdir(root)
+
+    return sorted(changed)
+
+
+def tree_hash(directory, ignore=[".git"]):
+    h = hashlib.sha256()
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d not in ignore)
+        for f in sorted(files):
+            path = os.path.join(root, f)
+            with open(path, "rb") as src:
+                digest = hashlib.sha256(src.read()).hexdigest()
+            rel_path = os.path.relpath(path, directory)
+            h.update(f"{rel_path}\0{digest}\0".encode())
+    return h.hexdigest()
+
+
+def _git(directory, *args):
+    result = subprocess.run(["git"] + list(args),
+                            cwd=directory,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL,
+                            check=True)
+    return result.stdout.decode().strip()
+
+
+def get_git_commit(directory):
+    """Returns the commit checked out in `directory`, or None when it is not
+    the top of a clean git working tree."""
+    try:
+        top = _git(directory, "rev-parse", "--show-toplevel")
+        commit = _git(directory, "rev-parse", "HEAD")
+        status = _git(directory, "status", "--porcelain")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    if os.path.realpath(top) != os.path.realpath(directory) or status:
+        return None
+    return commit
+
+
+def sources_key(src, patches):
+    """Key of the sources generated from the `src` repository of the core
+    with the `patches` applied.
+
+    The repository is identified by its commit, or by its contents when it
+    is not a clean git working tree.
+    """
+    h = hashlib.sha256()
+    commit = get_git_commit(src)
+    h.update((commit or tree_hash(src)).encode())
+    for patch in patches:
+        with open(patch, "rb") as f:
+            h.update(hashlib.sha256(f.read()).hexdigest().encode())
+    return h.hexdigest()
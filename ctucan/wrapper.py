@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2022 Antmicro
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+
+from functools import reduce
+from operator import or_
+
+from migen import *
+from migen.genlib.cdc import MultiReg
+
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect.csr_eventmanager import *
+from ctucan.cdc import TimestampCDC, WishboneCDC
+from ctucan.dma import CTUCANRXDMA, CTUCANTXDMA
+from ctucan.events import CTUCANEventManager
+from ctucan.perf import CTUCANPerfCounters
+from ctucan.registers import *
+from ctucan.timestamp import CTUCANTimestamp
+from ctucan.utils import (
+    YOSYS_PROFILES, collect_sources, convert_to_verilog, yosys_profile_cmds
+)
+
+__all__ = [
+    "CTUCAN",
+    "CTUCANArray",
+    "CTUCANWishboneWrapper",
+]
+
+CORE_VARIANTS = ["vhdl", "verilog", "prebuilt", "external"]
+
+# Wishbone registered feedback cycle types
+CTI_CLASSIC = 0b000
+CTI_CONST_BURST = 0b001
+CTI_INC_BURST = 0b010
+CTI_END_OF_BURST = 0b111
+
+
+def all_ones(signal_width):
+    return 2**(signal_width) - 1
+
+
+class CTUCANWishboneWrapper(Module):
+
+    def __init__(
+        self,
+        can_rx,
+        can_tx,
+        irq,
+        pipelined=False,
+        bursting=False,
+        clock_domain="sys"
+    ):
+        if pipelined and bursting:
+            raise Exception("Bursts are supported only in the classic mode")
+
+        # IOs
+        self.bus = wishbone.Interface(
+            data_width=32, adr_width=14, bursting=bursting
+        )
+        self.timestamp = Signal(64, reset=all_ones(64))
+        self.can_rx = can_rx
+        self.can_tx = can_tx
+        self.irq = irq
+
+        # Wishbone B4 pipelined mode. The LiteX Wishbone interface has no
+        # stall signal, so it is provided by the wrapper itself, and
+        # the classic masters of LiteX cannot use this mode.
+        self.pipelined = pipelined
+        self.stall = Signal(name="bus_stall")
+        self.bursting = bursting
+
+        # The wrapper and the core run in a single clock domain, which
+        # is also the domain of the bus.
+        self.clock_domain = clock_domain
+        sync = getattr(self.sync, clock_domain)
+
+        # parameters
+
+        # The CTU CAN IP-core uses byte addressing, while the Wishbone bus uses
+        # word addressing. As a consequence, the two least significant bits
+        # of the core's address line are unused to make the two addressing
+        # patterns conformant.
+
+        ALIGNMENT_BITS = 2
+        self.size = 2**(self.bus.adr_width + ALIGNMENT_BITS)
+
+        bus_rd = Signal()
+        bus_wr = Signal()
+        bus_cs = Signal()
+        bus_adr = Signal(self.bus.adr_width + ALIGNMENT_BITS)
+        bus_dat_r = Signal(32)
+
+        if pipelined:
+            # The core performs a write in the cycle it is requested and
+            # returns read data one cycle after the request, so a new
+            # access can be accepted every clock and the bus never stalls.
+            self.comb += [
+                self.stall.eq(0),
+                bus_cs.eq(self.bus.cyc & self.bus.stb),
+                bus_rd.eq(bus_cs & ~self.bus.we),
+                bus_wr.eq(bus_cs & self.bus.we),
+                bus_adr.eq(Cat(0, 0, self.bus.adr)),
+                self.bus.dat_r.eq(bus_dat_r),
+            ]
+
+            sync += self.bus.ack.eq(bus_cs)
+        elif bursting:
+            self.add_burst_logic(
+                bus_cs, bus_rd, bus_wr, bus_adr, bus_dat_r, ALIGNMENT_BITS
+            )
+        else:
+            self.comb += [
+                bus_cs.eq(self.bus.cyc & self.bus.stb),
+                bus_rd.eq(bus_cs & ~self.bus.we & ~self.bus.ack),
+                bus_wr.eq(bus_cs & self.bus.we & ~self.bus.ack),
+                bus_adr.eq(Cat(0, 0, self.bus.adr)),
+                self.bus.dat_r.eq(bus_dat_r),
+            ]
+
+            sync += [
+                self.bus.ack.eq(0),
+                If(bus_cs & ~self.bus.ack, self.bus.ack.eq(1)),
+            ]
+
+        # CAN controller instance
+        self.specials += Instance(
+            "can_top_level",
+            i_clk_sys=ClockSignal(clock_domain),
+            i_res_n=~ResetSignal(clock_domain),
+            i_data_in=self.bus.dat_w,
+            i_adress=bus_adr,
+            i_scs=bus_cs,
+            i_srd=bus_rd,
+            i_swr=bus_wr,
+            i_sbe=self.bus.sel,
+            i_can_rx=can_rx,
+            i_timestamp=self.timestamp,
+            o_data_out=bus_dat_r,
+            o_int=irq,
+            o_can_tx=can_tx,
+        )
+
+    def get_ios(self):
+        ios = {
+            self.bus.adr,
+            self.bus.dat_w,
+            self.bus.dat_r,
+            self.bus.sel,
+            self.bus.cyc,
+            self.bus.stb,
+            self.bus.ack,
+            self.bus.we,
+            self.can_rx,
+            self.can_tx,
+            self.irq
+        }
+        if self.pipelined:
+            ios.add(self.stall)
+        if self.bursting:
+            ios.update({self.bus.cti, self.bus.bte})
+        return ios
+
+    def add_burst_logic(
+        self, bus_cs, bus_rd, bus_wr, bus_adr, bus_dat_r, alignment_bits
+    ):
+        # Registered feedback bursts: the ack of each beat is asserted in
+        # the same cycle the master presents it. Writes are performed
+        # by the core in the cycle they are requested, while the read of
+        # the next beat is requested together with the ack of the current
+        # one, so that its data is ready when the master presents it.
+        # Constant address bursts are accepted only for the RX_DATA FIFO
+        # and incrementing bursts only for the TXT buffer windows, other
+        # bursts are handled as separate classic cycles.
+
+        ack = Signal()
+        in_burst = Signal()
+        burst = Signal()
+        next_adr = Signal(self.bus.adr_width)
+        core_adr = Signal(self.bus.adr_width)
+        rd_fresh = Signal()
+        rd_data = Signal(32)
+
+        rx_data_adr = RX_DATA_OFFSET >> alignment_bits
+        txt_start_adr = TXT_BUFFER_OFFSET >> alignment_bits
+        txt_end_adr = txt_start_adr + \
+            ((TXT_BUFFER_NUM * TXT_BUFFER_SIZE) >> alignment_bits)
+
+        const_burst = (self.bus.cti == CTI_CONST_BURST) & \
+            (self.bus.adr == rx_data_adr)
+        inc_burst = (self.bus.cti == CTI_INC_BURST) & \
+            (self.bus.adr >= txt_start_adr) & (self.bus.adr < txt_end_adr)
+
+        adr_inc = self.bus.adr + 1
+        self.comb += [
+            Case(
+                self.bus.bte,
+                {
+                    0b00: next_adr.eq(adr_inc),
+                    0b01: next_adr.eq(Cat(adr_inc[:2], self.bus.adr[2:])),
+                    0b10: next_adr.eq(Cat(adr_inc[:3], self.bus.adr[3:])),
+                    0b11: next_adr.eq(Cat(adr_inc[:4], self.bus.adr[4:])),
+                }
+            ),
+            If(
+                self.bus.cti == CTI_CONST_BURST,
+                next_adr.eq(self.bus.adr),
+            ),
+        ]
+
+        self.comb += [
+            bus_cs.eq(self.bus.cyc & self.bus.stb),
+            burst.eq(const_burst | inc_burst),
+            self.bus.ack.eq(bus_cs & ack),
+            # the first beat is written in its request cycle only
+            bus_wr.eq(bus_cs & self.bus.we & (~ack | in_burst)),
+            bus_rd.eq(bus_cs & ~self.bus.we & (~ack | burst)),
+            core_adr.eq(
+                Mux(ack & burst & ~self.bus.we, next_adr, self.bus.adr)
+            ),
+            bus_adr.eq(Cat(0, 0, core_adr)),
+            # read data is valid one cycle after the request, keep it
+            # around in case the master inserts wait states in a burst
+            self.bus.dat_r.eq(Mux(rd_fresh, bus_dat_r, rd_data)),
+        ]
+
+        sync = getattr(self.sync, self.clock_domain)
+        sync += [
+            rd_fresh.eq(bus_rd),
+            If(rd_fresh, rd_data.eq(bus_dat_r)),
+            If(
+                bus_cs,
+                # the first beat is acked one cycle after the request,
+                # the following beats of a burst in consecutive cycles
+                ack.eq(~ack | burst),
+                in_burst.eq(ack & burst),
+            ).Elif(
+                ~self.bus.cyc,
+                ack.eq(0),
+                in_burst.eq(0),
+            ).Elif(
+                ~in_burst,
+                ack.eq(0),
+            ),
+        ]
+
+
+class CTUCAN(Module, AutoCSR):
+
+    def __init__(
+        self,
+        platform,
+        pads,
+        variant="vhdl",
+        use_cache=True,
+        yosys_profile="none",
+        bursting=False,
+        with_rx_dma=False,
+        with_tx_dma=False,
+        with_irq_coalescing=False,
+        with_timestamp=False,
+        timestamp_prescaler=1,
+        timestamp=None,
+        with_perf_counters=False,
+        clock_domain="sys"
+    ):
+        if variant not in CORE_VARIANTS:
+            raise Exception("Unsupported core variant")
+
+        if yosys_profile not in YOSYS_PROFILES:
+            raise Exception("Unsupported Yosys profile")
+
+        if with_timestamp and timestamp is not None:
+            raise Exception("Use either own or shared timestamp")
+
+        self.platform = platform
+        self.variant = variant
+        self.use_cache = use_cache
+        self.yosys_profile = yosys_profile
+
+        core_irq = Signal()
+        sys_irq = Signal()
+        sys_timestamp = Signal(64, reset=all_ones(64))
+
+        self.submodules.wbwrapper = CTUCANWishboneWrapper(
+            pads.rx,
+            pads.tx,
+            core_irq,
+            bursting=bursting,
+            clock_domain=clock_domain
+        )
+
+        # The timestamp can be generated by the module itself or shared
+        # with other modules, e.g. with CTUCANTimestamp.timestamp
+        if with_timestamp:
+            self.submodules.timestamp = CTUCANTimestamp(timestamp_prescaler)
+            timestamp = self.timestamp.timestamp
+        if timestamp is not None:
+            self.comb += sys_timestamp.eq(timestamp)
+
+        # Slave interface of the registers of the core in the sys clock
+        # domain. When the core runs in another clock domain, the bus,
+        # the interrupt and the timestamp cross the domains here.
+        core_bus = self.wbwrapper.bus
+        if clock_domain == "sys":
+            self.comb += [
+                sys_irq.eq(core_irq),
+                self.wbwrapper.timestamp.eq(sys_timestamp),
+            ]
+        else:
+            self.submodules.cdc = WishboneCDC(
+                self.wbwrapper.bus, "sys", clock_domain
+            )
+            self.submodules.timestamp_cdc = TimestampCDC(
+                sys_timestamp, self.wbwrapper.timestamp, "sys", clock_domain
+            )
+            self.specials += MultiReg(core_irq, sys_irq)
+            core_bus = self.cdc.bus
+
+        self.submodules.ev = CTUCANEventManager(
+            sys_irq,
+            sys_timestamp if timestamp is not None else None,
+            with_coalescing=with_irq_coalescing
+        )
+
+        # The DMA engines and the interrupt coalescing share the bus with
+        # the CPU, which gets its own interface in that case.
+        self.bus = core_bus
+        core_masters = []
+
+        if with_irq_coalescing:
+            core_masters.append(self.ev.core)
+
+        if with_rx_dma:
+            self.submodules.rx_dma = CTUCANRXDMA()
+            core_masters.append(self.rx_dma.core)
+            self.ev.add_source(
+                "rx_dma", self.rx_dma.ev.irq, "RX DMA interrupt"
+            )
+
+        if with_tx_dma:
+            self.submodules.tx_dma = CTUCANTXDMA()
+            core_masters.append(self.tx_dma.core)
+            self.ev.add_source(
+                "tx_dma", self.tx_dma.ev.irq, "TX DMA interrupt"
+            )
+
+        if core_masters:
+            self.bus = wishbone.Interface(
+                data_width=32, adr_width=14, bursting=bursting
+            )
+            masters = [self.bus] + core_masters
+            self.submodules.arbiter = wishbone.Arbiter(masters, core_bus)
+
+        # The counters watch the accesses of the CPU, also when they cross
+        # the clock domains or share the bus with the core masters
+        if with_perf_counters:
+            self.submodules.perf = CTUCANPerfCounters(self.bus, self.ev.irq)
+
+        self.ev.finalize()
+
+    def add_sources(self, copy=False):
+        cdir = os.path.dirname(__file__)
+        sources_path = os.path.join(cdir, "vhdl")
+        top_module = "can_top_level"
+        library = "ctu_can_fd_rtl"
+
+        if self.variant == "vhdl":
+            vhdl_sources = collect_sources(sources_path, ".vhd")
+            for f in vhdl_sources:
+                self.platform.add_source(f, library=library, copy=copy)
+
+        elif self.variant == "verilog":
+            vhdl_sources = collect_sources(sources_path, ".vhd")
+            gen_dir = os.path.join(cdir, "generated")
+            if not os.path.exists(gen_dir):
+                os.mkdir(gen_dir)
+            output_file = os.path.join(gen_dir, f"{top_module}.v")
+            convert_to_verilog(
+                vhdl_sources,
+                output_file,
+                top_module=top_module,
+                yosys_cmds=yosys_profile_cmds(self.yosys_profile, top_module),
+                library=library,
+                use_cache=self.use_cache
+            )
+            self.platform.add_source(output_file, copy=copy)
+
+        elif self.variant == "prebuilt":
+            prebuilt_file = os.path.join(cdir, "prebuilt", f"{top_module}.v")
+            if not os.path.exists(prebuilt_file):
+                raise FileNotFoundError(
+                    f"Prebuilt core {prebuilt_file} does not exist, "
+                    "run `make generate-verilog` to create it"
+                )
+            self.platform.add_source(prebuilt_file, copy=copy)
+
+    def do_finalize(self):
+        # the channels of CTUCANArray share the sources added by the array
+        if self.platform is not None:
+            self.add_sources()
+
+
+class CTUCANArray(Module, AutoCSR):
+    """Several CTUCAN channels behind a single Wishbone slave.
+
+    Every channel gets a window of `window_size` bytes, which only has to
+    cover the registers and the TXT buffers of the core instead of the whole
+    address space of the wrapper. The channels share the timestamp,
+    the sources of the core and the interrupt, and the `irq_status` register
+    tells which of the channels request the interrupt.
+    """
+
+    def __init__(
+        self,
+        platform,
+        pads,
+        variant="vhdl",
+        use_cache=True,
+        yosys_profile="none",
+        window_size=0x1000,
+        bursting=False,
+        with_rx_dma=False,
+        with_tx_dma=False,
+        with_irq_coalescing=False,
+        with_timestamp=False,
+        timestamp_prescaler=1,
+        timestamp=None,
+        with_perf_counters=False,
+        clock_domain="sys"
+    ):
+        if variant not in CORE_VARIANTS:
+            raise Exception("Unsupported core variant")
+
+        if yosys_profile not in YOSYS_PROFILES:
+            raise Exception("Unsupported Yosys profile")
+
+        txt_end = TXT_BUFFER_OFFSET + TXT_BUFFER_NUM * TXT_BUFFER_SIZE
+        if window_size & (window_size - 1) or window_size < txt_end:
+            raise Exception(
+                f"Window size has to be a power of 2 of at least {txt_end:#x}"
+            )
+
+        if with_timestamp and timestamp is not None:
+            raise Exception("Use either own or shared timestamp")
+
+        self.platform = platform
+        self.variant = variant
+        self.use_cache = use_cache
+        self.yosys_profile = yosys_profile
+
+        if with_timestamp:
+            self.submodules.timestamp = CTUCANTimestamp(timestamp_prescaler)
+            timestamp = self.timestamp.timestamp
+
+        self.channels = []
+        for i, channel_pads in enumerate(pads):
+            channel = CTUCAN(
+                None,
+                channel_pads,
+                variant,
+                bursting=bursting,
+                with_rx_dma=with_rx_dma,
+                with_tx_dma=with_tx_dma,
+                with_irq_coalescing=with_irq_coalescing,
+                timestamp=timestamp,
+                with_perf_counters=with_perf_counters,
+                clock_domain=clock_domain
+            )
+            setattr(self.submodules, f"can{i}", channel)
+            self.channels.append(channel)
+
+        # IOs
+        window_bits = log2_int(window_size) - 2
+        channel_bits = bits_for(len(self.channels) - 1)
+        self.size = window_size * 2**channel_bits
+        self.bus = wishbone.Interface(
+            data_width=32,
+            adr_width=window_bits + channel_bits,
+            bursting=bursting
+        )
+        self.submodules.ev = SharedIRQ(
+            *[channel.ev for channel in self.channels]
+        )
+
+        self.irq_status = CSRStatus(
+            len(self.channels),
+            description="Interrupt requests of the channels, one bit "
+            "per channel"
+        )
+        self.comb += self.irq_status.status.eq(
+            Cat(*[channel.ev.irq for channel in self.channels])
+        )
+
+        # Address decoder
+        channel_sel = Signal(max=max(2, 2**channel_bits))
+        self.comb += channel_sel.eq(self.bus.adr[window_bits:])
+
+        acks = []
+        dat_rs = []
+        for i, channel in enumerate(self.channels):
+            selected = channel_sel == i
+            self.comb += [
+                channel.bus.adr.eq(self.bus.adr[:window_bits]),
+                channel.bus.dat_w.eq(self.bus.dat_w),
+                channel.bus.sel.eq(self.bus.sel),
+                channel.bus.we.eq(self.bus.we),
+                channel.bus.cti.eq(self.bus.cti),
+                channel.bus.bte.eq(self.bus.bte),
+                channel.bus.cyc.eq(self.bus.cyc & selected),
+                channel.bus.stb.eq(self.bus.stb & selected),
+            ]
+            acks.append(channel.bus.ack & selected)
+            dat_rs.append(Replicate(selected, 32) & channel.bus.dat_r)
+
+        # Windows without a channel read as zeros
+        unmapped = Signal()
+        unmapped_ack = Signal()
+        self.comb += unmapped.eq(channel_sel >= len(self.channels))
+        self.sync += unmapped_ack.eq(
+            self.bus.cyc & self.bus.stb & unmapped & ~unmapped_ack
+        )
+        acks.append(unmapped_ack)
+
+        self.comb += [
+            self.bus.ack.eq(reduce(or_, acks)),
+            self.bus.dat_r.eq(reduce(or_, dat_rs)),
+        ]
+
+    add_sources = CTUCAN.add_sources
+
+    def do_finalize(self):
+        if self.platform is not None:
+            self.add_sources()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import argparse
+
+from ctucan.regmap import (
+    REGMAP_FILE,
+    add_csr_json_registers,
+    add_svd_peripheral,
+    generate_c_header,
+    generate_python,
+    load_regmap,
+)
+
+parser = argparse.ArgumentParser(
+    description='Generate the register map of the CTUCAN core'
+)
+parser.add_argument(
+    '--regmap', default=REGMAP_FILE, help="register map description"
+)
+parser.add_argument('--python', help="output Python module")
+parser.add_argument('--c-header', help="output C header")
+parser.add_argument(
+    '--csr-json', help="csr.json of a LiteX SoC to add the registers to"
+)
+parser.add_argument(
+    '--svd', help="SVD file of a LiteX SoC to add the registers to"
+)
+parser.add_argument(
+    '--region', default="can", help="memory region of the core in the SoC"
+)
+parser.add_argument(
+    '--base',
+    type=lambda x: int(x, 0),
+    default=None,
+    help="base address of the core, by default the base of the region "
+    "from csr.json"
+)
+
+args = parser.parse_args()
+regmap = load_regmap(args.regmap)
+
+
+def write_output(path, content):
+    dest_dir = os.path.dirname(os.path.abspath(path))
+    os.makedirs(dest_dir, exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+if args.python:
+    write_output(args.python, generate_python(regmap))
+
+if args.c_header:
+    write_output(args.c_header, generate_c_header(regmap))
+
+base = args.base
+if args.csr_json:
+    with open(args.csr_json) as f:
+        csr = json.load(f)
+    add_csr_json_registers(csr, regmap, args.region, base)
+    write_output(args.csr_json, json.dumps(csr, indent=4))
+    if base is None:
+        base = csr["memories"][args.region]["base"]
+
+if args.svd:
+    if base is None:
+        raise Exception("Base address is required, pass --base or --csr-json")
+    with open(args.svd) as f:
+        svd = f.read()
+    write_output(args.svd, add_svd_peripheral(svd, regmap, base))
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import argparse
+
+from ctucan.utils import (
+    CONVERSION_BACKENDS,
+    YOSYS_PROFILES,
+    collect_sources,
+    convert_to_verilog,
+    stat_report_path,
+    stat_summary,
+    yosys_profile_cmds,
+)
+
+TOP_MODULE = "can_top_level"
+LIBRARY = "ctu_can_fd_rtl"
+
+parser = argparse.ArgumentParser(
+    description='Convert CTUCAN sources to a Verilog netlist'
+)
+parser.add_argument('src', help='CTUCAN VHDL sources directory')
+parser.add_argument('dest', help="output Verilog file")
+parser.add_argument(
+    '--no-cache',
+    action="store_true",
+    default=False,
+    help="do not use the conversion cache"
+)
+parser.add_argument(
+    '--backend',
+    choices=CONVERSION_BACKENDS,
+    default="yosys",
+    help="tool elaborating the design"
+)
+parser.add_argument(
+    '--profile',
+    choices=YOSYS_PROFILES,
+    default="none",
+    help="Yosys optimization profile"
+)
+
+args = parser.parse_args()
+
+if not os.path.exists(args.src):
+    raise FileNotFoundError(f"Source directory {args.src} does not exist")
+
+dest_dir = os.path.dirname(os.path.abspath(args.dest))
+os.makedirs(dest_dir, exist_ok=True)
+
+vhdl_sources = collect_sources(args.src, ".vhd")
+convert_to_verilog(
+    vhdl_sources,
+    os.path.abspath(args.dest),
+    top_module=TOP_MODULE,
+    yosys_cmds=yosys_profile_cmds(args.profile, TOP_MODULE),
+    library=LIBRARY,
+    use_cache=not args.no_cache,
+    backend=args.backend
+)
+
+report = stat_report_path(os.path.abspath(args.dest))
+if os.path.exists(report):
+    with open(report) as f:
+        summary = stat_summary(json.load(f))
+    print(f"Statistics of {args.dest} ({report}):")
+    for name, value in summary.items():
+        print(f"  {name}: {value}")
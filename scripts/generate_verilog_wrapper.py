@@ -1,14 +1,30 @@
 #!/usr/bin/env python3
 
+import argparse
+
 from migen import *
 from migen.fhdl import verilog
 
 from ctucan import CTUCANWishboneWrapper
 
+parser = argparse.ArgumentParser(
+    description='Generate the CTUCAN Wishbone wrapper'
+)
+parser.add_argument(
+    '--pipelined',
+    action="store_true",
+    default=False,
+    help="use the Wishbone B4 pipelined mode"
+)
+
+args = parser.parse_args()
+
 irq = Signal()
 can_rx = Signal()
 can_tx = Signal()
 
-wb_wrapper = CTUCANWishboneWrapper(can_rx, can_tx, irq)
+wb_wrapper = CTUCANWishboneWrapper(
+    can_rx, can_tx, irq, pipelined=args.pipelined
+)
 verilog_src = verilog.convert(wb_wrapper, wb_wrapper.get_ios(), name="CTUCAN")
 print(verilog_src)
@@ -1,11 +1,17 @@
 #!/usr/bin/env python3
 
 import os
+import sys
+import glob
 import tempfile
 import argparse
-import shutil
 import subprocess
 
+from ctucan.utils import apply_patch, sources_key, sync_tree
+
+# Key of the sources the output directory was generated from
+STAMP_FILE = ".sources-key"
+
 parser = argparse.ArgumentParser(description='Generate CTUCAN sources')
 parser.add_argument('src', help='CTUCAN source directory')
 parser.add_argument('dest', help="output directory")
@@ -16,20 +22,29 @@ parser.add_argument(
     default=False,
     help="force overwriting existing output directory"
 )
+parser.add_argument(
+    '-i',
+    '--incremental',
+    action="store_true",
+    default=False,
+    help="update the output directory only if the sources or the patches "
+    "changed since it was generated"
+)
+parser.add_argument(
+    '-j',
+    '--jobs',
+    type=int,
+    default=None,
+    help="number of threads copying the files"
+)
 
 args = parser.parse_args()
 
 if not os.path.exists(args.src):
     raise FileNotFoundError(f"Source directory {args.src} does not exist")
 src_abs = os.path.abspath(args.src)
-
-if os.path.exists(args.dest):
-    if not args.f:
-        raise FileExistsError(f"Destination directory {args.dest} exists")
-    else:
-        shutil.rmtree(args.dest)
-
 dest_abs = os.path.abspath(args.dest)
+stamp = os.path.join(dest_abs, STAMP_FILE)
 
 patches_abs = []
 for patch in args.p:
@@ -38,18 +53,46 @@ for patch in args.p:
     else:
         patches_abs.append(os.path.abspath(patch))
 
+key = sources_key(src_abs, patches_abs)
+
+if os.path.exists(dest_abs):
+    if args.incremental and os.path.isfile(stamp):
+        with open(stamp) as f:
+            if f.read().strip() == key:
+                print(f"{args.dest} is up to date")
+                sys.exit(0)
+    elif not (args.f or args.incremental):
+        raise FileExistsError(f"Destination directory {args.dest} exists")
+
 with tempfile.TemporaryDirectory() as dirname:
     ctucan_dir = os.path.join(dirname, os.path.basename(src_abs))
     ctucan_scripts_dir = os.path.join(ctucan_dir, "scripts")
 
-    subprocess.check_call(f"cp -R {src_abs} .", shell=True, cwd=dirname)
+    sync_tree(src_abs, ctucan_dir, ignore=[".git"], jobs=args.jobs)
 
     for patch in patches_abs:
-        cmd = f"patch -p1 < {patch}"
-        subprocess.check_call(cmd, shell=True, cwd=ctucan_dir)
+        apply_patch(patch, ctucan_dir)
+
+    cmd = [
+        sys.executable,
+        "create_release.py",
+        f"--output_dir={ctucan_dir}/build",
+    ]
+    subprocess.check_call(cmd, cwd=ctucan_scripts_dir)
+
+    build_dirs = glob.glob(os.path.join(ctucan_dir, "build*", "src"))
+    if len(build_dirs) != 1:
+        raise Exception(f"Expected one release in {ctucan_dir}")
+
+    # only the changed files are written, so the tools using the sources
+    # see the unchanged ones as up to date
+    changed = sync_tree(
+        build_dirs[0], dest_abs, keep=[STAMP_FILE], jobs=args.jobs
+    )
 
-    cmd = f"python3 create_release.py --output_dir={ctucan_dir}/build"
-    subprocess.check_call(cmd, shell=True, cwd=ctucan_scripts_dir)
+with open(stamp, "w") as f:
+    f.write(key + "\n")
 
-    cmd = f"cp -R {ctucan_dir}/build*/src/ {dest_abs}"
-    subprocess.check_call(cmd, shell=True, cwd=dirname)
+print(f"Updated {len(changed)} files in {args.dest}")
+for f in changed:
+    print(f"  {f}")
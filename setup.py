@@ -1,14 +1,43 @@
 #!/usr/bin/env python3
 
 import os
+import sys
 import subprocess
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
 
 from tempfile import TemporaryDirectory
 
 with open('README.md') as readme_file:
     readme = readme_file.read()
 
+VHDL_DIR = os.path.join('ctucan', 'vhdl')
+PREBUILT_CORE = os.path.join('ctucan', 'prebuilt', 'can_top_level.v')
+
+
+class BuildPyWithPrebuiltCore(build_py):
+    """Converts the CTUCAN core to Verilog once, so it can be shipped
+    as package data and used by the "prebuilt" core variant."""
+
+    def run(self):
+        if not os.path.exists(PREBUILT_CORE) and os.path.exists(VHDL_DIR):
+            cmd = [
+                sys.executable,
+                'scripts/generate_verilog_core.py',
+                VHDL_DIR,
+                PREBUILT_CORE
+            ]
+            env = dict(os.environ, PYTHONPATH=os.path.abspath('.'))
+            try:
+                subprocess.check_call(cmd, env=env)
+            except (OSError, subprocess.CalledProcessError):
+                self.warn(
+                    f"could not generate {PREBUILT_CORE}, "
+                    "the \"prebuilt\" core variant will be unavailable"
+                )
+        super().run()
+
+
 setup(
     name='ctucan',
     description="Configurable CAN IP-core for LiteX SoC Builder",
@@ -21,22 +50,33 @@ setup(
         'License :: OSI Approved :: Apache Software License',
         'Natural Language :: English',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
     ],
     zip_safe=False,
     long_description=readme,
     long_description_content_type="text/markdown",
-    python_requires='>=3.6',
+    python_requires='>=3.7',
     install_requires=[
         'migen>=0.9.2',
         'litex>=0.0.0',
     ],
+    extras_require={
+        'frames': ['numpy'],
+    },
     keywords='LiteX CAN',
     packages=find_packages(include=['ctucan', 'ctucan.*']),
     package_dir={"ctucan": "ctucan"},
-    package_data={'ctucan': ['vhdl/*.vhd']},
+    package_data={
+        'ctucan': [
+            'vhdl/*.vhd',
+            'prebuilt/*.v',
+            'prebuilt/*.stat.json',
+            'regmap.json',
+            'include/*.h',
+        ]
+    },
+    cmdclass={'build_py': BuildPyWithPrebuiltCore},
     include_package_data=True,
     version='0.1.0',
 )
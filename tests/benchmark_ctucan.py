@@ -0,0 +1,219 @@
+import json
+import os
+import time
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.regression import TestFactory
+from cocotb.triggers import Edge
+from cocotb.utils import get_sim_time
+
+from migen import *
+from ctucan import CTUCANWishboneWrapper
+from ctucan.registers import DLC_TO_LENGTH
+
+import cocotb_ctucan as cc
+from common import get_test_output_dir
+from test_ctucan import ctucan_configure, reset, run_cocotb
+
+# Frames sent by every workload and the results file, can be overridden
+# with the environment variables
+FRAMES_ENV = "CTUCAN_BENCH_FRAMES"
+OUTPUT_ENV = "CTUCAN_BENCH_OUTPUT"
+DEFAULT_FRAMES = 8
+
+CLK_PERIOD = 10  # 100MHz
+RESET_CYCLES = 10
+
+# Nominal bit time set by ctucan_configure_timings, the bus is idle after
+# 11 recessive nominal bits
+NOMINAL_BIT_TIME = 8000  # ns
+IDLE_TIME = 11 * NOMINAL_BIT_TIME
+
+
+def workload(fd, dlc, brs=False, ext=False, buffers=1):
+    return {"fd": fd, "dlc": dlc, "brs": brs, "ext": ext, "buffers": buffers}
+
+
+WORKLOADS = [workload(False, dlc) for dlc in [0, 4, 8]]
+WORKLOADS += [workload(False, 8, ext=True)]
+WORKLOADS += [
+    workload(True, dlc, brs) for dlc in [8, 12, 15] for brs in [False, True]
+]
+WORKLOADS += [workload(True, 15, True, buffers=n) for n in [2, 3, 4]]
+
+results = []
+
+
+def workload_name(workload):
+    name = "fd" if workload["fd"] else "can20"
+    name += f"_dlc{workload['dlc']}"
+    if workload["brs"]:
+        name += "_brs"
+    if workload["ext"]:
+        name += "_ext"
+    return name + f"_{workload['buffers']}buf"
+
+
+def stats(values):
+    return {
+        "min": min(values),
+        "avg": sum(values) / len(values),
+        "max": max(values),
+    }
+
+
+def write_results():
+    output = os.environ.get(OUTPUT_ENV)
+    if output is None:
+        output = os.path.join(
+            get_test_output_dir(__file__), "benchmark_ctucan.json"
+        )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    report = {
+        "simulator": os.environ.get("SIM", "icarus"),
+        "results": results,
+    }
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+class BusMonitor:
+    """Measures the time in which the bus is not idle."""
+
+    def __init__(self, signal):
+        self.signal = signal
+        self.busy_time = 0
+        self.task = cocotb.start_soon(self.monitor())
+
+    async def monitor(self):
+        last_edge = get_sim_time("ns")
+        while True:
+            await Edge(self.signal)
+            now = get_sim_time("ns")
+            if now - last_edge < IDLE_TIME:
+                self.busy_time += now - last_edge
+            last_edge = now
+
+    def stop(self):
+        self.task.kill()
+
+
+async def benchmark(dut, workload):
+    frames = int(os.environ.get(FRAMES_ENV, DEFAULT_FRAMES))
+    start_wall_clock = time.perf_counter()
+
+    cocotb.start_soon(Clock(dut.sys_clk, CLK_PERIOD, 'ns').start())
+    wbs = cc.create_wb_master(dut, dut.sys_clk)
+    await reset(dut, RESET_CYCLES)
+    await cc.reset(dut, wbs)
+    irqs = await ctucan_configure(dut, wbs)
+
+    frame_type = cc.FrameType.FD if workload["fd"] else cc.FrameType.STD
+    length = DLC_TO_LENGTH[workload["dlc"]]
+    data = int.from_bytes(bytes(range(1, length + 1)), "little")
+    idf = 0x1ABCDEF if workload["ext"] else 0x123
+
+    tx_latencies = []
+    rx_latencies = []
+
+    # every TXT buffer has its own sender, which submits the next frame when
+    # the previous one is sent
+    async def sender(buffno, count):
+        for _ in range(count):
+            submitted = get_sim_time("ns")
+            await cc.send_frame(
+                dut,
+                wbs,
+                frame_type,
+                data,
+                idf,
+                workload["ext"],
+                workload["brs"],
+                buffno,
+                length=length
+            )
+            await irqs.tx_done(buffno)
+            tx_latencies.append(get_sim_time("ns") - submitted)
+
+    # the receiver drains the whole RX buffer on every interrupt. The event
+    # of the next interrupt is taken before the drain, so an interrupt
+    # during the drain wakes up the next one with its own time.
+    async def receiver():
+        received = 0
+        event = irqs.events[cc.INT_STAT_RXI_BIT]
+        while received < frames:
+            await event.wait()
+            irq_time = event.data
+            event = irqs.events[cc.INT_STAT_RXI_BIT]
+            count = await cc.rx_frame_count(dut, wbs)
+            # the frames were read by the previous drain
+            if not count:
+                continue
+            await cc.recv_frames(dut, wbs, count)
+            rx_latencies.append(get_sim_time("ns") - irq_time)
+            received += count
+
+    monitor = BusMonitor(dut.can_tx)
+    start = get_sim_time("ns")
+
+    rx = cocotb.start_soon(receiver())
+    buffers = workload["buffers"]
+    senders = [
+        cocotb.start_soon(sender(b, len(range(b, frames, buffers))))
+        for b in range(buffers)
+    ]
+    for s in senders:
+        await s
+    await rx
+
+    sim_time = get_sim_time("ns") - start
+    monitor.stop()
+    irqs.stop()
+
+    result = dict(workload)
+    result.update({
+        "name": workload_name(workload),
+        "frames": frames,
+        "sim_time_ns": sim_time,
+        "frames_per_s": frames / (sim_time * 1e-9),
+        "bus_utilization": monitor.busy_time / sim_time,
+        "tx_latency_ns": stats(tx_latencies),
+        "rx_latency_ns": stats(rx_latencies),
+        "wall_clock_s": time.perf_counter() - start_wall_clock,
+    })
+    dut._log.info(json.dumps(result))
+    results.append(result)
+    write_results()
+
+
+factory = TestFactory(benchmark)
+factory.add_option("workload", WORKLOADS)
+factory.generate_tests()
+
+
+def test_benchmark():
+    TOP_LEVEL = "top_test"
+    WRAPPER_TOP_LEVEL = "CTUCAN"
+
+    tests_dir = os.path.dirname(__file__)
+    top_file = os.path.join(tests_dir, f"{TOP_LEVEL}.v")
+
+    irq = Signal()
+    can_rx = Signal()
+    can_tx = Signal()
+    ctucan_wb_wrapper = CTUCANWishboneWrapper(can_rx, can_tx, irq)
+
+    # the results file is relative to the directory of the tests
+    extra_env = {}
+    if OUTPUT_ENV in os.environ:
+        extra_env[OUTPUT_ENV] = os.path.abspath(os.environ[OUTPUT_ENV])
+
+    run_cocotb(
+        "benchmark_ctucan",
+        TOP_LEVEL,
+        ctucan_wb_wrapper,
+        WRAPPER_TOP_LEVEL,
+        sources=[top_file],
+        extra_env=extra_env
+    )
@@ -0,0 +1,74 @@
+from functools import reduce
+from operator import and_
+
+from migen import *
+
+from ctucan import CTUCANWishboneWrapper
+
+WISHBONE_MASTER_SIGNALS = ["adr", "dat_w", "sel", "cyc", "stb", "we"]
+WISHBONE_SLAVE_SIGNALS = ["dat_r", "ack"]
+
+
+class CANBusModel(Module):
+    """CAN bus connecting several CTUCAN nodes in simulation.
+
+    The bus is the wired-AND of the transmitters of all nodes, a dominant
+    bit (0) of any node overrides the recessive bits (1) of the others.
+    The signals of every node pass through `delay` registers on the way to
+    the bus and back, modelling the propagation delay of the bus and
+    the transceivers. `delay` is given in clock cycles, for all nodes or as
+    a list with the delay of every node. Virtual nodes driven from Python
+    take part in the bus through the bits of `virtual_tx`.
+
+    Node n is accessed through the Wishbone signals prefixed with `wb<n>_`
+    and signals its interrupt on `irq<n>`.
+    """
+
+    def __init__(self, nodes=2, virtual_nodes=0, delay=0):
+        delays = delay if isinstance(delay, list) else [delay] * nodes
+        if len(delays) != nodes:
+            raise Exception("Delay has to be given for every node")
+
+        # IOs
+        self.bus = Signal(name="can_bus", reset=1)
+        self.virtual_tx = Signal(
+            max(virtual_nodes, 1),
+            name="virtual_tx",
+            reset=2**max(virtual_nodes, 1) - 1
+        )
+        self.ios = {self.bus, self.virtual_tx}
+
+        bus_tx = [self.virtual_tx[i] for i in range(virtual_nodes)]
+        for n in range(nodes):
+            can_rx = Signal(reset=1)
+            can_tx = Signal(reset=1)
+            irq = Signal(name=f"irq{n}")
+            node = CTUCANWishboneWrapper(can_rx, can_tx, irq)
+            setattr(self.submodules, f"node{n}", node)
+            self.ios.add(irq)
+
+            for name in WISHBONE_MASTER_SIGNALS:
+                s = getattr(node.bus, name)
+                io = Signal.like(s, name=f"wb{n}_{name}")
+                self.comb += s.eq(io)
+                self.ios.add(io)
+            for name in WISHBONE_SLAVE_SIGNALS:
+                s = getattr(node.bus, name)
+                io = Signal.like(s, name=f"wb{n}_{name}")
+                self.comb += io.eq(s)
+                self.ios.add(io)
+
+            bus_tx.append(self.add_delay(can_tx, delays[n]))
+            self.comb += can_rx.eq(self.add_delay(self.bus, delays[n]))
+
+        self.comb += self.bus.eq(reduce(and_, bus_tx, 1))
+
+    def add_delay(self, i, delay):
+        for _ in range(delay):
+            o = Signal(reset=1)
+            self.sync += o.eq(i)
+            i = o
+        return i
+
+    def get_ios(self):
+        return self.ios
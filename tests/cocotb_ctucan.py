@@ -1,74 +1,28 @@
 import cocotb
+import numpy as np
 
 from enum import Enum
 from cocotb.clock import Clock
-from cocotb.triggers import ClockCycles, RisingEdge
+from cocotb.triggers import ClockCycles, Event, Lock, RisingEdge, Timer
+from cocotb.utils import get_sim_time
 from cocotbext.wishbone.driver import WishboneMaster
 from cocotbext.wishbone.driver import WBOp
 
-DEVICE_ID_OFFSET = 0x0
-VERSION_OFFSET = 0x2
-MODE_OFFSET = 0x4
-SETTINGS_OFFSET = 0x6
-INT_STAT_OFFSET = 0x10
-INT_ENA_SET_OFFSET = 0x14
-INT_ENA_CLR_OFFSET = 0x18
-INT_MASK_SET_OFFSET = 0x1C
-INT_MASK_CLR_OFFSET = 0x20
-BTR_OFFSET = 0x24
-BTR_FD_OFFSET = 0x28
-RX_DATA_OFFSET = 0x6C
-RX_STATUS_OFFSET = 0x68
-TRV_DELAY_OFFSET = 0x80
-FAULT_STATE_OFFSET = 0x2E
-TXT_COMMAND_OFFSET = 0x74
-YOLO_OFFSET = 0x90
-TXT_BUFFER_1_OFFSET = 0x100
-TXT_BUFFER_2_OFFSET = 0x200
-
-RX_STATUS_RXE_BIT = 0
-MODE_RST_BIT = 0
-MODE_STM_BIT = 2
-SETTINGS_ILBP_BIT = 5
-SETTINGS_ENA_BIT = 6
-FAULT_STATE_ERA_BIT = 0
-FAULT_STATE_ERP_BIT = 1
-FAULT_STATE_BOF_BIT = 2
-TXT_COMMAND_TXCR_BIT = 1
-TXT_COMMAND_TXB1_BIT = 8
-TXT_COMMAND_TXB2_BIT = 8
-
-INT_STAT_RXI_BIT = 0
-INT_STAT_TXI_BIT = 1
-INT_STAT_EWLI_BIT = 2
-INT_STAT_DOI_BIT = 3
-INT_STAT_FCSI_BIT = 4
-INT_STAT_ALI_BIT = 5
-INT_STAT_BEI_BIT = 6
-INT_STAT_OFI_BIT = 7
-INT_STAT_RXFI_BIT = 8
-INT_STAT_BSI_BIT = 9
-INT_STAT_RBNEI_BIT = 10
-INT_STAT_TXBHCI_BIT = 11
-
-FRAME_FORMAT_OFFSET = 0x0
-IDENTIFIER_OFFSET = 0x4
-TIMESTAMP_L_OFFSET = 0x8
-TIMESTAMP_U_OFFSET = 0xC
-DATA_START_OFFSET = 0x10
-
-IDENTIFIER_STD_START_BIT = 18
-IDENTIFIER_EXT_START_BIT = 0
-
-FRAME_FORMAT_DLC_START_BIT = 0
-FRAME_FORMAT_RTR_BIT = 5
-FRAME_FORMAT_IDE_BIT = 6
-FRAME_FORMAT_FDF_BIT = 7
-FRAME_FORMAT_BRS_BIT = 9
+from ctucan.candump import CANDumpFrame
+from ctucan.frames import (
+    FRAME_DTYPE,
+    decode_stream,
+    dlc_to_length,
+    encode_frames,
+    length_to_dlc,
+)
+from ctucan.registers import *
 
+TXT_DONE_STATES = [TXT_STATE_TOK, TXT_STATE_ERR, TXT_STATE_ABT]
+
+MAX_CAN20_DATA_LEN = 8
 MAX_EXT_ID_LEN = 29
 MAX_ID_LEN = 11
-TXT_BUFFER_NUM = 4
 
 # helpers
 
@@ -84,15 +38,29 @@ def get_value(wbRes):
     return wbRes[0].datrd
 
 
+def get_values(wbRes):
+    return [res.datrd for res in wbRes]
+
+
 def bit_to_val(bit):
     return 1 << bit
 
 
-def round_to_multiple(nbr, mlt):
-    return mlt * round(nbr / mlt)
+# main functionality
 
 
-# main functionality
+class LockedWishboneMaster(WishboneMaster):
+    """WishboneMaster shared by concurrent coroutines, e.g. the test and
+    the interrupt handler. The driver runs one cycle at a time, so
+    the cycles are serialized by a lock."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = Lock()
+
+    async def send_cycle(self, arg):
+        async with self.lock:
+            return await super().send_cycle(arg)
 
 
 def create_wb_master(dut, clk, name="wb", width=16, timeout=10):
@@ -107,7 +75,7 @@ def create_wb_master(dut, clk, name="wb", width=16, timeout=10):
         "sel": "sel",
     }
 
-    return WishboneMaster(
+    return LockedWishboneMaster(
         dut,
         name,
         clk,
@@ -133,27 +101,66 @@ async def write_reg_32(dut, wbs, off, val):
     await wbs.send_cycle([WBOp(off >> 2, val)])
 
 
+# batched accesses are sent in a single Wishbone cycle, which saves
+# the handshake with the driver on every register
+
+
+@cocotb.coroutine
+async def read_regs_32(dut, wbs, offs):
+    for off in offs:
+        assert off % 0x4 == 0, "reg not aligned to 0x4"
+    wbRes = await wbs.send_cycle([WBOp(off >> 2) for off in offs])
+    result = get_values(wbRes)
+    dut._log.info(f"read {len(offs)} regs starting from {hex(offs[0])}")
+    return result
+
+
+@cocotb.coroutine
+async def write_regs_32(dut, wbs, writes):
+    for off, _ in writes:
+        assert off % 0x4 == 0, "reg not aligned to 0x4"
+    dut._log.info(
+        f"write {len(writes)} regs starting from {hex(writes[0][0])}"
+    )
+    await wbs.send_cycle([WBOp(off >> 2, val) for off, val in writes])
+
+
+def byte_lanes(off, size):
+    lanes = bit_to_val(size) - 1
+    return lanes << (off % 0x4)
+
+
+@cocotb.coroutine
+async def write_reg_sel(dut, wbs, off, val, size):
+    assert off % size == 0, f"reg not aligned to {hex(size)}"
+    shift = (off % 0x4) * 8
+    dut._log.info(f"write {hex(val)} to {hex(off)}")
+    await wbs.send_cycle([
+        WBOp(off >> 2, val << shift, sel=byte_lanes(off, size))
+    ])
+
+
+@cocotb.coroutine
+async def read_reg_8(dut, wbs, off):
+    reg = await read_reg_32(dut, wbs, off & ~(0x4 - 1))
+    return (reg >> ((off % 0x4) * 8)) & 0xFF
+
+
+@cocotb.coroutine
+async def write_reg_8(dut, wbs, off, val):
+    await write_reg_sel(dut, wbs, off, val & 0xFF, 0x1)
+
+
 @cocotb.coroutine
 async def read_reg_16(dut, wbs, off):
-    if off % 0x4 == 0:
-        reg = await read_reg_32(dut, wbs, off)
-        return reg & 0x0000FFFF
-    else:
-        reg = await read_reg_32(dut, wbs, off & ~(0x4 - 1))
-        return (reg & 0xFFFF0000) >> 16
+    assert off % 0x2 == 0, "reg not aligned to 0x2"
+    reg = await read_reg_32(dut, wbs, off & ~(0x4 - 1))
+    return (reg >> ((off % 0x4) * 8)) & 0xFFFF
 
 
 @cocotb.coroutine
 async def write_reg_16(dut, wbs, off, val):
-    if off % 0x4 == 0:
-        addr = off
-        reg = await read_reg_32(dut, wbs, addr)
-        reg = (reg & 0xFFFF0000) | (val)
-    else:
-        addr = off & 0x4
-        reg = await read_reg_32(dut, wbs, addr)
-        reg = (reg & 0x0000FFFF) | (val << 16)
-    await write_reg_32(dut, wbs, addr, reg)
+    await write_reg_sel(dut, wbs, off, val & 0xFFFF, 0x2)
 
 
 @cocotb.coroutine
@@ -164,12 +171,133 @@ async def set_bit_16(dut, wbs, off, bit, val):
     await write_reg_16(dut, wbs, off, reg_val)
 
 
+# the *_SET and *_CLR registers, as well as INT_STAT, only act on the bits
+# written as ones, so they do not need to be read first
+
+
+@cocotb.coroutine
+async def write_ones_16(dut, wbs, off, mask):
+    await write_reg_16(dut, wbs, off, mask)
+
+
+@cocotb.coroutine
+async def clear_bits_16(dut, wbs, off, mask):
+    reg_val = await read_reg_16(dut, wbs, off)
+    await write_reg_16(dut, wbs, off, reg_val & ~mask)
+
+
 @cocotb.coroutine
 async def get_bit_16(dut, wbs, off, bit):
     reg_val = await read_reg_16(dut, wbs, off)
     return 0x1 if (reg_val & bit_to_val(bit)) > 0 else 0x0
 
 
+# shadow registers
+
+
+class ShadowRegisters:
+    """Register map keeping shadow copies of the registers owned by software.
+
+    Reads of the shadowed registers are served from the shadows and writes
+    only update them, the dirty shadows are written back in one Wishbone
+    cycle by flush(). Only the configuration registers, which the core
+    changes only when they are written, are shadowed. The other registers,
+    e.g. the commands and the *_SET and *_CLR registers, are always
+    accessed through the bus right away, after flushing the pending writes
+    to keep the order of the accesses. Their 16-bit halves are written
+    with the byte lanes of the half only, so the other half of the word
+    is not written.
+    """
+
+    # Words of the configuration registers
+    CACHED = [
+        MODE_OFFSET,  # and SETTINGS
+        BTR_OFFSET,
+        BTR_FD_OFFSET,
+        FILTER_A_MASK_OFFSET,
+        FILTER_A_VAL_OFFSET,
+        FILTER_B_MASK_OFFSET,
+        FILTER_B_VAL_OFFSET,
+        FILTER_C_MASK_OFFSET,
+        FILTER_C_VAL_OFFSET,
+        FILTER_RAN_LOW_OFFSET,
+        FILTER_RAN_HIGH_OFFSET,
+        TX_PRIORITY_OFFSET,
+    ]
+
+    # Bits of the shadowed words cleared by the core after they are written
+    SELF_CLEARING = {MODE_OFFSET: MODE_RST_MASK}
+
+    def __init__(self, dut, wbs):
+        self.dut = dut
+        self.wbs = wbs
+        self.shadows = {}
+        self.pending = []
+
+    def is_cached(self, off):
+        return off & ~(0x4 - 1) in self.CACHED
+
+    def invalidate(self):
+        """Drops the shadows, e.g. after the reset of the core."""
+        self.shadows = {}
+
+    async def flush(self):
+        if not self.pending:
+            return
+        writes = self.pending
+        self.pending = []
+        await write_regs_32(self.dut, self.wbs, writes)
+
+    async def read_reg_32(self, off):
+        if not self.is_cached(off):
+            await self.flush()
+            return await read_reg_32(self.dut, self.wbs, off)
+        if off not in self.shadows:
+            self.shadows[off] = await read_reg_32(self.dut, self.wbs, off)
+        return self.shadows[off]
+
+    async def write_reg_32(self, off, val):
+        if not self.is_cached(off):
+            # written together with the pending writes preceding it
+            self.pending.append((off, val))
+            await self.flush()
+            return
+        self_clearing = self.SELF_CLEARING.get(off, 0)
+        self.shadows[off] = val & ~self_clearing
+        # the pending write of the register is updated, unless it acts on
+        # the core by itself
+        for i, (pending_off, pending_val) in enumerate(self.pending):
+            if pending_off == off and not pending_val & self_clearing:
+                self.pending[i] = (off, val)
+                return
+        self.pending.append((off, val))
+
+    async def read_reg_16(self, off):
+        reg = await self.read_reg_32(off & ~(0x4 - 1))
+        return (reg >> ((off % 0x4) * 8)) & 0xFFFF
+
+    async def write_reg_16(self, off, val):
+        addr = off & ~(0x4 - 1)
+        shift = (off % 0x4) * 8
+        if not self.is_cached(addr):
+            await self.flush()
+            await write_reg_sel(self.dut, self.wbs, off, val & 0xFFFF, 0x2)
+            return
+        reg = await self.read_reg_32(addr)
+        reg = (reg & ~(0xFFFF << shift)) | (val << shift)
+        await self.write_reg_32(addr, reg)
+
+    async def set_bit_16(self, off, bit, val):
+        reg_val = await self.read_reg_16(off)
+        val_tmp = 0x1 if val > 0 else 0x0
+        reg_val = (reg_val & ~bit_to_val(bit)) | (val_tmp << bit)
+        await self.write_reg_16(off, reg_val)
+
+    async def get_bit_16(self, off, bit):
+        reg_val = await self.read_reg_16(off)
+        return 0x1 if (reg_val & bit_to_val(bit)) > 0 else 0x0
+
+
 # ctucan functions
 
 
@@ -233,16 +361,14 @@ async def rx_empty(dut, wbs):
     return True if rxe == 1 else False
 
 
-@cocotb.coroutine
-async def send_frame(
-    dut,
-    wbs,
+def frame_writes(
     frame_type=FrameType.STD,
     data=0x1122334455667788,
     idf=0x123,
     extidf=False,
     brs=False,
-    buffno=0
+    buffno=0,
+    length=None
 ):
     if buffno >= TXT_BUFFER_NUM:
         raise Exception("too high tx buffer number")
@@ -253,9 +379,6 @@ async def send_frame(
     if extidf and idf.bit_length() > MAX_EXT_ID_LEN:
         raise Exception("extended frame identifier too long")
 
-    idf_off = IDENTIFIER_EXT_START_BIT if extidf else IDENTIFIER_STD_START_BIT
-    identifier = (idf << idf_off)
-
     if buffno == 0:
         buff_off = TXT_BUFFER_1_OFFSET
         buff_select_bit = TXT_COMMAND_TXB1_BIT
@@ -269,34 +392,74 @@ async def send_frame(
         buff_off = TXT_BUFFER_4_OFFSET
         buff_select_bit = TXT_COMMAND_TXB4_BIT
 
-    data_length_in_bytes = round_to_multiple(data.bit_length(), 8) // 8
-    frame_format = (data_length_in_bytes << FRAME_FORMAT_DLC_START_BIT)
-    if frame_type == FrameType.RTR:
-        frame_format |= bit_to_val(FRAME_FORMAT_RTR_BIT)
-    if frame_type == FrameType.FD:
-        frame_format |= bit_to_val(FRAME_FORMAT_FDF_BIT)
-        if brs:
-            frame_format |= bit_to_val(FRAME_FORMAT_BRS_BIT)
-
-    await write_reg_32(dut, wbs, buff_off + FRAME_FORMAT_OFFSET, frame_format)
-    await write_reg_32(dut, wbs, buff_off + IDENTIFIER_OFFSET, identifier)
-
-    if frame_type != FrameType.RTR:
-        await write_reg_32(dut, wbs, buff_off + TIMESTAMP_L_OFFSET, 0)
-        await write_reg_32(dut, wbs, buff_off + TIMESTAMP_U_OFFSET, 0)
-
-        for i in range(data_length_in_bytes // 4):
-            offset = buff_off + DATA_START_OFFSET + i * 0x4
-            reg_val = 0xFFFFFFFF & data
-            await write_reg_32(dut, wbs, offset, reg_val)
-            data >>= 32
-
-    await write_reg_32(
-        dut,
-        wbs,
+    # the length has to be given to send leading zero bytes
+    if length is None:
+        length = (data.bit_length() + 7) // 8
+    if frame_type != FrameType.FD and length > MAX_CAN20_DATA_LEN:
+        raise Exception("CAN 2.0 frame data too long")
+
+    frames = np.zeros(1, dtype=FRAME_DTYPE)
+    frames["id"] = idf
+    frames["ide"] = extidf
+    frames["rtr"] = frame_type == FrameType.RTR
+    frames["fdf"] = frame_type == FrameType.FD
+    frames["brs"] = frame_type == FrameType.FD and brs
+    frames["dlc"] = length_to_dlc(length)
+    frames["data"][0, :length] = list(data.to_bytes(length, "little"))
+
+    words, counts = encode_frames(frames)
+    writes = []
+    for i in range(counts[0]):
+        writes.append((buff_off + i * 0x4, int(words[0, i])))
+
+    writes.append((
         TXT_COMMAND_OFFSET,
         bit_to_val(TXT_COMMAND_TXCR_BIT) | bit_to_val(buff_select_bit)
-    )
+    ))
+
+    return writes
+
+
+@cocotb.coroutine
+async def send_frame(
+    dut,
+    wbs,
+    frame_type=FrameType.STD,
+    data=0x1122334455667788,
+    idf=0x123,
+    extidf=False,
+    brs=False,
+    buffno=0,
+    length=None
+):
+    writes = frame_writes(frame_type, data, idf, extidf, brs, buffno, length)
+    await write_regs_32(dut, wbs, writes)
+
+
+@cocotb.coroutine
+async def txt_buffer_state(dut, wbs, buffno=0):
+    reg_val = await read_reg_32(dut, wbs, TX_STATUS_OFFSET)
+    state = reg_val >> (buffno * TX_STATUS_TXTS_WIDTH)
+    return state & (bit_to_val(TX_STATUS_TXTS_WIDTH) - 1)
+
+
+@cocotb.coroutine
+async def txt_buffer_writable(dut, wbs, buffno=0):
+    state = await txt_buffer_state(dut, wbs, buffno)
+    return state in TXT_WRITABLE_STATES
+
+
+@cocotb.coroutine
+async def send_frames(dut, wbs, frames, buffno=0, poll_cycles=100):
+    """Sends frames, given as dicts of send_frame arguments, one by one.
+
+    Every frame takes a single cycle, after which the TXT buffer is polled
+    until the frame is sent.
+    """
+    for frame in frames:
+        await send_frame(dut, wbs, buffno=buffno, **frame)
+        while not await txt_buffer_writable(dut, wbs, buffno):
+            await ClockCycles(wbs.clock, num_cycles=poll_cycles)
 
 
 @cocotb.coroutine
@@ -345,44 +508,225 @@ async def send_rtr_frame(dut, wbs, idf):
 @cocotb.coroutine
 async def recv_frame(dut, wbs):
     ffw = await read_reg_32(dut, wbs, RX_DATA_OFFSET)
-    id = await read_reg_32(dut, wbs, RX_DATA_OFFSET)
-    ts_l = await read_reg_32(dut, wbs, RX_DATA_OFFSET)
-    ts_h = await read_reg_32(dut, wbs, RX_DATA_OFFSET)
 
-    rwcnt = (ffw >> MAX_ID_LEN) & 0x1F
-    for _ in range(rwcnt - 3):  # Skip identifier and 2 timestamp fileds
-        data = await read_reg_32(dut, wbs, RX_DATA_OFFSET)
-        dut._log.info("data = {}".format(hex(data)))
+    # the rest of the frame is read in one cycle
+    rwcnt = (ffw >> FRAME_FORMAT_RWCNT_START_BIT) & 0x1F
+    words = await read_regs_32(dut, wbs, [RX_DATA_OFFSET] * rwcnt)
+    frame = decode_stream([ffw] + words)[0]
+    length = dlc_to_length(frame["dlc"], frame["fdf"])
+    data = bytes(frame["data"][:length])
+    dut._log.info(f"received {hex(frame['id'])}, data = {data.hex()}")
+
+    return [ffw] + words
+
+
+@cocotb.coroutine
+async def rx_frame_count(dut, wbs):
+    reg_val = await read_reg_32(dut, wbs, RX_STATUS_OFFSET)
+    rxfrc = reg_val >> RX_STATUS_RXFRC_START_BIT
+    return rxfrc & (bit_to_val(RX_STATUS_RXFRC_WIDTH) - 1)
+
+
+@cocotb.coroutine
+async def recv_frames(dut, wbs, count, poll_cycles=100):
+    """Receives count frames and returns the words of each of them."""
+    frames = []
+    while len(frames) < count:
+        available = await rx_frame_count(dut, wbs)
+        if not available:
+            await ClockCycles(wbs.clock, num_cycles=poll_cycles)
+        for _ in range(min(available, count - len(frames))):
+            frames.append(await recv_frame(dut, wbs))
+    return frames
 
 
 @cocotb.coroutine
 async def irq_mask_all(dut, wbs):
-    reg_val = await read_reg_16(dut, wbs, INT_MASK_SET_OFFSET)
-    mask = 0x0FFF
-    reg_val = (reg_val & ~mask) | mask
-    await write_reg_16(dut, wbs, INT_MASK_SET_OFFSET, reg_val)
+    await write_ones_16(dut, wbs, INT_MASK_SET_OFFSET, 0x0FFF)
 
 
 @cocotb.coroutine
 async def irq_enable(dut, wbs, irq_bit):
-    await set_bit_16(dut, wbs, INT_ENA_SET_OFFSET, irq_bit, 0x1)
+    await write_ones_16(dut, wbs, INT_ENA_SET_OFFSET, bit_to_val(irq_bit))
 
 
 @cocotb.coroutine
 async def irq_disable(dut, wbs, irq_bit):
-    await set_bit_16(dut, wbs, INT_ENA_SET_OFFSET, irq_bit, 0x1)
+    await write_ones_16(dut, wbs, INT_ENA_CLR_OFFSET, bit_to_val(irq_bit))
 
 
 @cocotb.coroutine
 async def irq_clear(dut, wbs, irq_bit):
-    await set_bit_16(dut, wbs, INT_ENA_CLR_OFFSET, irq_bit, 0x1)
+    await write_ones_16(dut, wbs, INT_STAT_OFFSET, bit_to_val(irq_bit))
 
 
 @cocotb.coroutine
 async def irq_mask(dut, wbs, irq_bit):
-    await set_bit_16(dut, wbs, INT_MASK_SET_OFFSET, irq_bit, 0x1)
+    await write_ones_16(dut, wbs, INT_MASK_SET_OFFSET, bit_to_val(irq_bit))
 
 
 @cocotb.coroutine
 async def irq_unmask(dut, wbs, irq_bit):
-    await set_bit_16(dut, wbs, INT_MASK_CLR_OFFSET, irq_bit, 0x1)
+    await write_ones_16(dut, wbs, INT_MASK_CLR_OFFSET, bit_to_val(irq_bit))
+
+
+# virtual nodes of the bus model
+
+
+@cocotb.coroutine
+async def drive_virtual_node(dut, index, bits, bit_cycles):
+    """Drives the bits (0 is dominant) from a virtual node of the bus model
+    for bit_cycles clock cycles each, then releases the bus."""
+    for bit in list(bits) + [1]:
+        value = dut.virtual_tx.value.integer & ~bit_to_val(index)
+        dut.virtual_tx.value = value | (bit << index)
+        await ClockCycles(dut.sys_clk, num_cycles=bit_cycles)
+
+
+# interrupt-driven waits
+
+
+class InterruptEvents:
+    """Awaitable events of the core, backed by the irq line and INT_STAT.
+
+    The handler started by start() clears the interrupts reported in INT_STAT
+    and wakes up the coroutines waiting for them. Every wait checks its
+    condition in the registers of the core first, so an interrupt
+    reported before the wait is not lost. The interrupts used by the waits
+    have to be enabled and unmasked.
+    """
+
+    def __init__(self, dut, wbs, irq):
+        self.dut = dut
+        self.wbs = wbs
+        self.irq = irq
+        self.events = {bit: Event() for bit in range(INT_STAT_TXBHCI_BIT + 1)}
+        self.handler = None
+
+    def start(self):
+        self.handler = cocotb.start_soon(self.handle())
+        return self
+
+    def stop(self):
+        self.handler.kill()
+
+    async def handle(self):
+        while True:
+            if self.irq.value != 1:
+                await RisingEdge(self.irq)
+            irq_time = get_sim_time("ns")
+            stat = await read_reg_16(self.dut, self.wbs, INT_STAT_OFFSET)
+            if stat:
+                await write_ones_16(self.dut, self.wbs, INT_STAT_OFFSET, stat)
+            for bit, event in self.events.items():
+                if stat & bit_to_val(bit):
+                    # the set event wakes up the current waits, the next
+                    # ones wait for a new one. Its data is the time of the
+                    # interrupt, e.g. to measure latencies.
+                    self.events[bit] = Event()
+                    event.set(irq_time)
+            await RisingEdge(self.wbs.clock)
+
+    async def wait(self, irq_bit, condition):
+        while True:
+            # an interrupt during the check of the condition sets the event
+            # taken before it, so the wait never misses it
+            event = self.events[irq_bit]
+            result = await condition()
+            if result:
+                return result
+            await event.wait()
+
+    async def frame_received(self):
+        """Waits until there is a frame in the RX buffer."""
+
+        async def condition():
+            return await rx_frame_count(self.dut, self.wbs)
+
+        return await self.wait(INT_STAT_RXI_BIT, condition)
+
+    async def tx_done(self, buffno=0):
+        """Waits until the frame in the TXT buffer is sent, or it fails."""
+
+        async def condition():
+            state = await txt_buffer_state(self.dut, self.wbs, buffno)
+            return state if state in TXT_DONE_STATES else None
+
+        return await self.wait(INT_STAT_TXI_BIT, condition)
+
+    async def bus_active(self):
+        """Waits until the core integrates to the bus."""
+
+        async def condition():
+            return await is_initialized(self.dut, self.wbs)
+
+        return await self.wait(INT_STAT_FCSI_BIT, condition)
+
+
+# candump logs
+
+# The replay and the capture run concurrently with each other and with
+# the interrupt handler, so they need the locked master of create_wb_master
+
+
+@cocotb.coroutine
+async def replay_candump(dut, wbs, irqs, frames, speedup=1, buffno=0):
+    """Sends the frames, e.g. from ctucan.candump.read_candump(), with their
+    original timing, compressed speedup times.
+
+    The frames go through a single TXT buffer, so a frame due while
+    the previous one is still being sent is delayed.
+    """
+    start = None
+    for frame in frames:
+        if start is None:
+            start = (frame.timestamp, get_sim_time("ns"))
+        delay = (frame.timestamp - start[0]) * 1e9 / speedup
+        wait = int(start[1] + delay - get_sim_time("ns"))
+        if wait > 0:
+            await Timer(wait, "ns")
+
+        if frame.fdf:
+            frame_type = FrameType.FD
+        elif frame.rtr:
+            frame_type = FrameType.RTR
+        else:
+            frame_type = FrameType.STD
+        await send_frame(
+            dut,
+            wbs,
+            frame_type,
+            int.from_bytes(frame.data, "little"),
+            frame.id,
+            frame.ide,
+            frame.brs,
+            buffno,
+            length=frame.rtr_length if frame.rtr else len(frame.data)
+        )
+        await irqs.tx_done(buffno)
+
+
+@cocotb.coroutine
+async def capture_candump(dut, wbs, irqs, writer, count=None):
+    """Writes the received frames to a ctucan.candump.CANDumpWriter,
+    with the simulation time as their timestamps."""
+    received = 0
+    while count is None or received < count:
+        await irqs.frame_received()
+        frame = decode_stream(await recv_frame(dut, wbs))[0]
+        length = dlc_to_length(frame["dlc"], frame["fdf"])
+        data = b"" if frame["rtr"] else bytes(frame["data"][:length])
+        writer.write(
+            CANDumpFrame(
+                get_sim_time("ns") * 1e-9,
+                writer.interface,
+                int(frame["id"]),
+                bool(frame["ide"]),
+                bool(frame["rtr"]),
+                bool(frame["fdf"]),
+                bool(frame["brs"]),
+                data,
+                length if frame["rtr"] else 0
+            )
+        )
+        received += 1
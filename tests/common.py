@@ -1,4 +1,6 @@
+import filecmp
 import os
+import shutil
 
 
 def get_test_output_dir(filename):
@@ -6,3 +8,12 @@ def get_test_output_dir(filename):
     name = os.path.basename(filename)
     output_dirname = os.path.splitext(name)[0]
     return os.path.join(test_dir, "build", output_dirname)
+
+
+def update_file(dest, src):
+    """Replaces dest with src only if their contents differ, so dest keeps
+    its modification time when nothing changes."""
+    if os.path.exists(dest) and filecmp.cmp(src, dest, shallow=False):
+        return False
+    shutil.copyfile(src, dest)
+    return True
@@ -0,0 +1,136 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles
+from cocotb.utils import get_sim_time
+
+from can_bus import CANBusModel
+import cocotb_ctucan as cc
+from test_ctucan import (
+    ctucan_configure_irqs,
+    ctucan_configure_timings,
+    reset,
+    run_cocotb,
+)
+
+NODES = 2
+VIRTUAL_NODES = 1
+BUS_DELAY = [2, 10]  # clock cycles
+CLK_PERIOD = 10  # 100MHz
+BIT_CYCLES = 800  # nominal bit time set by ctucan_configure_timings
+
+
+@cocotb.coroutine
+async def node_configure(dut, n):
+    wbs = cc.create_wb_master(dut, dut.sys_clk, name=f"wb{n}")
+    irqs = cc.InterruptEvents(dut, wbs, getattr(dut, f"irq{n}")).start()
+    regs = cc.ShadowRegisters(dut, wbs)
+
+    # the nodes acknowledge the frames of each other, so neither
+    # the loopback nor the self test mode is used
+    await cc.reset(dut, wbs)
+    await regs.set_bit_16(cc.SETTINGS_OFFSET, cc.SETTINGS_ENA_BIT, 0x0)
+    await ctucan_configure_irqs(dut, regs)
+    await ctucan_configure_timings(dut, regs)
+    await regs.set_bit_16(cc.SETTINGS_OFFSET, cc.SETTINGS_ENA_BIT, 0x1)
+    await regs.flush()
+
+    return wbs, irqs
+
+
+@cocotb.coroutine
+async def bus_configure(dut):
+    cocotb.start_soon(Clock(dut.sys_clk, CLK_PERIOD, 'ns').start())
+    dut.virtual_tx.value = 2**VIRTUAL_NODES - 1
+    await reset(dut, 10)
+
+    nodes = [await node_configure(dut, n) for n in range(NODES)]
+    for _, irqs in nodes:
+        await irqs.bus_active()
+    return nodes
+
+
+@cocotb.coroutine
+async def send_timed(dut, wbs, irqs, idf, buffno=0):
+    start = get_sim_time("ns")
+    await cc.send_2_0_frame(dut, wbs, 0x1122334455667788, idf)
+    state = await irqs.tx_done(buffno)
+    if state != cc.TXT_STATE_TOK:
+        raise Exception(f"frame {hex(idf)} not sent, state {hex(state)}")
+    return get_sim_time("ns") - start
+
+
+@cocotb.test()
+async def can_bus_arbitration(dut):
+    nodes = await bus_configure(dut)
+
+    # both nodes start to send at the same time, the frame with the lower
+    # identifier wins the arbitration
+    sends = [
+        cocotb.start_soon(send_timed(dut, wbs, irqs, 0x200 - n))
+        for n, (wbs, irqs) in enumerate(nodes)
+    ]
+    latencies = [await send for send in sends]
+    for n, latency in enumerate(latencies):
+        dut._log.info(f"node {n} frame latency {latency} ns")
+    if latencies[1] >= latencies[0]:
+        raise Exception("frame with the lower identifier sent later")
+
+    for n, (wbs, irqs) in enumerate(nodes):
+        frames = await cc.recv_frames(dut, wbs, 1)
+        idf = frames[0][1] >> cc.IDENTIFIER_STD_START_BIT
+        if idf != 0x200 - (1 - n):
+            raise Exception(f"node {n} received {hex(idf)}")
+
+    for _, irqs in nodes:
+        irqs.stop()
+
+
+@cocotb.test()
+async def can_bus_contention(dut):
+    FRAMES = 4
+
+    nodes = await bus_configure(dut)
+
+    # all nodes send frames back to back, which saturates the bus
+    async def send_all(n, wbs, irqs):
+        latencies = []
+        for i in range(FRAMES):
+            idf = 0x100 + i * NODES + n
+            latencies.append(await send_timed(dut, wbs, irqs, idf))
+        return latencies
+
+    sends = [
+        cocotb.start_soon(send_all(n, wbs, irqs))
+        for n, (wbs, irqs) in enumerate(nodes)
+    ]
+    for n, send in enumerate(sends):
+        latencies = await send
+        dut._log.info(
+            f"node {n} worst-case frame latency {max(latencies)} ns, "
+            f"average {sum(latencies) / len(latencies)} ns"
+        )
+
+    for n, (wbs, irqs) in enumerate(nodes):
+        await cc.recv_frames(dut, wbs, FRAMES * (NODES - 1))
+        irqs.stop()
+
+
+@cocotb.test()
+async def can_bus_error(dut):
+    nodes = await bus_configure(dut)
+
+    # the virtual node starts a frame and keeps the bus dominant for longer
+    # than the bit stuffing allows, so every node detects a stuff error
+    await cc.drive_virtual_node(dut, 0, [0] * 12, BIT_CYCLES)
+    await ClockCycles(dut.sys_clk, num_cycles=20 * BIT_CYCLES)
+
+    for n, (wbs, irqs) in enumerate(nodes):
+        rec = await cc.read_reg_16(dut, wbs, cc.REC_OFFSET)
+        if not rec:
+            raise Exception(f"node {n} did not count the error")
+        irqs.stop()
+
+
+def test_cocotb_bus():
+    bus = CANBusModel(NODES, VIRTUAL_NODES, BUS_DELAY)
+    run_cocotb("test_can_bus", "top_bus", bus, "top_bus")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+import pytest
+
+from ctucan.candump import (
+    CANDumpFrame,
+    CANDumpWriter,
+    format_candump_line,
+    parse_candump_line,
+    read_candump,
+)
+
+LINES = [
+    "(1436509052.249713) can0 123#DEADBEEF",
+    "(1436509052.250000) can0 1ABCDEF0#0011",
+    "(1436509052.260000) can1 7FF#R",
+    "(1436509052.265000) can1 7FF#R5",
+    "(1436509052.270000) can0 321##1000102030405060708090A0B",
+    "(1436509052.280000) can0 010##0",
+]
+
+
+def test_candump_parse():
+    frame = parse_candump_line(LINES[4])
+    assert frame == CANDumpFrame(
+        1436509052.27,
+        "can0",
+        0x321,
+        False,
+        False,
+        True,
+        True,
+        bytes(range(12))
+    )
+    assert parse_candump_line(LINES[1]).ide
+    assert parse_candump_line(LINES[2]).rtr
+    assert parse_candump_line(LINES[3]).rtr_length == 5
+
+    invalid = [
+        "123##",
+        "(1436509052.249713) can0 123",
+        "(1436509052.249713) can0 123##",
+        "(1436509052.249713) can0 123#R9",
+    ]
+    for line in invalid:
+        with pytest.raises(Exception, match="Invalid candump line"):
+            parse_candump_line(line)
+
+
+def test_candump_roundtrip(tmp_path):
+    for line in LINES:
+        assert format_candump_line(parse_candump_line(line)) == line
+
+    for name in ["log", "log.gz"]:
+        path = str(tmp_path / name)
+        with CANDumpWriter(path, "can0") as writer:
+            for line in LINES:
+                writer.write(parse_candump_line(line))
+
+        frames = list(read_candump(path))
+        assert [f.interface for f in frames] == ["can0"] * len(LINES)
+        assert [f.data for f in frames
+                ] == [parse_candump_line(line).data for line in LINES]
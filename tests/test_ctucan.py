@@ -10,10 +10,11 @@ from cocotb.triggers import ClockCycles, RisingEdge
 from migen import *
 from migen.fhdl import verilog
 from ctucan import CTUCANWishboneWrapper
+from ctucan.candump import CANDumpWriter, read_candump
 from ctucan.utils import collect_sources, convert_to_verilog
 
 import cocotb_ctucan as cc
-from common import get_test_output_dir
+from common import get_test_output_dir, update_file
 
 
 def bit_is_set(reg, bit):
@@ -33,27 +34,27 @@ async def reset(dut, reset_cycles):
 
 
 @cocotb.coroutine
-async def ctucan_configure_timings(dut, wbs):
+async def ctucan_configure_timings(dut, regs):
     BTR_VAL = 0x08233FEF  # CAN 2.0 125000 kbit/s
     BTR_FD_VAL = 0x0808A387  # CAN FD  500000 kbit/s
     TRV_DELAY_VAL = 0x01000000
 
-    await cc.write_reg_32(dut, wbs, cc.BTR_OFFSET, BTR_VAL)
-    await cc.write_reg_32(dut, wbs, cc.BTR_FD_OFFSET, BTR_FD_VAL)
-    await cc.write_reg_32(dut, wbs, cc.TRV_DELAY_OFFSET, TRV_DELAY_VAL)
+    await regs.write_reg_32(cc.BTR_OFFSET, BTR_VAL)
+    await regs.write_reg_32(cc.BTR_FD_OFFSET, BTR_FD_VAL)
+    await regs.write_reg_32(cc.TRV_DELAY_OFFSET, TRV_DELAY_VAL)
 
 
 @cocotb.coroutine
-async def ctucan_configure_irqs(dut, wbs):
-    await cc.irq_mask_all(dut, wbs)
+async def ctucan_configure_irqs(dut, regs):
+    irqs = (
+        cc.bit_to_val(cc.INT_STAT_RXI_BIT)
+        | cc.bit_to_val(cc.INT_STAT_TXI_BIT)
+        | cc.bit_to_val(cc.INT_STAT_FCSI_BIT)
+    )
 
-    await cc.irq_enable(dut, wbs, cc.INT_STAT_RXI_BIT)
-    await cc.irq_enable(dut, wbs, cc.INT_STAT_TXI_BIT)
-    await cc.irq_enable(dut, wbs, cc.INT_STAT_FCSI_BIT)
-
-    await cc.irq_unmask(dut, wbs, cc.INT_STAT_RXI_BIT)
-    await cc.irq_unmask(dut, wbs, cc.INT_STAT_TXI_BIT)
-    await cc.irq_unmask(dut, wbs, cc.INT_STAT_FCSI_BIT)
+    await regs.write_reg_16(cc.INT_MASK_SET_OFFSET, 0x0FFF)
+    await regs.write_reg_16(cc.INT_ENA_SET_OFFSET, irqs)
+    await regs.write_reg_16(cc.INT_MASK_CLR_OFFSET, irqs)
 
 
 @cocotb.coroutine
@@ -78,63 +79,39 @@ async def ctucan_check_irq(dut, wbs):
     return irq_nums
 
 
-@cocotb.coroutine
-async def ctucan_handle_fcsi_irq(dut, wbs):
-    reg_val = await cc.read_reg_16(dut, wbs, cc.FAULT_STATE_OFFSET)
-    if bit_is_set(reg_val, cc.FAULT_STATE_ERA_BIT):
-        dut._log.info("ctucan is in bus-active state")
-
-    if bit_is_set(reg_val, cc.FAULT_STATE_ERP_BIT):
-        dut._log.info("ctucan is in bus-active state")
-
-    if bit_is_set(reg_val, cc.FAULT_STATE_BOF_BIT):
-        dut._log.info("ctucan is in bus-active state")
-
-
-@cocotb.coroutine
-async def ctucan_handle_irq(dut, wbs):
-    while True:
-        await RisingEdge(dut.irq)
-
-        irq_bit_list = await ctucan_check_irq(dut, wbs)
-        for irq_bit in irq_bit_list:
-            if irq_bit == cc.INT_STAT_FCSI_BIT:
-                await ctucan_handle_fcsi_irq(dut, wbs)
-            elif irq_bit in [cc.INT_STAT_RXI_BIT, cc.INT_STAT_TXI_BIT]:
-                await cc.irq_clear(dut, wbs, irq_bit)
-                await ctucan_check_irq(dut, wbs)
-
-
 @cocotb.coroutine
 async def ctucan_configure(dut, wbs):
-    irq_handler = cocotb.fork(ctucan_handle_irq(dut, wbs))
+    irqs = cc.InterruptEvents(dut, wbs, dut.irq).start()
 
-    await cc.disable(dut, wbs)
+    # the configuration is collected in the shadow registers and written
+    # in a few batches
+    regs = cc.ShadowRegisters(dut, wbs)
+
+    await regs.set_bit_16(cc.SETTINGS_OFFSET, cc.SETTINGS_ENA_BIT, 0x0)
+    await regs.flush()
     disabled = await cc.is_disabled(dut, wbs)
     if not disabled:
         raise Exception("ctucan enabled, when it should be disabled")
 
-    await ctucan_configure_irqs(dut, wbs)
+    await ctucan_configure_irqs(dut, regs)
+    await ctucan_configure_timings(dut, regs)
+    await regs.set_bit_16(cc.SETTINGS_OFFSET, cc.SETTINGS_ILBP_BIT, 0x1)
+    await regs.set_bit_16(cc.MODE_OFFSET, cc.MODE_STM_BIT, 0x1)
+    await regs.flush()
+
     irq_bit_list = await ctucan_check_irq(dut, wbs)
     if irq_bit_list:
         raise Exception(f"irq list should be empty but is {irq_bit_list}")
 
-    await ctucan_configure_timings(dut, wbs)
-    await cc.enable_loop(dut, wbs)
-    await cc.enable_selfack(dut, wbs)
-
-    await cc.enable(dut, wbs)
+    await regs.set_bit_16(cc.SETTINGS_OFFSET, cc.SETTINGS_ENA_BIT, 0x1)
+    await regs.flush()
     enabled = not await cc.is_disabled(dut, wbs)
     if not enabled:
         raise Exception("ctucan disabled, when it should be enabled")
 
-    while True:
-        initialized = await cc.is_initialized(dut, wbs)
-        await ClockCycles(dut.sys_clk, num_cycles=100)  # busy wait
-        if initialized:
-            break
+    await irqs.bus_active()
 
-    return lambda: irq_handler.kill()
+    return irqs
 
 
 @cocotb.test()
@@ -145,7 +122,6 @@ async def can_fd_send_receive(dut):
     RESET_CYCLES = 10
     SEND_IDF = 0x123
     SEND_DATA = 0x1122334455667788
-    SEND_WAIT_TIME = 100000
 
     # initialization
     cocotb.start_soon(Clock(dut.sys_clk, CLK_PERIOD, 'ns').start())
@@ -154,76 +130,158 @@ async def can_fd_send_receive(dut):
 
     # configure ctucan
     await cc.reset(dut, wbs)
-    finalize = await ctucan_configure(dut, wbs)
+    irqs = await ctucan_configure(dut, wbs)
 
     # send and receive looped frame
     await cc.send_fd_frame(dut, wbs, SEND_DATA, SEND_IDF, brs=True)
-    await ClockCycles(dut.sys_clk, num_cycles=SEND_WAIT_TIME)
-    while True:
-        empty = await cc.rx_empty(dut, wbs)
-        await ClockCycles(dut.sys_clk, num_cycles=100)
-        if not empty:
-            break
+    state = await irqs.tx_done()
+    if state != cc.TXT_STATE_TOK:
+        raise Exception(f"frame not sent, TXT buffer state {hex(state)}")
+    await irqs.frame_received()
     await cc.recv_frame(dut, wbs)
 
+    # disable the core, leaving the other settings as they are
+    await cc.clear_bits_16(dut, wbs, cc.SETTINGS_OFFSET, cc.SETTINGS_ENA_MASK)
+    if not await cc.is_disabled(dut, wbs):
+        raise Exception("ctucan enabled, when it should be disabled")
+    ilbp = await cc.get_bit_16(
+        dut, wbs, cc.SETTINGS_OFFSET, cc.SETTINGS_ILBP_BIT
+    )
+    if not ilbp:
+        raise Exception("ctucan internal loopback disabled with the core")
+
     # cleanup
-    finalize()
+    irqs.stop()
 
 
-def test_cocotb():
-    TOP_LEVEL = "top_test"
-    MODULE = "test_ctucan"
+@cocotb.test()
+async def can_candump_replay(dut):
+
+    # constants
+    CLK_PERIOD = 10  # 100MHz
+    RESET_CYCLES = 10
+    SPEEDUP = 100
+    LOG = [
+        "(1600000000.000000) can0 123#0011223344556677",
+        "(1600000000.050000) can0 1ABCDEF0#00AA",
+        "(1600000000.080000) can0 321##1000102030405060708090A0B",
+    ]
+
+    # initialization
+    cocotb.start_soon(Clock(dut.sys_clk, CLK_PERIOD, 'ns').start())
+    wbs = cc.create_wb_master(dut, dut.sys_clk)
+    await reset(dut, RESET_CYCLES)
+
+    # configure ctucan
+    await cc.reset(dut, wbs)
+    irqs = await ctucan_configure(dut, wbs)
+
+    # replay the log and capture the looped frames
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_in = os.path.join(tmp_dir, "in.log")
+        log_out = os.path.join(tmp_dir, "out.log")
+        with open(log_in, "w") as f:
+            f.write("\n".join(LOG) + "\n")
+
+        with CANDumpWriter(log_out) as writer:
+            capture = cocotb.start_soon(
+                cc.capture_candump(dut, wbs, irqs, writer, count=len(LOG))
+            )
+            frames = read_candump(log_in)
+            await cc.replay_candump(dut, wbs, irqs, frames, speedup=SPEEDUP)
+            await capture
+
+        # the timestamps of the captured frames come from the simulation
+        for sent, received in zip(read_candump(log_in), read_candump(log_out)):
+            if sent._replace(timestamp=0) != received._replace(timestamp=0):
+                raise Exception(f"sent {sent}, received {received}")
+
+    # cleanup
+    irqs.stop()
+
+
+# Compile arguments of the simulators supported by the test, selected
+# with the SIM environment variable like in the cocotb makefiles
+SIM_COMPILE_ARGS = {
+    "icarus": ["-g2005"],
+    # the core uses "int" as a port name, which is a SystemVerilog keyword
+    "verilator": ["+1364-2005ext+v"],
+}
+
+
+def run_cocotb(module, toplevel, top, top_name, sources=[], extra_env={}):
+    """Simulates the Migen module `top` together with the converted core
+    and the Verilog `sources`, running the cocotb tests from `module`."""
     VHDL_TOP_LEVEL = "can_top_level"
     VHDL_LIBRARY = "ctu_can_fd_rtl"
-    WRAPPER_TOP_LEVEL = "CTUCAN"
+
+    simulator = os.environ.get("SIM", "icarus")
+    if simulator not in SIM_COMPILE_ARGS:
+        raise Exception(f"Unsupported simulator {simulator}")
 
     tests_dir = os.path.dirname(__file__)
 
-    top_file = os.path.join(tests_dir, f"{TOP_LEVEL}.v")
     vhdl_dir = os.path.join(tests_dir, "..", "ctucan", "vhdl")
     vhdl_sources = collect_sources(vhdl_dir, ".vhd", absolute=True)
 
-    output_dir = get_test_output_dir(__file__)
-    output_sim_build = os.path.join(output_dir, "sim_build")
+    output_dir = os.path.join(get_test_output_dir(__file__), module)
+    output_sim_build = os.path.join(output_dir, "sim_build", simulator)
     output_ctucan_verilog = os.path.join(output_dir, f"{VHDL_TOP_LEVEL}.v")
-    output_wrapper_file = os.path.join(output_dir, f"{WRAPPER_TOP_LEVEL}.v")
+    output_top_file = os.path.join(output_dir, f"{top_name}.v")
 
     os.makedirs(output_dir, exist_ok=True)
 
-    with open(output_ctucan_verilog, "w") as ctucan_verilog, \
-         open(output_wrapper_file, "w") as wrapper_file:
+    compile_args = list(SIM_COMPILE_ARGS[simulator])
+    if simulator == "verilator":
+        compile_args.append(os.path.join(tests_dir, "verilator.vlt"))
+
+    # The sources are replaced only when their contents change, so
+    # the simulator can reuse the model compiled in a previous run
+    with tempfile.TemporaryDirectory() as tmp_dir:
 
         # convert ctucan
+        ctucan_verilog = os.path.join(tmp_dir, f"{VHDL_TOP_LEVEL}.v")
         convert_to_verilog(
-            vhdl_sources,
-            output_ctucan_verilog,
-            VHDL_TOP_LEVEL,
-            library=VHDL_LIBRARY
+            vhdl_sources, ctucan_verilog, VHDL_TOP_LEVEL, library=VHDL_LIBRARY
         )
+        update_file(output_ctucan_verilog, ctucan_verilog)
+
+        # generate the Migen part of the design
+        top_file = os.path.join(tmp_dir, f"{top_name}.v")
+        verilog.convert(top, top.get_ios(), name=top_name).write(top_file)
+        update_file(output_top_file, top_file)
+
+    # run simulation
+    verilog_sources = [output_ctucan_verilog, output_top_file] + sources
+    cocotb_test.simulator.run(
+        python_search=[tests_dir],
+        verilog_sources=verilog_sources,
+        toplevel=toplevel,
+        module=module,
+        compile_args=compile_args,
+        sim_build=output_sim_build,
+        extra_env=extra_env,
+        waves=True
+    )
 
-        # generate wishbone wrapper
-        irq = Signal()
-        can_rx = Signal()
-        can_tx = Signal()
-        ctucan_wb_wrapper = CTUCANWishboneWrapper(can_rx, can_tx, irq)
-        wrapper = verilog.convert(
-            ctucan_wb_wrapper,
-            ctucan_wb_wrapper.get_ios(),
-            name=WRAPPER_TOP_LEVEL
-        )
-        wrapper_file.write(str(wrapper))
-        wrapper_file.flush()
-
-        # run simulation
-        verilog_sources = [
-            output_ctucan_verilog, output_wrapper_file, top_file
-        ]
-        cocotb_test.simulator.run(
-            python_search=[tests_dir],
-            verilog_sources=verilog_sources,
-            toplevel=TOP_LEVEL,
-            module=MODULE,
-            compile_args=["-g2005"],
-            sim_build=output_sim_build,
-            waves=True
-        )
+
+def test_cocotb():
+    TOP_LEVEL = "top_test"
+    WRAPPER_TOP_LEVEL = "CTUCAN"
+
+    tests_dir = os.path.dirname(__file__)
+    top_file = os.path.join(tests_dir, f"{TOP_LEVEL}.v")
+
+    # generate wishbone wrapper
+    irq = Signal()
+    can_rx = Signal()
+    can_tx = Signal()
+    ctucan_wb_wrapper = CTUCANWishboneWrapper(can_rx, can_tx, irq)
+
+    run_cocotb(
+        "test_ctucan",
+        TOP_LEVEL,
+        ctucan_wb_wrapper,
+        WRAPPER_TOP_LEVEL,
+        sources=[top_file]
+    )
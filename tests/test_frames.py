@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import pytest
+
+from ctucan.frames import (
+    FRAME_DTYPE,
+    decode_frames,
+    decode_stream,
+    dlc_to_length,
+    encode_frames,
+    encode_stream,
+    length_to_dlc,
+)
+
+
+def random_frames(n, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = np.zeros(n, dtype=FRAME_DTYPE)
+    frames["ide"] = rng.integers(0, 2, n)
+    frames["id"] = np.where(
+        frames["ide"], rng.integers(0, 2**29, n), rng.integers(0, 2**11, n)
+    )
+    frames["fdf"] = rng.integers(0, 2, n)
+    frames["brs"] = frames["fdf"] & rng.integers(0, 2, n).astype(bool)
+    frames["rtr"] = ~frames["fdf"] & (rng.integers(0, 8, n) == 0)
+    frames["dlc"] = np.where(frames["fdf"], rng.integers(0, 16, n), 8)
+    frames["timestamp"] = rng.integers(0, 2**63, n, dtype=np.uint64)
+
+    length = np.where(frames["rtr"], 0, dlc_to_length(frames["dlc"]))
+    data = rng.integers(0, 256, (n, 64), dtype=np.uint8)
+    frames["data"] = np.where(np.arange(64) < length[:, None], data, 0)
+    return frames
+
+
+def test_dlc_mapping():
+    assert list(dlc_to_length([8, 9, 15])) == [8, 12, 64]
+    assert list(dlc_to_length([8, 9, 15], fdf=False)) == [8, 8, 8]
+    assert list(length_to_dlc([0, 8, 9, 12, 13, 64])) == [0, 8, 9, 9, 10, 15]
+    with pytest.raises(Exception):
+        length_to_dlc(65)
+
+
+def test_encode_frame():
+    frames = np.zeros(1, dtype=FRAME_DTYPE)
+    frames["id"] = 0x123
+    frames["fdf"] = True
+    frames["brs"] = True
+    frames["dlc"] = 9
+    frames["timestamp"] = 0x1122334455667788
+    frames["data"][0, :12] = np.arange(1, 13)
+
+    words, counts = encode_frames(frames)
+    assert counts[0] == 7
+    assert list(words[0, :7]) == [
+        0x3289,
+        0x123 << 18,
+        0x55667788,
+        0x11223344,
+        0x04030201,
+        0x08070605,
+        0x0C0B0A09,
+    ]
+
+
+def test_frames_roundtrip():
+    frames = random_frames(1000)
+    words, _ = encode_frames(frames)
+    assert np.array_equal(decode_frames(words), frames)
+
+
+def test_stream_roundtrip():
+    frames = random_frames(1000, seed=1)
+    stream = encode_stream(frames)
+    assert np.array_equal(decode_stream(stream), frames)
+    with pytest.raises(Exception):
+        decode_stream(stream[:-1])
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import subprocess
+import sys
+
+# Modules used by the build tools, which must not import Migen and LiteX
+LIGHT_MODULES = [
+    "ctucan",
+    "ctucan.registers",
+    "ctucan.regmap",
+    "ctucan.utils",
+    "ctucan.candump",
+]
+HEAVY_PACKAGES = ["migen", "litex"]
+
+# Time allowed for importing all the light modules, can be overridden with
+# the environment variable
+IMPORT_TIME_LIMIT_ENV = "CTUCAN_IMPORT_TIME_LIMIT"
+IMPORT_TIME_LIMIT = 0.1  # s
+IMPORT_RUNS = 5
+
+IMPORT_SCRIPT = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+for module in {modules}:
+    __import__(module)
+import_time = time.perf_counter() - start
+
+loaded = sorted({{m.split(".")[0] for m in sys.modules}})
+print(json.dumps({{"time": import_time, "loaded": loaded}}))
+"""
+
+
+def run_import(modules):
+    # every run starts a new interpreter, as the build tools do
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = IMPORT_SCRIPT.format(modules=modules)
+    result = subprocess.run([sys.executable, "-c", script],
+                            cwd=root,
+                            stdout=subprocess.PIPE,
+                            check=True)
+    return json.loads(result.stdout)
+
+
+def test_import_without_migen():
+    loaded = run_import(LIGHT_MODULES)["loaded"]
+    for package in HEAVY_PACKAGES:
+        assert package not in loaded
+
+    loaded = run_import(["ctucan.wrapper"])["loaded"]
+    for package in HEAVY_PACKAGES:
+        assert package in loaded
+
+
+def test_import_time():
+    limit = float(os.environ.get(IMPORT_TIME_LIMIT_ENV, IMPORT_TIME_LIMIT))
+    times = [run_import(LIGHT_MODULES)["time"] for _ in range(IMPORT_RUNS)]
+    print(
+        f"import of {', '.join(LIGHT_MODULES)}: best {min(times):.4f} s, "
+        f"worst {max(times):.4f} s"
+    )
+    assert min(times) < limit
+
+
+def test_lazy_exports():
+    import ctucan
+
+    modules = {n for n in ctucan.LAZY_ATTRIBUTES if n.startswith("CTUCAN")}
+    assert set(ctucan.__all__) == modules
@@ -7,13 +7,40 @@ import tempfile
 from migen import *
 from migen.fhdl import verilog
 
+from litex.soc.interconnect import wishbone
 from litex.soc.integration.builder import Builder, builder_argdict
 from litex_boards.targets.digilent_arty import BaseSoC
 from litex_boards.platforms import digilent_arty
 from litex.build.generic_platform import Subsignal, Pins, IOStandard
 
 from common import get_test_output_dir
-from ctucan import CTUCAN, CTUCANWishboneWrapper
+from ctucan import (
+    CTUCAN,
+    CTUCANArray,
+    CTUCANWishboneWrapper,
+    CTUCANRXDMA,
+    CTUCANTXDMA,
+    CTUCANEventManager,
+    CTUCANPerfCounters,
+    CTUCANTimestamp,
+)
+from ctucan.cdc import TimestampCDC, WishboneCDC
+from ctucan.registers import (
+    INT_STAT_RXI_MASK, INT_STAT_TXI_MASK, RX_DATA_OFFSET, SETTINGS_OFFSET
+)
+
+
+class CoreStub:
+    """Replaces the instance of the core in the simulations, the outputs of
+    the core are driven by the test."""
+
+    @staticmethod
+    def lower(instance):
+        return Module()
+
+
+def simulate(module, generator):
+    run_simulation(module, generator, special_overrides={Instance: CoreStub})
 
 
 def can_io():
@@ -26,7 +53,7 @@ def can_io():
     )]
 
 
-@pytest.mark.parametrize("ctucan_variant", ["vhdl", "verilog"])
+@pytest.mark.parametrize("ctucan_variant", ["vhdl", "verilog", "prebuilt"])
 def test_litex(ctucan_variant):
 
     # create base SoC
@@ -48,11 +75,199 @@ def test_litex(ctucan_variant):
     builder.build()
 
 
-def test_migen():
+@pytest.mark.parametrize(
+    "pipelined,bursting,clock_domain",
+    [
+        (False, False, "sys"),
+        (True, False, "sys"),
+        (False, True, "sys"),
+        (False, False, "can"),
+    ]
+)
+def test_migen(pipelined, bursting, clock_domain):
     can_rx = Signal()
     can_tx = Signal()
     irq = Signal()
-    ctucan_wb_wrapper = CTUCANWishboneWrapper(can_rx, can_tx, irq)
+    ctucan_wb_wrapper = CTUCANWishboneWrapper(
+        can_rx,
+        can_tx,
+        irq,
+        pipelined=pipelined,
+        bursting=bursting,
+        clock_domain=clock_domain
+    )
     verilog.convert(
         ctucan_wb_wrapper, ctucan_wb_wrapper.get_ios(), name="ctucan"
     )
+
+
+@pytest.mark.parametrize(
+    "pipelined,bursting", [(False, False), (True, False), (False, True)]
+)
+def test_wrapper_accesses(pipelined, bursting):
+    wrapper = CTUCANWishboneWrapper(
+        Signal(), Signal(), Signal(), pipelined=pipelined, bursting=bursting
+    )
+    bus = wrapper.bus
+    core, = wrapper._fragment.specials
+    ports = {item.name: item.expr for item in core.items}
+    # reads of RX_DATA pop the RX buffer, so every access of the master
+    # has to reach the core exactly once
+    requests = [
+        (1, SETTINGS_OFFSET >> 2),
+        (1, SETTINGS_OFFSET >> 2),
+        (0, RX_DATA_OFFSET >> 2),
+        (0, RX_DATA_OFFSET >> 2),
+        (0, RX_DATA_OFFSET >> 2),
+    ]
+    counts = {"srd": 0, "swr": 0, "ack": 0}
+
+    @passive
+    def monitor():
+        while True:
+            counts["srd"] += yield ports["srd"]
+            counts["swr"] += yield ports["swr"]
+            counts["ack"] += yield bus.ack
+            yield
+
+    def master():
+        if pipelined:
+            # one request per clock, the wrapper never stalls
+            yield bus.cyc.eq(1)
+            for we, adr in requests:
+                yield bus.stb.eq(1)
+                yield bus.we.eq(we)
+                yield bus.adr.eq(adr)
+                yield
+            yield bus.stb.eq(0)
+            while counts["ack"] < len(requests):
+                yield
+            yield bus.cyc.eq(0)
+        else:
+            for we, adr in requests:
+                if we:
+                    yield from bus.write(adr, 0)
+                else:
+                    yield from bus.read(adr)
+        for _ in range(4):
+            yield
+
+    simulate(wrapper, [master(), monitor()])
+    assert counts == {"srd": 3, "swr": 2, "ack": len(requests)}
+
+
+@pytest.mark.parametrize("dma_cls", [CTUCANRXDMA, CTUCANTXDMA])
+def test_migen_dma(dma_cls):
+    dma = dma_cls()
+    ios = set(dma.core.flatten()) | set(dma.bus.flatten())
+    ios.add(dma.ev.irq)
+    verilog.convert(dma, ios, name="ctucan_dma")
+
+
+@pytest.mark.parametrize("with_coalescing", [False, True])
+def test_migen_event_manager(with_coalescing):
+    core_irq = Signal()
+    timestamp = Signal(64)
+    ev = CTUCANEventManager(
+        core_irq, timestamp, with_coalescing=with_coalescing
+    )
+    ev.finalize()
+    ios = {core_irq, timestamp, ev.irq}
+    if with_coalescing:
+        ios |= set(ev.core.flatten())
+    verilog.convert(ev, ios, name="ctucan_ev")
+
+
+def test_coalescing_without_timestamp():
+    pads = Record([("rx", 1), ("tx", 1)])
+    can = CTUCAN(None, pads, with_irq_coalescing=True)
+    core, = can.wbwrapper._fragment.specials
+    ports = {item.name: item.expr for item in core.items}
+    top = Module()
+    top.submodules.can = can
+    for csr in can.get_csrs():
+        if isinstance(csr, Module):
+            csr.finalize(32, "big")
+            top.submodules += csr
+
+    def generator():
+        # the received frames are held back for coalesce_time cycles
+        yield can.ev._coalesce_time.storage.eq(50)
+        yield ports["data_out"].eq(INT_STAT_RXI_MASK)
+        yield ports["int"].eq(1)
+        for _ in range(40):
+            yield
+            assert (yield can.ev.irq) == 0
+        for _ in range(20):
+            yield
+        assert (yield can.ev.irq) == 1
+
+        # the other interrupts of the core are not held back
+        yield ports["int"].eq(0)
+        yield can.ev._coalesce_time.storage.eq(1000)
+        for _ in range(2):
+            yield
+        assert (yield can.ev.irq) == 0
+        yield ports["data_out"].eq(INT_STAT_TXI_MASK)
+        yield ports["int"].eq(1)
+        for _ in range(10):
+            yield
+        assert (yield can.ev.irq) == 1
+
+    simulate(top, generator())
+
+
+def test_migen_timestamp():
+    ts = CTUCANTimestamp(prescaler=100)
+    verilog.convert(ts, {ts.timestamp}, name="ctucan_timestamp")
+
+
+def test_migen_perf_counters():
+    bus = wishbone.Interface(data_width=32, adr_width=14)
+    irq = Signal()
+    perf = CTUCANPerfCounters(bus, irq)
+    ios = set(bus.flatten()) | {irq}
+    verilog.convert(perf, ios, name="ctucan_perf")
+
+
+def test_migen_cdc():
+    module = Module()
+    target = wishbone.Interface(data_width=32, adr_width=14)
+    timestamp_sys = Signal(64)
+    timestamp_can = Signal(64)
+    module.submodules.cdc = WishboneCDC(target, "sys", "can")
+    module.submodules.timestamp_cdc = TimestampCDC(
+        timestamp_sys, timestamp_can, "sys", "can"
+    )
+    ios = set(target.flatten()) | set(module.cdc.bus.flatten())
+    ios |= {timestamp_sys, timestamp_can}
+    verilog.convert(module, ios, name="ctucan_cdc")
+
+
+def test_migen_array():
+    pads = [Record([("rx", 1), ("tx", 1)]) for _ in range(3)]
+    array = CTUCANArray(None, pads, "external", with_timestamp=True)
+    ios = set(array.bus.flatten()) | {array.ev.irq}
+    for channel_pads in pads:
+        ios |= set(channel_pads.flatten())
+    verilog.convert(array, ios, name="ctucan_array")
+
+    array = CTUCANArray(None, pads)
+    core_irq = array.channels[1].wbwrapper.irq
+    # the fields of the CSRs are connected by the CSR bank of the SoC
+    top = Module()
+    top.submodules.array = array
+    for csr in array.get_csrs():
+        if isinstance(csr, Module):
+            csr.finalize(32, "big")
+            top.submodules += csr
+
+    def generator():
+        yield
+        assert (yield array.ev.irq) == 0
+        yield core_irq.eq(1)
+        yield
+        assert (yield array.ev.irq) == 1
+        assert (yield array.irq_status.status) == 0b010
+
+    simulate(top, generator())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+import os
+import xml.etree.ElementTree as ET
+
+import ctucan.register_map
+from ctucan.regmap import (
+    add_csr_json_registers,
+    add_svd_peripheral,
+    generate_c_header,
+    generate_python,
+    load_regmap,
+)
+
+CAN_BASE = 0x82000000
+C_HEADER = os.path.join(
+    os.path.dirname(ctucan.register_map.__file__), "include", "ctucan_regs.h"
+)
+
+SVD = """<?xml version="1.0" encoding="utf-8"?>
+<device schemaVersion="1.1">
+    <name>SOC</name>
+    <peripherals>
+        <peripheral>
+            <name>UART</name>
+        </peripheral>
+    </peripherals>
+</device>
+"""
+
+
+def test_register_map_up_to_date():
+    # run `make generate-regmap` after changing regmap.json
+    with open(ctucan.register_map.__file__) as f:
+        assert f.read() == generate_python(load_regmap())
+    with open(C_HEADER) as f:
+        assert f.read() == generate_c_header(load_regmap())
+
+
+def test_c_header():
+    header = generate_c_header(load_regmap())
+    assert "#define CTUCAN_TXT_BUFFER_4_OFFSET 0x400\n" in header
+    assert "#define CTUCAN_TXT_COMMAND_TXB4_BIT 11\n" in header
+    assert "#define CTUCAN_RX_STATUS_RXFRC_MASK 0x00007ff0u\n" in header
+    assert "#define CTUCAN_COMMAND_RRB_BIT 2\n" in header
+    assert "#define CTUCAN_FILTER_CONTROL_OFFSET 0x5c\n" in header
+
+
+def test_csr_json():
+    csr = {"memories": {"can": {"base": CAN_BASE, "size": 0x10000}}}
+    add_csr_json_registers(csr, load_regmap())
+
+    registers = csr["csr_registers"]
+    assert registers["can_rx_data"] == {
+        "addr": CAN_BASE + 0x6C,
+        "size": 1,
+        "type": "ro",
+    }
+    assert registers["can_txt_buffer_2_identifier"]["addr"] == CAN_BASE + 0x204
+    # the registers sharing a word are accessed together
+    assert registers["can_mode_settings"] == {
+        "addr": CAN_BASE + 0x4,
+        "size": 1,
+        "type": "rw",
+    }
+    assert registers["can_ewl_erp_fault_state"]["type"] == "rw"
+    assert registers["can_rec_tec"]["type"] == "ro"
+    for register in registers.values():
+        assert register["addr"] % 4 == 0
+
+
+def test_svd():
+    svd = add_svd_peripheral(SVD, load_regmap(), CAN_BASE)
+    svd = add_svd_peripheral(svd, load_regmap(), CAN_BASE)
+
+    peripherals = ET.fromstring(svd).find("peripherals")
+    names = [p.findtext("name") for p in peripherals]
+    assert names == ["UART", "CAN"]
+
+    can = peripherals[1]
+    assert int(can.findtext("baseAddress"), 0) == CAN_BASE
+    cluster = can.find("registers/cluster")
+    assert cluster.findtext("dim") == "4"
+    assert cluster.findtext("name") == "TXT_BUFFER[%s]"
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+
+import os
+import time
+
+from ctucan.utils import (
+    apply_patch,
+    conversion_cache_key,
+    convert_to_verilog,
+    evict_cache,
+    sources_key,
+    stat_report_path,
+    stat_summary,
+    sync_tree,
+    vhdl_dependency_levels,
+)
+
+TOP_MODULE = "can_top_level"
+LIBRARY = "ctu_can_fd_rtl"
+
+
+def write_file(path, content):
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def test_conversion_cache_hit(tmp_path):
+    src = tmp_path / "top.vhd"
+    write_file(src, "entity can_top_level is end entity;")
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+
+    key = conversion_cache_key([str(src)], TOP_MODULE, library=LIBRARY)
+    cached = cache_dir / f"{TOP_MODULE}-{key}.v"
+    write_file(cached, "module can_top_level(); endmodule")
+
+    # a hit never reaches yosys, so this works without the toolchain
+    for symlink in [False, True]:
+        dest = tmp_path / f"out_{symlink}.v"
+        convert_to_verilog([str(src)],
+                           str(dest),
+                           TOP_MODULE,
+                           library=LIBRARY,
+                           cache_dir=str(cache_dir),
+                           symlink=symlink)
+        assert dest.read_text() == cached.read_text()
+        assert os.path.islink(dest) == symlink
+
+
+def test_conversion_cache_report(tmp_path):
+    src = tmp_path / "top.vhd"
+    write_file(src, "entity can_top_level is end entity;")
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+
+    key = conversion_cache_key([str(src)], TOP_MODULE, library=LIBRARY)
+    cached = cache_dir / f"{TOP_MODULE}-{key}.v"
+    write_file(cached, "module can_top_level(); endmodule")
+    write_file(stat_report_path(str(cached)), "{}")
+
+    dest = tmp_path / "out.v"
+    convert_to_verilog([str(src)],
+                       str(dest),
+                       TOP_MODULE,
+                       library=LIBRARY,
+                       cache_dir=str(cache_dir))
+    assert os.path.isfile(tmp_path / "out.stat.json")
+
+
+def test_stat_summary():
+    report = {
+        "design": {
+            "num_wires": 10,
+            "num_wire_bits": 40,
+            "num_memories": 1,
+            "num_memory_bits": 256,
+            "num_cells": 7,
+            "num_cells_by_type": {
+                "$adff": 2,
+                "$_DFF_P_": 3,
+                "$and": 2,
+            },
+        }
+    }
+    assert stat_summary(report) == {
+        "cells": 7,
+        "wires": 10,
+        "wire_bits": 40,
+        "ffs": 5,
+        "memories": 1,
+        "memory_bits": 256,
+    }
+
+
+def test_conversion_cache_key():
+    srcs = [__file__]
+    key = conversion_cache_key(srcs, TOP_MODULE, library=LIBRARY)
+
+    assert key == conversion_cache_key(srcs, TOP_MODULE, library=LIBRARY)
+    assert key != conversion_cache_key(srcs, TOP_MODULE, library="work")
+    assert key != conversion_cache_key(
+        srcs, TOP_MODULE, yosys_cmds=["flatten"], library=LIBRARY
+    )
+
+
+def test_cache_eviction(tmp_path):
+    now = time.time()
+    for i in range(4):
+        entry = tmp_path / f"entry{i}.v"
+        write_file(entry, "x" * 100)
+        os.utime(entry, (now - i * 100, now - i * 100))
+
+    evict_cache(str(tmp_path), max_size=None, max_age=250)
+    assert sorted(os.listdir(tmp_path)) == ["entry0.v", "entry1.v", "entry2.v"]
+
+    # entries being written by other builds are left alone
+    write_file(tmp_path / "entry4.v.tmp", "x" * 100)
+    os.utime(tmp_path / "entry4.v.tmp", (now - 1000, now - 1000))
+
+    evict_cache(str(tmp_path), max_size=150, max_age=None)
+    assert sorted(os.listdir(tmp_path)) == ["entry0.v", "entry4.v.tmp"]
+
+
+def test_cache_eviction_race(tmp_path, monkeypatch):
+    write_file(tmp_path / "entry.v", "x" * 100)
+    os_remove = os.remove
+
+    def remove(path):
+        # another build evicts the entry first
+        os_remove(path)
+        os_remove(path)
+
+    monkeypatch.setattr(os, "remove", remove)
+    evict_cache(str(tmp_path), max_size=0, max_age=None)
+    assert os.listdir(tmp_path) == []
+
+
+VHDL_SOURCES = {
+    "top.vhd": [
+        "use work.pkg.all;",
+        "entity top is",
+        "end entity;",
+        "architecture rtl of top is begin",
+        "    u: entity work.core port map ();",
+        "end architecture;",
+    ],
+    "core.vhd": [
+        "library ieee;",
+        "use ieee.std_logic_1164.all;",
+        "-- entity top is",
+        "entity core is",
+        "end entity;",
+    ],
+    "pkg.vhd": ["package pkg is", "end package;"],
+    "pkg_body.vhd": ["package body pkg is", "end package body;"],
+}
+
+
+def test_vhdl_dependency_levels(tmp_path):
+    srcs = []
+    for name, lines in VHDL_SOURCES.items():
+        write_file(tmp_path / name, "\n".join(lines))
+        srcs.append(str(tmp_path / name))
+
+    levels = vhdl_dependency_levels(srcs, library=LIBRARY)
+    names = [sorted(os.path.basename(f) for f in level) for level in levels]
+    assert names == [["core.vhd", "pkg.vhd"], ["pkg_body.vhd", "top.vhd"]]
+
+
+def test_vhdl_components_package(tmp_path):
+    # a package declaring the components of the entities using it
+    pkg = tmp_path / "pkg.vhd"
+    leaf = tmp_path / "leaf.vhd"
+    write_file(pkg, "package pkg is\n    component leaf\n    end component;\n")
+    write_file(leaf, f"use {LIBRARY}.pkg.all;\nentity leaf is\nend entity;\n")
+
+    levels = vhdl_dependency_levels([str(leaf), str(pkg)], library=LIBRARY)
+    assert levels == [[str(pkg)], [str(leaf)]]
+
+
+PATCH = """\
+--- a/src/top.vhd
++++ b/src/top.vhd
+@@ -2,3 +2,3 @@
+ line 2
+-line 3
++line 3 patched
+ line 4
+--- /dev/null
++++ b/src/new.vhd
+@@ -0,0 +1 @@
++new file
+"""
+
+
+def test_apply_patch(tmp_path):
+    (tmp_path / "src").mkdir()
+    # the hunk moved down by two lines since the patch was made
+    lines = ["extra"] * 2 + [f"line {i}" for i in range(1, 6)]
+    write_file(tmp_path / "src" / "top.vhd", "\n".join(lines) + "\n")
+    patch = tmp_path / "fix.patch"
+    write_file(patch, PATCH)
+
+    apply_patch(str(patch), str(tmp_path))
+    lines[4] = "line 3 patched"
+    patched = "\n".join(lines) + "\n"
+    assert (tmp_path / "src" / "top.vhd").read_text() == patched
+    assert (tmp_path / "src" / "new.vhd").read_text() == "new file\n"
+
+    key = sources_key(str(tmp_path), [str(patch)])
+    assert key != sources_key(str(tmp_path), [])
+
+
+INSERT_PATCH = """\
+--- a/top.vhd
++++ b/top.vhd
+@@ -1,0 +2 @@
++inserted
+@@ -4 +5 @@
+-x
++x patched
+"""
+
+
+def test_apply_patch_after_insertion(tmp_path):
+    # the repeated lines match the second hunk one line off too
+    write_file(tmp_path / "top.vhd", "a\nb\nx\nx\nx\n")
+    patch = tmp_path / "insert.patch"
+    write_file(patch, INSERT_PATCH)
+
+    apply_patch(str(patch), str(tmp_path))
+    patched = "a\ninserted\nb\nx\nx patched\nx\n"
+    assert (tmp_path / "top.vhd").read_text() == patched
+
+
+def test_sync_tree(tmp_path):
+    src = tmp_path / "src"
+    dest = tmp_path / "dest"
+    (src / "lib").mkdir(parents=True)
+    (dest / "old").mkdir(parents=True)
+    write_file(src / "same.vhd", "same")
+    write_file(src / "lib" / "changed.vhd", "new")
+    write_file(dest / "same.vhd", "same")
+    write_file(dest / "old" / "removed.vhd", "removed")
+    write_file(dest / "stamp", "key")
+    os.utime(dest / "same.vhd", (0, 0))
+
+    changed = sync_tree(str(src), str(dest), keep=["stamp"], jobs=2)
+    assert changed == [
+        os.path.join("lib", "changed.vhd"),
+        os.path.join("old", "removed.vhd"),
+    ]
+    assert (dest / "lib" / "changed.vhd").read_text() == "new"
+    assert not (dest / "old").exists()
+    assert (dest / "stamp").exists()
+    # unchanged files are not written
+    assert os.stat(dest / "same.vhd").st_mtime == 0
+    assert sync_tree(str(src), str(dest), keep=["stamp"]) == []
@@ -1,17 +1,18 @@
 `timescale 1ns / 1ns
+`default_nettype none
 
 module top_test(
-	output irq,
-	input [13:0] wb_adr,
-	input [31:0] wb_dat_w,
-	output [31:0] wb_dat_r,
-	input [3:0] wb_sel,
-	input wb_cyc,
-	input wb_stb,
-	output wb_ack,
-	input wb_we,
-	input sys_clk,
-	input sys_rst
+	output wire irq,
+	input wire [13:0] wb_adr,
+	input wire [31:0] wb_dat_w,
+	output wire [31:0] wb_dat_r,
+	input wire [3:0] wb_sel,
+	input wire wb_cyc,
+	input wire wb_stb,
+	output wire wb_ack,
+	input wire wb_we,
+	input wire sys_clk,
+	input wire sys_rst
 );
 
 wire can_rx;
@@ -36,3 +37,5 @@ CTUCAN can(
 );
 
 endmodule
+
+`default_nettype wire